@@ -4,7 +4,7 @@ from importlib.metadata import version
 from typing import Final
 
 from . import checks, formatting, re, utils
-from .bot import AutoShardedBot, Bot, BotBase
+from .bot import AutoShardedBot, Bot, BotBase, ExtensionLoad, LazyExtension
 from .cli import cli
 from .cog import Cog, GroupCog
 from .config import Config, ConfigException
@@ -27,7 +27,9 @@ __all__ = (
     'ConfigException',
     'Embed',
     'EmbedContext',
+    'ExtensionLoad',
     'GroupCog',
+    'LazyExtension',
     'NotGuildOwner',
     'OnlyDirectMessage',
     'PaginatedContext',
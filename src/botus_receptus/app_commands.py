@@ -1,15 +1,21 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Final, overload, override
+import contextlib
+import hashlib
+import json
+import time
+from typing import TYPE_CHECKING, Any, Final, cast, overload, override
 
 import discord
 from discord import app_commands
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Sequence
+    from collections.abc import Callable, Mapping, Sequence
 
     from . import bot
 
+type _LazyKey = tuple[str, int, int | None]
+
 
 _ADMIN_ONLY: Final = -1
 _TEST_ONLY: Final = -2
@@ -50,6 +56,13 @@ def test_guilds_only[T](item: T | None = None, /) -> Callable[[T], T] | T:
 class CommandTree[ClientT: bot.Bot | bot.AutoShardedBot](
     app_commands.CommandTree[ClientT]
 ):
+    __lazy_commands: dict[_LazyKey, tuple[str, dict[str, Any]]]
+
+    def __init__(self, client: ClientT, /, *args: Any, **kwargs: Any) -> None:
+        super().__init__(client, *args, **kwargs)
+
+        self.__lazy_commands = {}
+
     @override
     def add_command(
         self,
@@ -82,3 +95,137 @@ class CommandTree[ClientT: bot.Bot | bot.AutoShardedBot](
             ]
 
         super().add_command(command, guild=guild, guilds=guilds, override=override)
+
+    def add_lazy_command(
+        self,
+        extension: str,
+        payload: Mapping[str, Any],
+        /,
+        *,
+        guild: discord.abc.Snowflake | None = None,
+    ) -> None:
+        key = (
+            payload['name'],
+            payload.get('type', 1),
+            None if guild is None else guild.id,
+        )
+        self.__lazy_commands[key] = (extension, dict(payload))
+
+    def remove_lazy_commands(self, extension: str, /) -> None:
+        self.__lazy_commands = {
+            key: value
+            for key, value in self.__lazy_commands.items()
+            if value[0] != extension
+        }
+
+    @override
+    def copy_global_to(self, *, guild: discord.abc.Snowflake) -> None:
+        super().copy_global_to(guild=guild)
+
+        for (name, type, guild_id), entry in list(self.__lazy_commands.items()):
+            if guild_id is None:
+                self.__lazy_commands[name, type, guild.id] = entry
+
+    def get_lazy_extension(
+        self, name: str, type: int = 1, /, *, guild_id: int | None = None
+    ) -> str | None:
+        entry = self.__lazy_commands.get((name, type, guild_id))
+
+        if entry is None and guild_id is not None and self.fallback_to_global:
+            entry = self.__lazy_commands.get((name, type, None))
+
+        return None if entry is None else entry[0]
+
+    async def __get_payload(
+        self, guild: discord.abc.Snowflake | None, /
+    ) -> list[dict[str, Any]]:
+        commands = self._get_all_commands(guild=guild)
+
+        if (translator := self.translator) is not None:
+            payload = [
+                await command.get_translated_payload(self, translator)
+                for command in commands
+            ]
+        else:
+            payload = [command.to_dict(self) for command in commands]
+
+        guild_id = None if guild is None else guild.id
+        payload.extend(
+            lazy_payload
+            for (_, _, lazy_guild_id), (_, lazy_payload) in self.__lazy_commands.items()
+            if lazy_guild_id == guild_id
+        )
+
+        return payload
+
+    async def fingerprint(self, *, guild: discord.abc.Snowflake | None = None) -> str:
+        payload = await self.__get_payload(guild)
+
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()
+        ).hexdigest()
+
+    @override
+    async def sync(
+        self, *, guild: discord.abc.Snowflake | None = None
+    ) -> list[app_commands.AppCommand]:
+        if cast('int | None', self.client.application_id) is None:
+            raise app_commands.MissingApplicationID
+
+        payload = await self.__get_payload(guild)
+
+        try:
+            if guild is None:
+                data = await self._http.bulk_upsert_global_commands(
+                    self.client.application_id, payload=payload
+                )
+            else:
+                data = await self._http.bulk_upsert_guild_commands(
+                    self.client.application_id, guild.id, payload=payload
+                )
+        except discord.HTTPException as e:
+            if e.status == 400 and e.code == 50035:
+                raise app_commands.CommandSyncFailure(
+                    e, self._get_all_commands(guild=guild)
+                ) from None
+            raise
+
+        return [app_commands.AppCommand(data=d, state=self._state) for d in data]
+
+    @override
+    async def _call(self, interaction: discord.Interaction[ClientT]) -> None:
+        if not self.client.accepting_invocations:
+            if interaction.type is not discord.InteractionType.autocomplete:
+                with contextlib.suppress(discord.HTTPException):
+                    await interaction.response.send_message(
+                        'The bot is restarting, please try again in a moment.',
+                        ephemeral=True,
+                    )
+
+            return
+
+        data: Any = interaction.data
+        guild_id = data.get('guild_id')
+
+        name = f'/{data["name"]}'
+        start = time.perf_counter()
+        failed = True
+
+        with self.client.track_invocation(name):
+            try:
+                if (
+                    extension := self.get_lazy_extension(
+                        data['name'],
+                        data.get('type', 1),
+                        guild_id=None if guild_id is None else int(guild_id),
+                    )
+                ) is not None:
+                    await self.client.load_lazy_extension(extension)
+
+                await super()._call(interaction)
+                failed = interaction.command_failed
+            finally:
+                if interaction.type is not discord.InteractionType.autocomplete:
+                    self.client.record_invocation(
+                        name, time.perf_counter() - start, failed=failed
+                    )
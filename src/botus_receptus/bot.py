@@ -1,18 +1,90 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast, override
+import asyncio
+import contextlib
+import graphlib
+import json
+import logging
+import math
+import signal
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, cast, override
 
-import aiohttp
 import discord
+from attrs import define
 from discord.ext import commands
 from discord.ext.commands import bot  # pyright: ignore[reportMissingTypeStubs]
 
+from . import http, shutdown, startup
 from .app_commands import CommandTree
+from .events import EventStats, get_shard_id
+from .http import CachedResponse, HTTPStats, ResponseCache
+from .interactive_pager import InteractivePager
+from .ipc import IPCBus
+from .memory import MemoryTracker
+from .metrics import MetricsServer, Registry
+from .profiler import SamplingProfiler
+from .shutdown import InvocationTracker
+from .startup import StartupPhase
+from .watchdog import LoopMonitor
 
 if TYPE_CHECKING:
-    import asyncio
+    from collections.abc import (
+        Awaitable,
+        Callable,
+        Coroutine,
+        Generator,
+        Iterable,
+        Sequence,
+    )
+
+    import aiohttp
 
     from .config import Config
+    from .metrics import Counter, Gauge, Histogram
+
+_log: Final = logging.getLogger(__name__)
+
+_LAZY_EXTENSION: Final = 'botus_receptus.lazy_extension'
+
+
+@define
+class ExtensionLoad:
+    name: str
+    duration: float = 0.0
+    error: commands.ExtensionError | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@define(frozen=True)
+class LazyExtension:
+    name: str
+    commands: Sequence[str] = ()
+    app_commands: Sequence[Mapping[str, Any]] = ()
+    listeners: Sequence[str] = ()
+    admin_guild_only: bool = False
+    test_guilds_only: bool = False
+
+
+def _is_submodule(parent: str, child: str, /) -> bool:
+    return parent == child or child.startswith(f'{parent}.')
+
+
+def _load_sync_cache(path: Path, /) -> dict[str, str]:
+    try:
+        data: object = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+
+    return cast('dict[str, str]', data)
 
 
 class BotBase(bot.BotBase):
@@ -20,7 +92,30 @@ class BotBase(bot.BotBase):
     config: Config
     default_prefix: str
     session: aiohttp.ClientSession
+    http_stats: HTTPStats
+    http_cache: ResponseCache
+    ipc: IPCBus | None
+    metrics: Registry
+    metrics_server: MetricsServer | None
+    loop_monitor: LoopMonitor | None
+    memory: MemoryTracker
     loop: asyncio.AbstractEventLoop
+    __lazy_extensions: dict[str, LazyExtension]
+    __lazy_listeners: dict[str, list[tuple[str, Callable[..., Any]]]]
+    __lazy_loads: dict[str, asyncio.Task[None]]
+    __startup_phases: dict[str, StartupPhase]
+    __shutdown_tasks: dict[str, Callable[[], Awaitable[object]]]
+    __invocations: InvocationTracker
+    __command_invocations: Counter
+    __command_errors: Counter
+    __command_duration: Histogram
+    __gateway_latency: Gauge
+    __shard_up: Gauge
+    __event_stats: EventStats | None = None
+    __original_parsers: dict[str, Callable[[Any], None]] | None = None
+    __profiler: SamplingProfiler | None = None
+    __signal_tasks: set[asyncio.Task[None]]
+    __close_task: asyncio.Task[None] | None = None
 
     if TYPE_CHECKING:
 
@@ -31,6 +126,45 @@ class BotBase(bot.BotBase):
         self.config = config
         self.bot_name = self.config['bot_name']
         self.default_prefix = self.config.get('command_prefix', '$')
+        self.__lazy_extensions = {}
+        self.__lazy_listeners = {}
+        self.__lazy_loads = {}
+        self.__startup_phases = {}
+        self.__shutdown_tasks = {}
+        self.__invocations = InvocationTracker()
+        self.__signal_tasks = set()
+        self.http_stats = HTTPStats()
+        self.http_cache = ResponseCache(
+            config.get('http_cache_size', 256),
+            Path(cache_dir)
+            if (cache_dir := config.get('http_cache_dir')) is not None
+            else None,
+            config.get('http_cache_disk_size', 1024),
+        )
+        self.metrics = Registry()
+        self.__command_invocations = self.metrics.counter(
+            'botus_command_invocations_total', 'Command invocations', ('command',)
+        )
+        self.__command_errors = self.metrics.counter(
+            'botus_command_errors_total', 'Failed command invocations', ('command',)
+        )
+        self.__command_duration = self.metrics.histogram(
+            'botus_command_duration_seconds', 'Command duration', ('command',)
+        )
+        self.__gateway_latency = self.metrics.gauge(
+            'botus_gateway_latency_seconds', 'Gateway heartbeat latency', ('shard',)
+        )
+        self.__shard_up = self.metrics.gauge(
+            'botus_shard_up', 'Whether a shard is connected', ('shard',)
+        )
+        self.metrics.gauge('botus_guilds', 'Guilds in the cache').set_function(
+            lambda: len(cast('discord.Client', self).guilds)
+        )
+        self.metrics.add_collector(self.__collect_gateway_metrics)
+        self.http_stats.register_metrics(self.metrics)
+        self.http_cache.register_metrics(self.metrics)
+        self.memory = MemoryTracker(config.get('memory_frames', 1))
+        self.__add_memory_probes()
 
         super().__init__(
             *args,
@@ -41,6 +175,47 @@ class BotBase(bot.BotBase):
             tree_cls=CommandTree,
         )
 
+        self.add_startup_task('http_session', self.__create_session)
+
+        self.ipc = None
+
+        if (ipc_dir := config.get('ipc_dir')) is not None:
+            self.ipc = IPCBus(
+                Path(ipc_dir),
+                config.get('cluster_id', 0),
+                config.get('cluster_count', 1),
+            )
+            self.ipc.add_handler('guild_count', self.__ipc_guild_count)
+            self.ipc.add_handler('find_guild', self.__ipc_find_guild)
+            self.add_startup_task('ipc', self.__start_ipc)
+
+        self.metrics_server = None
+
+        if (metrics_port := config.get('metrics_port')) is not None:
+            self.metrics_server = MetricsServer(
+                self.metrics,
+                config.get('metrics_host', '127.0.0.1'),
+                metrics_port,
+                config.get('metrics_path', '/metrics'),
+            )
+            self.add_startup_task('metrics', self.__start_metrics_server)
+
+        if config.get('event_stats', False):
+            self.enable_event_stats()
+
+        self.loop_monitor = None
+
+        if (lag_threshold := config.get('loop_lag_threshold')) is not None:
+            self.loop_monitor = LoopMonitor(
+                config.get('loop_lag_interval', 0.25),
+                lag_threshold,
+                context=lambda: self.running_invocations,
+            )
+            self.loop_monitor.register_metrics(self.metrics)
+            self.add_startup_task('loop_monitor', self.__start_loop_monitor)
+
+        self.__setup_diagnostics()
+
     async def start_with_config(self, *, reconnect: bool = True) -> None:
         await cast('discord.Client', self).start(
             self.config['discord_api_key'], reconnect=reconnect
@@ -51,28 +226,612 @@ class BotBase(bot.BotBase):
             self.config['discord_api_key'], log_handler=None
         )
 
-    async def setup_hook(self) -> None:
-        self.session = aiohttp.ClientSession(loop=self.loop)
+    def add_startup_task(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        /,
+        *,
+        after: Iterable[str] = (),
+    ) -> None:
+        if name in self.__startup_phases:
+            raise ValueError(f'Startup task {name!r} is already registered')
+
+        self.__startup_phases[name] = StartupPhase(name, func, frozenset(after))
+
+    @property
+    def startup_timeline(self) -> list[StartupPhase]:
+        return startup.timeline(self.__startup_phases.values())
+
+    def add_shutdown_task(
+        self, name: str, func: Callable[[], Awaitable[object]], /
+    ) -> None:
+        if name in self.__shutdown_tasks:
+            raise ValueError(f'Shutdown task {name!r} is already registered')
+
+        self.__shutdown_tasks[name] = func
+
+    @property
+    def accepting_invocations(self) -> bool:
+        return self.__invocations.accepting
+
+    @property
+    def running_invocations(self) -> list[str]:
+        return self.__invocations.running
+
+    @contextlib.contextmanager
+    def track_invocation(self, name: str, /) -> Generator[None]:
+        with self.__invocations.track(name):
+            yield
+
+    def record_invocation(
+        self, name: str, duration: float, /, *, failed: bool = False
+    ) -> None:
+        self.__command_invocations.labels(name).inc()
+        self.__command_duration.labels(name).observe(duration)
+
+        if failed:
+            self.__command_errors.labels(name).inc()
+
+    def __collect_gateway_metrics(self) -> None:
+        client = cast('discord.Client', self)
+
+        if isinstance(client, discord.AutoShardedClient):
+            shards = {
+                shard_id: (shard.latency, not shard.is_closed())
+                for shard_id, shard in client.shards.items()
+            }
+        else:
+            shards = {client.shard_id or 0: (client.latency, client.is_ready())}
+
+        for shard_id, (latency, up) in shards.items():
+            if not math.isnan(latency) and not math.isinf(latency):
+                self.__gateway_latency.labels(shard_id).set(latency)
+
+            self.__shard_up.labels(shard_id).set(1.0 if up else 0.0)
+
+    @property
+    def event_stats(self) -> EventStats | None:
+        return self.__event_stats
+
+    def enable_event_stats(self) -> EventStats:
+        if self.__event_stats is None:
+            stats = EventStats()
+            stats.register_metrics(self.metrics)
+
+            # Every shard's websocket looks parsers up in this dict, so replacing
+            # the entries instruments connections that are already open
+            parsers = cast('discord.Client', self)._connection.parsers
+            self.__original_parsers = dict(parsers)
+
+            for event, func in self.__original_parsers.items():
+                parsers[event] = self.__wrap_parser(stats, event, func)
+
+            self.__event_stats = stats
+
+        return self.__event_stats
+
+    def disable_event_stats(self) -> None:
+        if self.__original_parsers is not None:
+            cast('discord.Client', self)._connection.parsers.update(
+                self.__original_parsers
+            )
+            self.__original_parsers = None
+
+        self.__event_stats = None
+
+    def __wrap_parser(
+        self, stats: EventStats, event: str, func: Callable[[Any], None], /
+    ) -> Callable[[Any], None]:
+        client = cast('discord.Client', self)
+
+        def parser(data: Any) -> None:  # noqa: ANN401
+            start = time.perf_counter()
+
+            try:
+                func(data)
+            finally:
+                stats.record_gateway(
+                    event,
+                    get_shard_id(event, data, client.shard_count or 1),
+                    time.perf_counter() - start,
+                )
+
+        return parser
+
+    async def _run_event(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if (stats := self.__event_stats) is None:
+            await cast('discord.Client', super())._run_event(
+                coro, event_name, *args, **kwargs
+            )
+            return
+
+        start = time.perf_counter()
+
+        try:
+            await cast('discord.Client', super())._run_event(
+                coro, event_name, *args, **kwargs
+            )
+        finally:
+            stats.record_listener(event_name, time.perf_counter() - start)
+
+    async def __start_loop_monitor(self) -> None:
+        if TYPE_CHECKING:
+            assert self.loop_monitor is not None
+
+        self.loop_monitor.start()
+        self.add_shutdown_task('loop_monitor', self.loop_monitor.stop)
+
+    def __setup_diagnostics(self) -> None:
+        if self.config.get('memory_tracing', False):
+            self.add_startup_task('memory_tracing', self.__start_memory_tracing)
+
+        if self.config.get('profile_signal', False):
+            self.__add_signal_task(
+                'profile_signal', signal.SIGUSR1, self.__profile_from_signal
+            )
+
+        if self.config.get('memory_signal', False):
+            self.__add_signal_task(
+                'memory_signal', signal.SIGUSR2, self.__memory_from_signal
+            )
+
+        if (
+            self.config.get('diagnostics_commands', False)
+            and 'admin_guild' in self.config
+        ):
+            self.add_startup_task('diagnostics', self.__add_diagnostics)
+
+    @property
+    def profiling(self) -> bool:
+        return self.__profiler is not None
+
+    async def profile(self, seconds: float, /, *, path: Path | None = None) -> Path:
+        if self.__profiler is not None:
+            raise RuntimeError('A profile is already running')
+
+        profiler = self.__profiler = SamplingProfiler(
+            self.config.get('profile_interval', 0.005)
+        )
+        profiler.start()
+
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profile = profiler.stop()
+            self.__profiler = None
+
+        if path is None:
+            path = self.__diagnostics_path('collapsed')
+
+        await asyncio.to_thread(profile.write, path)
+        _log.info(
+            'Wrote %d samples over %.1fs to %s', profile.total, profile.duration, path
+        )
+
+        return path
+
+    def __diagnostics_path(self, suffix: str, /) -> Path:
+        return Path(self.config.get('diagnostics_dir', '.')) / (
+            f'{self.bot_name}-{time.strftime("%Y%m%d-%H%M%S")}.{suffix}'
+        )
+
+    def __run_from_signal(self, coro: Coroutine[Any, Any, None], /) -> None:
+        task = asyncio.create_task(coro)
+        self.__signal_tasks.add(task)
+        task.add_done_callback(self.__signal_tasks.discard)
+
+    async def __profile_from_signal(self) -> None:
+        try:
+            await self.profile(self.config.get('profile_seconds', 30.0))
+        except RuntimeError as e:
+            _log.warning('Could not profile: %s', e)
+
+    async def __memory_from_signal(self) -> None:
+        await self.memory_snapshot()
+
+    def __add_signal_task(
+        self,
+        name: str,
+        signum: signal.Signals,
+        func: Callable[[], Coroutine[Any, Any, None]],
+        /,
+    ) -> None:
+        async def install() -> None:
+            asyncio.get_running_loop().add_signal_handler(
+                signum, lambda: self.__run_from_signal(func())
+            )
+            self.add_shutdown_task(name, remove)
+
+        async def remove() -> None:
+            asyncio.get_running_loop().remove_signal_handler(signum)
+
+        self.add_startup_task(name, install)
+
+    def __add_memory_probes(self) -> None:
+        client = cast('discord.Client', self)
+
+        self.memory.add_probe('guilds', lambda: len(client.guilds))
+        self.memory.add_probe(
+            'members', lambda: sum(len(guild.members) for guild in client.guilds)
+        )
+        self.memory.add_probe('messages', lambda: len(client.cached_messages))
+        self.memory.add_probe('views', self.__count_views)
+        self.memory.add_probe('pagers', InteractivePager.active_count)
+        self.memory.add_probe('http_cache', lambda: len(self.http_cache))
+        self.memory.add_probe('invocations', lambda: len(self.running_invocations))
+
+    def __count_views(self) -> int:
+        store = cast('discord.Client', self)._connection._view_store
 
-    async def sync_app_commands(self) -> None:
-        guilds_to_sync: set[discord.Object] = set()
+        return len(
+            {
+                id(item.view)
+                for items in store._views.values()
+                for item in items.values()
+                if item.view is not None
+            }
+            | {id(view) for view in store._synced_message_views.values()}
+        )
+
+    async def memory_snapshot(self, *, path: Path | None = None) -> Path:
+        if path is None:
+            path = self.__diagnostics_path('memory.txt')
+
+        report = await asyncio.to_thread(
+            self.memory.snapshot,
+            sizes=self.memory.sizes(),
+            dump=path.with_suffix('.tracemalloc'),
+            stop_tracing=not self.config.get('memory_tracing', False),
+        )
+        await asyncio.to_thread(report.write, path)
+        _log.info('Wrote memory report to %s', path)
+
+        return path
+
+    async def __start_memory_tracing(self) -> None:
+        self.memory.start()
+        self.add_shutdown_task('memory_tracing', self.__stop_memory_tracing)
+
+    async def __stop_memory_tracing(self) -> None:
+        self.memory.stop()
+
+    async def __add_diagnostics(self) -> None:
+        from .diagnostics import Diagnostics  # noqa: PLC0415
+
+        await self.add_cog(Diagnostics(cast('Bot', self)))
+
+    async def __start_metrics_server(self) -> None:
+        if TYPE_CHECKING:
+            assert self.metrics_server is not None
+
+        await self.metrics_server.start()
+        self.add_shutdown_task('metrics', self.metrics_server.close)
+
+    async def __create_session(self) -> None:
+        self.session = http.create_session(
+            self.config, trace_configs=[self.http_stats.trace_config()], loop=self.loop
+        )
+        self.add_shutdown_task('http_session', self.session.close)
+
+    async def fetch_cached(
+        self, url: str, /, *, headers: Mapping[str, str] | None = None
+    ) -> CachedResponse:
+        return await self.http_cache.fetch(self.session, url, headers=headers)
+
+    async def __start_ipc(self) -> None:
+        if TYPE_CHECKING:
+            assert self.ipc is not None
+
+        await self.ipc.start()
+        self.add_shutdown_task('ipc', self.ipc.close)
+
+    async def __ipc_guild_count(self, data: object, /) -> int:
+        return len(cast('discord.Client', self).guilds)
+
+    async def __ipc_find_guild(self, guild_id: int, /) -> dict[str, Any] | None:
+        guild = cast('discord.Client', self).get_guild(guild_id)
+
+        if guild is None:
+            return None
+
+        return {
+            'id': guild.id,
+            'name': guild.name,
+            'member_count': guild.member_count,
+            'shard_id': guild.shard_id,
+        }
+
+    async def setup_hook(self) -> None:
+        await startup.run_phases(self.__startup_phases.values())
 
-        if (guild_ids := self.config.get('test_guilds')) is not None:
-            guilds_to_sync = {discord.Object(id=guild_id) for guild_id in guild_ids}
+    async def sync_app_commands(
+        self, *, force: bool = False, max_concurrency: int = 4
+    ) -> None:
+        guild_ids: set[int] = set(self.config.get('test_guilds', []))
 
         if (admin_guild_id := self.config.get('admin_guild')) is not None:
-            guilds_to_sync.add(discord.Object(id=admin_guild_id))
+            guild_ids.add(admin_guild_id)
+
+        tree = cast('CommandTree[Any]', self.tree)
+        cache_path = Path(
+            self.config.get('app_command_cache', f'{self.bot_name}.commands.json')
+        )
+        cache = {} if force else _load_sync_cache(cache_path)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def sync(guild: discord.Object | None, /) -> None:
+            key = f'{self.application_id}:{"global" if guild is None else guild.id}'
+            fingerprint = await tree.fingerprint(guild=guild)
+
+            if cache.get(key) == fingerprint:
+                _log.debug('App commands unchanged for %s, skipping sync', key)
+                return
+
+            async with semaphore:
+                await tree.sync(guild=guild)
+
+            _log.info('Synced app commands for %s', key)
+            cache[key] = fingerprint
+
+        targets: list[discord.Object | None] = []
+
+        for guild_id in sorted(guild_ids):
+            guild = discord.Object(id=guild_id)
+            tree.copy_global_to(guild=guild)
+            targets.append(guild)
+
+        targets.append(None)
+
+        results = await asyncio.gather(
+            *(sync(target) for target in targets), return_exceptions=True
+        )
+
+        try:
+            cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+        except OSError:
+            _log.warning('Could not write app command cache to %s', cache_path)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def load_extensions(
+        self,
+        extensions: Iterable[str] | Mapping[str, Iterable[str]],
+        /,
+        *,
+        package: str | None = None,
+    ) -> list[ExtensionLoad]:
+        if isinstance(extensions, Mapping):
+            dependencies = cast('Mapping[str, Iterable[str]]', extensions)
+            requires = {name: frozenset(deps) for name, deps in dependencies.items()}
+        else:
+            requires = dict.fromkeys(extensions, frozenset[str]())
+
+        # raises graphlib.CycleError before anything is loaded
+        graphlib.TopologicalSorter(requires).prepare()
+
+        results = {name: ExtensionLoad(name) for name in requires}
+        loaded = {name: asyncio.Event() for name in requires}
+
+        async def load(result: ExtensionLoad, /) -> None:
+            try:
+                for dependency in requires[result.name]:
+                    if dependency in loaded:
+                        await loaded[dependency].wait()
+
+                        if results[dependency].ok:
+                            continue
+                    elif dependency in self.extensions:
+                        continue
+
+                    raise commands.ExtensionNotLoaded(dependency)
+
+                start = time.perf_counter()
+
+                try:
+                    await self.load_extension(result.name, package=package)
+                finally:
+                    result.duration = time.perf_counter() - start
+            except commands.ExtensionError as error:
+                result.error = error
+                _log.error('Could not load extension %s', result.name, exc_info=error)
+            finally:
+                loaded[result.name].set()
 
-        for guild_to_sync in guilds_to_sync:
-            self.tree.copy_global_to(guild=guild_to_sync)
-            await self.tree.sync(guild=guild_to_sync)
+        async with asyncio.TaskGroup() as tg:
+            for result in results.values():
+                tg.create_task(load(result))
 
-        await self.tree.sync()
+        for result in sorted(results.values(), key=lambda r: r.duration, reverse=True):
+            _log.info(
+                'Extension %s %s in %.3fs',
+                result.name,
+                'loaded' if result.ok else 'failed',
+                result.duration,
+            )
+
+        return list(results.values())
+
+    def add_lazy_extension(self, extension: LazyExtension, /) -> None:
+        if (
+            extension.name in self.extensions
+            or extension.name in self.__lazy_extensions
+        ):
+            raise commands.ExtensionAlreadyLoaded(extension.name)
+
+        guilds: list[discord.Object | None] = [None]
+
+        if extension.admin_guild_only and (
+            admin_guild_id := self.config.get('admin_guild')
+        ):
+            guilds = [discord.Object(id=admin_guild_id)]
+        elif extension.test_guilds_only and (
+            test_guild_ids := self.config.get('test_guilds')
+        ):
+            guilds = [discord.Object(id=guild_id) for guild_id in test_guild_ids]
+
+        tree = cast('CommandTree[Any]', self.tree)
+
+        for payload in extension.app_commands:
+            for guild in guilds:
+                tree.add_lazy_command(extension.name, payload, guild=guild)
+
+        for name in extension.commands:
+            self.add_command(self.__lazy_command(extension.name, name))
+
+        listeners = self.__lazy_listeners[extension.name] = [
+            (event, self.__lazy_listener(extension.name, event))
+            for event in extension.listeners
+        ]
+
+        for event, listener in listeners:
+            self.add_listener(listener, event)
+
+        self.__lazy_extensions[extension.name] = extension
+
+    async def load_lazy_extension(self, name: str, /) -> None:
+        if (task := self.__lazy_loads.get(name)) is None:
+            if name not in self.__lazy_extensions:
+                return
+
+            task = self.__lazy_loads[name] = asyncio.create_task(
+                self.__load_lazy_extension(name)
+            )
+
+        await asyncio.shield(task)
+
+    async def __load_lazy_extension(self, name: str, /) -> None:
+        extension = self.__lazy_extensions.pop(name)
+
+        for command_name in extension.commands:
+            self.remove_command(command_name)
+
+        for event, listener in self.__lazy_listeners.pop(name):
+            self.remove_listener(listener, event)
+
+        cast('CommandTree[Any]', self.tree).remove_lazy_commands(name)
+
+        start = time.perf_counter()
+
+        try:
+            await self.load_extension(name)
+        except commands.ExtensionError:
+            self.add_lazy_extension(extension)
+            raise
+        else:
+            _log.info(
+                'Lazily loaded extension %s in %.3fs', name, time.perf_counter() - start
+            )
+        finally:
+            del self.__lazy_loads[name]
+
+    def __lazy_command(
+        self, extension: str, name: str, /
+    ) -> commands.Command[Any, ..., Any]:
+        async def callback(ctx: commands.Context[Any]) -> None:
+            # invoke() swaps the stub for the real command before running it, so
+            # this is only reached when the stub is invoked some other way
+            await self.__resolve_lazy_command(ctx)
+
+            if ctx.command is None:
+                raise commands.CommandNotFound(f'Command "{name}" is not found')
+
+            await ctx.command.invoke(ctx)
+
+        return commands.Command(
+            callback,
+            name=name,
+            ignore_extra=True,
+            extras={_LAZY_EXTENSION: extension},
+        )
+
+    async def __resolve_lazy_command(self, ctx: commands.Context[Any], /) -> None:
+        if ctx.command is None or (
+            (extension := ctx.command.extras.get(_LAZY_EXTENSION)) is None
+        ):
+            return
+
+        name = ctx.command.qualified_name
+        await self.load_lazy_extension(extension)
+
+        # Reuse the context so the real command runs inside whatever scope
+        # process_commands set up for it (database connection, session, ...)
+        ctx.command = self.get_command(name)
+
+    def __lazy_listener(
+        self, extension: str, event: str, /
+    ) -> Callable[..., Coroutine[Any, Any, None]]:
+        async def listener(*args: object) -> None:
+            await self.load_lazy_extension(extension)
+
+            for func in self.extra_events.get(event, []):
+                if _is_submodule(extension, func.__module__):
+                    await func(*args)
+
+        return listener
 
     @override
-    async def close(self) -> None:
+    async def invoke(self, ctx: commands.Context[Any], /) -> None:
+        if not self.accepting_invocations:
+            _log.debug('Shutting down, ignoring %s', ctx.invoked_with)
+            return
+
+        try:
+            await self.__resolve_lazy_command(ctx)
+        except commands.ExtensionError as e:
+            self.dispatch('command_error', ctx, commands.CommandInvokeError(e))
+            return
+
+        if ctx.command is None:
+            await super().invoke(ctx)
+            return
+
+        name = ctx.command.qualified_name
+        start = time.perf_counter()
+
+        with self.track_invocation(name):
+            try:
+                await super().invoke(ctx)
+            finally:
+                self.record_invocation(
+                    name, time.perf_counter() - start, failed=ctx.command_failed
+                )
+
+    async def __close(self, caller: asyncio.Task[Any] | None, /) -> None:
+        timeout = self.config.get('shutdown_timeout', 30.0)
+
+        if running := await self.__invocations.drain(timeout, caller=caller):
+            _log.warning(
+                'Shutting down with %d invocations still running: %s',
+                len(running),
+                ', '.join(running),
+            )
+
         await super().close()
-        await self.session.close()
+
+        if unfinished := await shutdown.run_shutdown_tasks(
+            self.__shutdown_tasks, timeout
+        ):
+            _log.warning('Unfinished shutdown tasks: %s', ', '.join(unfinished))
+
+    @override
+    async def close(self) -> None:
+        if self.__close_task is None:
+            # The drain runs in its own task, so it needs to be told which task
+            # asked for the close in case that is a running invocation
+            self.__close_task = asyncio.create_task(
+                self.__close(asyncio.current_task())
+            )
+
+        await asyncio.shield(self.__close_task)
 
 
 class Bot(BotBase, commands.Bot): ...
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, ClassVar, Final, NotRequired, TypedDict
+
+import aiohttp
+import discord
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+__all__ = ('BotStats', 'ProviderStats', 'StatsPoster', 'StatsProvider')
+
+_log: Final = logging.getLogger(__name__)
+
+
+class BotStats(TypedDict):
+    server_count: int
+    shards: NotRequired[list[int]]
+    shard_count: NotRequired[int]
+
+
+@define
+class ProviderStats:
+    posts: int = 0
+    failures: int = 0
+    skipped: int = 0
+    attempts: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    last_error: str | None = None
+    last_posted_at: float | None = None
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.attempts if self.attempts else 0.0
+
+    def record(self, latency: float, /) -> None:
+        self.attempts += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+
+@define
+class StatsProvider(ABC):
+    name: ClassVar[str]
+
+    token: str
+    timeout: float = 10.0
+    min_interval: float = 60.0
+    stats: ProviderStats = field(init=False, factory=ProviderStats)
+    last_posted: BotStats | None = field(init=False, default=None)
+    retry_at: float = field(init=False, default=0.0)
+
+    @abstractmethod
+    def get_url(self, bot_id: int, /) -> str: ...
+
+    def get_headers(self) -> dict[str, str]:
+        return {'Content-Type': 'application/json', 'Authorization': self.token}
+
+    def get_payload(self, stats: BotStats, /) -> dict[str, Any]:
+        return dict(stats)
+
+
+class _PostError(Exception):
+    retry: bool
+    delay: float
+
+    def __init__(self, message: str, /, *, retry: bool, delay: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry = retry
+        self.delay = delay
+
+
+@define
+class StatsPoster:
+    get_stats: Callable[[], Awaitable[BotStats | None]]
+    interval: float = 60.0 * 60.0
+    attempts: int = 4
+    backoff: float = 2.0
+    backoff_max: float = 60.0
+    providers: dict[str, StatsProvider] = field(init=False, factory=dict)
+    _task: asyncio.Task[None] | None = field(init=False, default=None)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_provider(self, provider: StatsProvider, /) -> None:
+        if provider.name in self.providers:
+            raise ValueError(f'Stats provider {provider.name!r} is already registered')
+
+        self.providers[provider.name] = provider
+
+    def remove_provider(self, name: str, /) -> None:
+        self.providers.pop(name, None)
+
+    def start(self, session: aiohttp.ClientSession, bot_id: int, /) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self.__run(session, bot_id))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def __run(self, session: aiohttp.ClientSession, bot_id: int, /) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            started = loop.time()
+            (result,) = await asyncio.gather(
+                self.tick(session, bot_id), return_exceptions=True
+            )
+
+            if isinstance(result, Exception):
+                _log.error('Could not post bot stats', exc_info=result)
+            elif isinstance(result, BaseException):
+                raise result
+
+            await asyncio.sleep(max(self.interval - (loop.time() - started), 0.0))
+
+    async def tick(
+        self, session: aiohttp.ClientSession, bot_id: int, /
+    ) -> dict[str, bool]:
+        if not self.providers:
+            return {}
+
+        stats = await self.get_stats()
+
+        if stats is None:
+            return {}
+
+        providers = list(self.providers.values())
+        results = await asyncio.gather(
+            *(self.__post(provider, session, bot_id, stats) for provider in providers)
+        )
+
+        return {
+            provider.name: result
+            for provider, result in zip(providers, results, strict=True)
+        }
+
+    async def __attempt(
+        self,
+        provider: StatsProvider,
+        session: aiohttp.ClientSession,
+        bot_id: int,
+        stats: BotStats,
+        /,
+    ) -> None:
+        start = time.perf_counter()
+
+        try:
+            async with asyncio.timeout(provider.timeout):
+                resp = await session.post(
+                    provider.get_url(bot_id),
+                    data=discord.utils._to_json(provider.get_payload(stats)),
+                    headers=provider.get_headers(),
+                )
+
+                async with resp:
+                    status, reason = resp.status, resp.reason
+                    retry_after = resp.headers.get('Retry-After')
+        except (aiohttp.ClientError, TimeoutError) as e:
+            raise _PostError(repr(e), retry=True) from e
+        finally:
+            provider.stats.record(time.perf_counter() - start)
+
+        if status < 400:
+            return
+
+        message = f'{status} {reason}'
+
+        # Anything but rate limits and server errors will fail again
+        if status != 429 and status < 500:
+            raise _PostError(message, retry=False)
+
+        try:
+            delay = float(retry_after) if retry_after is not None else 0.0
+        except ValueError:
+            delay = 0.0
+
+        if status == 429:
+            provider.retry_at = time.monotonic() + delay
+
+        raise _PostError(message, retry=True, delay=delay)
+
+    async def __post(
+        self,
+        provider: StatsProvider,
+        session: aiohttp.ClientSession,
+        bot_id: int,
+        stats: BotStats,
+        /,
+    ) -> bool:
+        if stats == provider.last_posted or time.monotonic() < provider.retry_at:
+            provider.stats.skipped += 1
+            return False
+
+        _log.info('Posting stats to %s: %s', provider.name, stats)
+        delay = self.backoff
+
+        for attempt in range(1, self.attempts + 1):
+            try:
+                await self.__attempt(provider, session, bot_id, stats)
+            except _PostError as e:
+                provider.stats.last_error = str(e)
+                _log.warning(
+                    'Could not post stats to %s (attempt %d): %s',
+                    provider.name,
+                    attempt,
+                    e,
+                )
+
+                if not e.retry:
+                    break
+
+                delay = max(delay, e.delay)
+            else:
+                provider.stats.posts += 1
+                provider.stats.last_error = None
+                provider.stats.last_posted_at = time.time()
+                provider.last_posted = stats.copy()
+                provider.retry_at = time.monotonic() + provider.min_interval
+                return True
+
+            if attempt < self.attempts:
+                if delay > self.backoff_max:
+                    break
+
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.backoff_max)
+
+        provider.stats.failures += 1
+        return False
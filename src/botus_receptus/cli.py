@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import contextlib
+import tempfile
+from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 import click
@@ -12,9 +14,11 @@ try:
 except ImportError:  # pragma: no cover
     from asyncio import run as _run
 
-from . import config, logging
+from . import cluster, config, logging
+from .profiler import SamplingProfiler
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable
     from logging import FileHandler
 
     from .bot import BotBase
@@ -49,6 +53,12 @@ def config_callback(
     return bot_config
 
 
+async def _profiled(profiler: SamplingProfiler, coro: Awaitable[None], /) -> None:
+    # Started from inside the loop so samples are grouped by the running task
+    profiler.start()
+    await coro
+
+
 def cli(
     bot_class: type[BotBase],
     default_config_path: str,
@@ -72,17 +82,66 @@ def cli(
         type=click.Choice(['critical', 'error', 'warning', 'info', 'debug']),
         default='info',
     )
-    def main(bot_config: config.Config, log_to_console: bool, log_level: str) -> None:  # noqa: FBT001
+    @click.option('--clusters', type=click.IntRange(min=1), default=None)
+    @click.option(
+        '--profile',
+        type=click.Path(dir_okay=False, writable=True, path_type=Path),
+        default=None,
+    )
+    def main(
+        bot_config: config.Config,
+        log_to_console: bool,  # noqa: FBT001
+        log_level: str,
+        clusters: int | None,
+        profile: Path | None,
+    ) -> None:
         cast('dict[str, object]', bot_config['logging']).update(
             {'log_to_console': log_to_console, 'log_level': log_level}
         )
 
+        if clusters is not None:
+            if profile is not None:
+                raise click.UsageError('--profile cannot be used with --clusters')
+
+            try:
+                target = cluster.worker_target(bot_class, handler_cls)
+            except TypeError as e:
+                raise click.UsageError(e.args[0]) from e
+
+            shard_count = _run(cluster.fetch_shard_count(bot_config['discord_api_key']))
+
+            with (
+                logging.setup_logging(bot_config, handler_cls=handler_cls),
+                tempfile.TemporaryDirectory(
+                    prefix=f'{bot_config["bot_name"]}-'
+                ) as ipc_dir,
+            ):
+                cluster.ClusterSupervisor(
+                    target,
+                    cast('config.Config', bot_config | {'ipc_dir': ipc_dir}),
+                    shard_count,
+                    clusters,
+                    # Workers drain invocations and then run shutdown tasks, each
+                    # for up to shutdown_timeout, before they exit
+                    stop_timeout=2 * bot_config.get('shutdown_timeout', 30.0) + 10,
+                ).run()
+
+            return
+
         with logging.setup_logging(bot_config, handler_cls=handler_cls):
             bot = bot_class(bot_config)
+            profiler = SamplingProfiler()
+            coro = bot.start_with_config()
+
+            if profile is not None:
+                coro = _profiled(profiler, coro)
 
             try:
-                _run(bot.start_with_config())
+                _run(coro)
             except KeyboardInterrupt:
                 return
+            finally:
+                if profiler.running:
+                    profiler.stop().write(cast('Path', profile))
 
     return main
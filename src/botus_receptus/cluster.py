@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import logging
+import multiprocessing
+import multiprocessing.connection
+import signal
+import threading
+import time
+from logging import FileHandler
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, NoReturn, cast
+
+import discord
+from attrs import define, field
+from discord.http import HTTPClient
+
+try:
+    from uvloop import run as _run
+except ImportError:  # pragma: no cover
+    from asyncio import run as _run
+
+from . import logging as _logging
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from multiprocessing.context import ForkContext, ForkServerContext, SpawnContext
+    from multiprocessing.process import BaseProcess
+
+    from .bot import BotBase
+    from .config import Config
+
+__all__ = (
+    'ClusterSupervisor',
+    'ClusterWorker',
+    'fetch_shard_count',
+    'run_worker',
+    'split_shards',
+    'worker_target',
+)
+
+_log: Final = logging.getLogger(__name__)
+
+
+async def fetch_shard_count(token: str, /) -> int:
+    client = HTTPClient(asyncio.get_running_loop())
+
+    try:
+        await client.static_login(token)
+        shard_count, _, _ = await client.get_bot_gateway()
+    finally:
+        await client.close()
+
+    return shard_count
+
+
+def split_shards(shard_count: int, clusters: int, /) -> list[list[int]]:
+    clusters = max(min(clusters, shard_count), 1)
+    size, remainder = divmod(shard_count, clusters)
+    shard_ids: list[list[int]] = []
+    start = 0
+
+    for cluster_id in range(clusters):
+        end = start + size + (1 if cluster_id < remainder else 0)
+        shard_ids.append(list(range(start, end)))
+        start = end
+
+    return shard_ids
+
+
+def _get_cluster_config(
+    config: Config, cluster_id: int, cluster_count: int, /
+) -> Config:
+    log_file = Path(config['logging']['log_file'])
+
+    return cast(
+        'Config',
+        config
+        | {
+            'cluster_id': cluster_id,
+            'cluster_count': cluster_count,
+            'logging': config['logging']
+            | {
+                'log_file': str(
+                    log_file.with_name(f'{log_file.stem}.{cluster_id}{log_file.suffix}')
+                )
+            },
+        },
+    )
+
+
+async def _start_worker(bot: BotBase, /) -> None:
+    tasks: set[asyncio.Task[None]] = set()
+
+    def close() -> None:
+        task = asyncio.create_task(bot.close())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    # The supervisor stops a worker with a single SIGTERM; closing the bot lets
+    # running invocations drain instead of killing the process outright
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, close)
+
+    await bot.start_with_config()
+
+
+def run_worker(
+    bot_class: type[BotBase],
+    config: Config,
+    shard_ids: list[int],
+    shard_count: int,
+    /,
+    handler_cls: type[FileHandler] = FileHandler,
+) -> None:
+    # Ctrl+C reaches the whole process group; only the supervisor reacts to it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    with _logging.setup_logging(config, handler_cls=handler_cls):
+        bot = bot_class(config, shard_ids=shard_ids, shard_count=shard_count)
+        _run(_start_worker(bot))
+
+
+def worker_target(
+    bot_class: type[BotBase],
+    /,
+    handler_cls: type[FileHandler] = discord.utils.MISSING,
+) -> Callable[[Config, list[int], int], None]:
+    if not issubclass(bot_class, discord.AutoShardedClient):
+        raise TypeError(
+            f'{bot_class.__name__} must be an AutoShardedBot to run in a cluster'
+        )
+
+    # discord.utils.MISSING does not survive pickling into a spawned process
+    if handler_cls is discord.utils.MISSING:
+        handler_cls = FileHandler
+
+    return functools.partial(run_worker, bot_class, handler_cls=handler_cls)
+
+
+@define
+class ClusterWorker:
+    cluster_id: int
+    shard_ids: list[int]
+    process: BaseProcess | None = None
+    started_at: float = 0.0
+    restart_at: float | None = None
+    restarts: int = 0
+    failures: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+@define
+class ClusterSupervisor:
+    target: Callable[[Config, list[int], int], object]
+    config: Config
+    shard_count: int
+    clusters: int
+    context: SpawnContext | ForkContext | ForkServerContext = field(
+        factory=lambda: multiprocessing.get_context('spawn')
+    )
+    min_uptime: float = 60.0
+    backoff_base: float = 1.0
+    backoff_max: float = 300.0
+    stop_timeout: float = 30.0
+    workers: list[ClusterWorker] = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.workers = [
+            ClusterWorker(cluster_id, shard_ids)
+            for cluster_id, shard_ids in enumerate(
+                split_shards(self.shard_count, self.clusters)
+            )
+        ]
+
+    def __spawn(self, worker: ClusterWorker, /) -> None:
+        config = _get_cluster_config(self.config, worker.cluster_id, len(self.workers))
+        process = self.context.Process(
+            target=self.target,
+            args=(config, worker.shard_ids, self.shard_count),
+            name=f'{self.config["bot_name"]}-cluster-{worker.cluster_id}',
+        )
+        process.start()
+
+        worker.process = process
+        worker.started_at = time.monotonic()
+        worker.restart_at = None
+
+        _log.info(
+            'Started cluster %d (pid %s) with shards %s',
+            worker.cluster_id,
+            process.pid,
+            worker.shard_ids,
+        )
+
+    def __reap(self, worker: ClusterWorker, /) -> bool:
+        process = cast('BaseProcess', worker.process)
+        process.join()
+        worker.process = None
+
+        if process.exitcode == 0:
+            _log.info('Cluster %d exited', worker.cluster_id)
+            return False
+
+        now = time.monotonic()
+
+        if now - worker.started_at >= self.min_uptime:
+            worker.failures = 0
+
+        delay = min(self.backoff_base * 2**worker.failures, self.backoff_max)
+        worker.failures += 1
+        worker.restarts += 1
+        worker.restart_at = now + delay
+
+        _log.warning(
+            'Cluster %d exited with code %s, restarting in %.1fs',
+            worker.cluster_id,
+            process.exitcode,
+            delay,
+        )
+
+        return True
+
+    def supervise(self) -> None:
+        for worker in self.workers:
+            self.__spawn(worker)
+
+        active = list(self.workers)
+
+        while active:
+            sentinels = [
+                worker.process.sentinel
+                for worker in active
+                if worker.process is not None
+            ]
+            restarts = [
+                worker.restart_at for worker in active if worker.restart_at is not None
+            ]
+            timeout = max(min(restarts) - time.monotonic(), 0.0) if restarts else None
+
+            multiprocessing.connection.wait(sentinels, timeout)
+
+            for worker in list(active):
+                if worker.process is not None and not worker.process.is_alive():
+                    if not self.__reap(worker):
+                        active.remove(worker)
+                elif (
+                    worker.restart_at is not None
+                    and worker.restart_at <= time.monotonic()
+                ):
+                    self.__spawn(worker)
+
+    def stop(self) -> None:
+        running = [worker for worker in self.workers if worker.alive]
+
+        for worker in running:
+            cast('BaseProcess', worker.process).terminate()
+
+        deadline = time.monotonic() + self.stop_timeout
+
+        for worker in running:
+            process = cast('BaseProcess', worker.process)
+            process.join(max(deadline - time.monotonic(), 0.0))
+
+            if process.is_alive():
+                _log.warning('Cluster %d did not stop, killing it', worker.cluster_id)
+                process.kill()
+                process.join()
+
+    def __on_sigterm(self, signum: int, frame: object, /) -> NoReturn:
+        raise KeyboardInterrupt
+
+    def run(self) -> None:
+        previous = None
+
+        if threading.current_thread() is threading.main_thread():
+            previous = signal.signal(signal.SIGTERM, self.__on_sigterm)
+
+        try:
+            with contextlib.suppress(KeyboardInterrupt):
+                self.supervise()
+        finally:
+            self.stop()
+
+            if previous is not None:
+                signal.signal(signal.SIGTERM, previous)
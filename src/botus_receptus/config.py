@@ -19,9 +19,49 @@ class _BaseConfig(TypedDict):
     application_id: int
     admin_guild: NotRequired[int]
     test_guilds: NotRequired[list[int]]
+    app_command_cache: NotRequired[str]
     command_prefix: NotRequired[str]
+    shutdown_timeout: NotRequired[float]
+    cluster_id: NotRequired[int]
+    cluster_count: NotRequired[int]
+    ipc_dir: NotRequired[str]
+    http_limit: NotRequired[int]
+    http_limit_per_host: NotRequired[int]
+    http_dns_cache_ttl: NotRequired[int]
+    http_keepalive_timeout: NotRequired[float]
+    http_timeout: NotRequired[float]
+    http_connect_timeout: NotRequired[float]
+    http_read_timeout: NotRequired[float]
+    http_cache_size: NotRequired[int]
+    http_cache_dir: NotRequired[str]
+    http_cache_disk_size: NotRequired[int]
+    metrics_host: NotRequired[str]
+    metrics_port: NotRequired[int]
+    metrics_path: NotRequired[str]
+    event_stats: NotRequired[bool]
+    loop_lag_threshold: NotRequired[float]
+    loop_lag_interval: NotRequired[float]
+    diagnostics_dir: NotRequired[str]
+    diagnostics_commands: NotRequired[bool]
+    profile_signal: NotRequired[bool]
+    profile_seconds: NotRequired[float]
+    profile_interval: NotRequired[float]
+    memory_tracing: NotRequired[bool]
+    memory_frames: NotRequired[int]
+    memory_signal: NotRequired[bool]
     db_url: NotRequired[str]
+    db_pool_size: NotRequired[int]
+    db_max_overflow: NotRequired[int]
+    db_pool_recycle: NotRequired[int]
+    db_pool_pre_ping: NotRequired[bool]
+    db_query_cache_size: NotRequired[int]
     dbl_token: NotRequired[str]
+    stats_post_interval: NotRequired[float]
+    topgg_webhook_auth: NotRequired[str]
+    topgg_webhook_host: NotRequired[str]
+    topgg_webhook_port: NotRequired[int]
+    topgg_webhook_path: NotRequired[str]
+    topgg_vote_flush_interval: NotRequired[float]
 
 
 class _RawLogging(TypedDict):
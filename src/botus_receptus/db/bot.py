@@ -45,8 +45,9 @@ class BotBase(bot.BotBase):
 
         super().__init__(config, *args, **kwargs)
 
-    @override
-    async def setup_hook(self) -> None:
+        self.add_startup_task('db_pool', self.__create_pool)
+
+    async def __create_pool(self) -> None:
         pool_kwargs: dict[str, Any] = {}
 
         if (init := _get_special_method(self.__db_init_connection__)) is not None:
@@ -61,8 +62,17 @@ class BotBase(bot.BotBase):
             max_size=10,
             **pool_kwargs,
         )
-
-        await super().setup_hook()
+        self.add_shutdown_task('db_pool', self.pool.close)
+
+        self.metrics.gauge(
+            'botus_db_pool_size', 'Connections open in the database pool'
+        ).set_function(self.pool.get_size)
+        self.metrics.gauge(
+            'botus_db_pool_idle', 'Idle connections in the database pool'
+        ).set_function(self.pool.get_idle_size)
+        self.metrics.gauge(
+            'botus_db_pool_max_size', 'Maximum size of the database pool'
+        ).set_function(self.pool.get_max_size)
 
     @_db_special_method
     async def __db_init_connection__(self, connection: Connection, /) -> None: ...
@@ -72,15 +82,14 @@ class BotBase(bot.BotBase):
         self, connection: PoolConnectionProxy, /
     ) -> None: ...
 
-    @override
-    async def close(self) -> None:
-        await self.pool.close()
-        await super().close()
-
     @override
     async def process_commands(self, message: discord.Message, /) -> None:
         ctx = await self.get_context(message, cls=Context[Any])
 
+        if ctx.command is None or not self.accepting_invocations:
+            await self.invoke(ctx)
+            return
+
         async with ctx.acquire():
             await self.invoke(ctx)
 
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final, override
+
+import discord
+from discord import app_commands
+
+from .app_commands import admin_guild_only
+from .cog import GroupCog
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .bot import AutoShardedBot, Bot
+
+__all__ = ('Diagnostics',)
+
+_MAX_UPLOAD: Final = 8 * 1024 * 1024
+
+
+async def _send_file(interaction: discord.Interaction, path: Path, /) -> None:
+    if path.stat().st_size <= _MAX_UPLOAD:
+        await interaction.followup.send(file=discord.File(path), ephemeral=True)
+    else:
+        await interaction.followup.send(f'Wrote {path}', ephemeral=True)
+
+
+@admin_guild_only
+@app_commands.default_permissions(administrator=True)
+class Diagnostics[BotT: Bot | AutoShardedBot](GroupCog[BotT], group_name='debug'):
+    @override
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await self.bot.is_owner(interaction.user)
+
+    @app_commands.command(description='Sample the bot for a number of seconds')
+    @app_commands.describe(seconds='How long to profile for')
+    async def profile(
+        self,
+        interaction: discord.Interaction,
+        seconds: app_commands.Range[float, 1.0, 300.0] = 30.0,
+    ) -> None:
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        try:
+            path = await self.bot.profile(seconds)
+        except RuntimeError as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+
+        await _send_file(interaction, path)
+
+    @app_commands.command(description='Snapshot memory use and cache sizes')
+    async def memory(self, interaction: discord.Interaction) -> None:
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        await _send_file(interaction, await self.bot.memory_snapshot())
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Final, Literal, cast
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .metrics import Counter, Registry
+
+__all__ = ('EventStats', 'EventTotals', 'RollingTotals', 'get_shard_id')
+
+_GUILD_EVENTS: Final = frozenset({'GUILD_CREATE', 'GUILD_UPDATE', 'GUILD_DELETE'})
+
+
+def get_shard_id(event: str, data: object, shard_count: int, /) -> int:
+    guild_id: str | int | None = None
+
+    if isinstance(data, dict):
+        payload = cast('dict[str, Any]', data)
+        guild_id = payload.get('guild_id')
+
+        if guild_id is None and event in _GUILD_EVENTS:
+            guild_id = payload.get('id')
+
+    # Discord sends direct messages and other guildless events to shard 0
+    if guild_id is None or shard_count <= 1:
+        return 0
+
+    return (int(guild_id) >> 22) % shard_count
+
+
+@define
+class EventTotals:
+    name: str
+    count: int = 0
+    time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.time / self.count if self.count else 0.0
+
+
+@define
+class RollingTotals:
+    window: float = 60.0
+    windows: int = 10
+    _slots: deque[tuple[int, dict[str, EventTotals]]] = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._slots = deque(maxlen=self.windows)
+
+    def record(self, name: str, duration: float, /) -> None:
+        slot = int(time.monotonic() // self.window)
+
+        if not self._slots or self._slots[-1][0] != slot:
+            self._slots.append((slot, {}))
+
+        totals = self._slots[-1][1]
+
+        if (entry := totals.get(name)) is None:
+            entry = totals[name] = EventTotals(name)
+
+        entry.count += 1
+        entry.time += duration
+
+    def totals(self) -> dict[str, EventTotals]:
+        oldest = int(time.monotonic() // self.window) - self.windows
+        merged: dict[str, EventTotals] = {}
+
+        for slot, totals in self._slots:
+            if slot <= oldest:
+                continue
+
+            for name, entry in totals.items():
+                if (merged_entry := merged.get(name)) is None:
+                    merged_entry = merged[name] = EventTotals(name)
+
+                merged_entry.count += entry.count
+                merged_entry.time += entry.time
+
+        return merged
+
+    def top(
+        self, n: int = 10, /, *, by: Literal['count', 'time'] = 'time'
+    ) -> list[EventTotals]:
+        key: Callable[[EventTotals], float] = (
+            (lambda entry: entry.time) if by == 'time' else (lambda entry: entry.count)
+        )
+
+        return sorted(self.totals().values(), key=key, reverse=True)[:n]
+
+    def clear(self) -> None:
+        self._slots.clear()
+
+
+@define
+class EventStats:
+    gateway: RollingTotals = field(factory=RollingTotals)
+    listeners: RollingTotals = field(factory=RollingTotals)
+    _events: Counter | None = field(init=False, default=None)
+    _parse_time: Counter | None = field(init=False, default=None)
+    _listener_calls: Counter | None = field(init=False, default=None)
+    _listener_time: Counter | None = field(init=False, default=None)
+
+    def register_metrics(self, registry: Registry, /) -> None:
+        self._events = registry.counter(
+            'botus_gateway_events_total',
+            'Gateway events received by type and shard',
+            ('event', 'shard'),
+        )
+        self._parse_time = registry.counter(
+            'botus_gateway_event_seconds_total',
+            'Time spent parsing and dispatching gateway events by type',
+            ('event',),
+        )
+        self._listener_calls = registry.counter(
+            'botus_event_listener_calls_total',
+            'Event listener invocations by event',
+            ('event',),
+        )
+        self._listener_time = registry.counter(
+            'botus_event_listener_seconds_total',
+            'Time spent in event listeners by event',
+            ('event',),
+        )
+
+    def record_gateway(self, event: str, shard_id: int, duration: float, /) -> None:
+        self.gateway.record(event, duration)
+
+        if self._events is not None and self._parse_time is not None:
+            self._events.labels(event, shard_id).inc()
+            self._parse_time.labels(event).inc(duration)
+
+    def record_listener(self, event: str, duration: float, /) -> None:
+        self.listeners.record(event, duration)
+
+        if self._listener_calls is not None and self._listener_time is not None:
+            self._listener_calls.labels(event).inc()
+            self._listener_time.labels(event).inc(duration)
+
+    def report(self, n: int = 10, /) -> str:
+        lines: list[str] = []
+
+        for title, totals in (
+            ('Gateway events', self.gateway),
+            ('Listeners', self.listeners),
+        ):
+            lines.append(f'{title} (last {totals.window * totals.windows:.0f}s):')
+            lines.extend(
+                f'  {entry.name:<32} {entry.count:>8} {entry.time * 1000:>10.1f}ms'
+                f' {entry.average_time * 1000:>8.3f}ms/event'
+                for entry in totals.top(n)
+            )
+
+        return '\n'.join(lines)
@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import email.utils
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Final, TypedDict
+
+import aiohttp
+import attrs
+from attrs import define, field
+from multidict import CIMultiDict
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from pathlib import Path
+    from types import SimpleNamespace
+
+    from .config import Config
+    from .metrics import Histogram, Registry
+
+__all__ = (
+    'CachedResponse',
+    'HTTPStats',
+    'HTTPStatsSnapshot',
+    'HostStats',
+    'ResponseCache',
+    'create_session',
+)
+
+_log: Final = logging.getLogger(__name__)
+
+
+def _get_connector_kwargs(config: Config, /) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {}
+
+    if (limit := config.get('http_limit')) is not None:
+        kwargs['limit'] = limit
+
+    if (limit_per_host := config.get('http_limit_per_host')) is not None:
+        kwargs['limit_per_host'] = limit_per_host
+
+    if (dns_cache_ttl := config.get('http_dns_cache_ttl')) is not None:
+        kwargs['ttl_dns_cache'] = dns_cache_ttl
+
+    if (keepalive_timeout := config.get('http_keepalive_timeout')) is not None:
+        kwargs['keepalive_timeout'] = keepalive_timeout
+
+    return kwargs
+
+
+def _get_timeout(config: Config, /) -> aiohttp.ClientTimeout | None:
+    if (
+        'http_timeout' not in config
+        and 'http_connect_timeout' not in config
+        and 'http_read_timeout' not in config
+    ):
+        return None
+
+    # aiohttp's defaults for anything not configured
+    return aiohttp.ClientTimeout(
+        total=config.get('http_timeout', 5 * 60),
+        sock_connect=config.get('http_connect_timeout', 30),
+        sock_read=config.get('http_read_timeout'),
+    )
+
+
+def create_session(
+    config: Config,
+    /,
+    *,
+    trace_configs: Iterable[aiohttp.TraceConfig] = (),
+    **kwargs: Any,
+) -> aiohttp.ClientSession:
+    if (timeout := _get_timeout(config)) is not None:
+        kwargs['timeout'] = timeout
+
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(**_get_connector_kwargs(config)),
+        trace_configs=list(trace_configs),
+        **kwargs,
+    )
+
+
+@define
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.requests if self.requests else 0.0
+
+    def record(self, duration: float, /, *, error: bool = False) -> None:
+        self.requests += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+
+        if error:
+            self.errors += 1
+
+
+class HTTPStatsSnapshot(TypedDict):
+    connections_created: int
+    connections_reused: int
+    reuse_ratio: float
+    hosts: dict[str, HostStats]
+
+
+@define
+class HTTPStats:
+    connections_created: int = 0
+    connections_reused: int = 0
+    hosts: dict[str, HostStats] = field(factory=dict)
+    _duration: Histogram | None = field(init=False, default=None)
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    def snapshot(self) -> HTTPStatsSnapshot:
+        return {
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'reuse_ratio': self.reuse_ratio,
+            'hosts': dict(self.hosts),
+        }
+
+    def register_metrics(self, registry: Registry, /) -> None:
+        connections = registry.counter(
+            'botus_http_connections_total', 'HTTP connections by origin', ('state',)
+        )
+        connections.labels('created').set_function(lambda: self.connections_created)
+        connections.labels('reused').set_function(lambda: self.connections_reused)
+
+        requests = registry.counter(
+            'botus_http_requests_total', 'HTTP requests by host', ('host',)
+        )
+        errors = registry.counter(
+            'botus_http_request_errors_total', 'Failed HTTP requests by host', ('host',)
+        )
+        self._duration = registry.histogram(
+            'botus_http_request_duration_seconds',
+            'HTTP request duration by host',
+            ('host',),
+        )
+
+        def collect() -> None:
+            for host, stats in list(self.hosts.items()):
+                requests.labels(host).value = stats.requests
+                errors.labels(host).value = stats.errors
+
+        registry.add_collector(collect)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self.__on_request_start)
+        trace_config.on_request_end.append(self.__on_request_end)
+        trace_config.on_request_exception.append(self.__on_request_exception)
+        trace_config.on_connection_create_end.append(self.__on_connection_create)
+        trace_config.on_connection_reuseconn.append(self.__on_connection_reuse)
+        return trace_config
+
+    def __record(
+        self, ctx: SimpleNamespace, host: str | None, /, *, error: bool
+    ) -> None:
+        duration = time.perf_counter() - ctx.start
+        self.hosts.setdefault(host or '', HostStats()).record(duration, error=error)
+
+        if self._duration is not None:
+            self._duration.labels(host or '').observe(duration)
+
+    async def __on_request_start(
+        self,
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        ctx.start = time.perf_counter()
+
+    async def __on_request_end(
+        self,
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        self.__record(ctx, params.url.host, error=False)
+
+    async def __on_request_exception(
+        self,
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestExceptionParams,
+    ) -> None:
+        self.__record(ctx, params.url.host, error=True)
+
+    async def __on_connection_create(
+        self,
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        self.connections_created += 1
+
+    async def __on_connection_reuse(
+        self,
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        self.connections_reused += 1
+
+
+def _get_key(url: str, headers: Mapping[str, str] | None, /) -> str:
+    if not headers:
+        return url
+
+    # Responses can depend on any request header (Authorization, Accept, ...), so
+    # requests with different headers never share an entry
+    return json.dumps(
+        [url, sorted((name.lower(), value) for name, value in headers.items())],
+        separators=(',', ':'),
+    )
+
+
+def _get_max_age(headers: Mapping[str, str], /) -> float | None:
+    headers = CIMultiDict(headers)
+    directives: dict[str, str | None] = {}
+
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    if 'no-store' in directives or headers.get('Vary', '').strip() == '*':
+        return None
+
+    if 'no-cache' in directives:
+        return 0.0
+
+    age = 0.0
+
+    with contextlib.suppress(ValueError):
+        age = max(float(headers.get('Age', 0) or 0), 0.0)
+
+    if (max_age := directives.get('max-age')) is not None:
+        with contextlib.suppress(ValueError):
+            return max(float(max_age) - age, 0.0)
+
+    if (expires := headers.get('Expires')) is not None:
+        with contextlib.suppress(TypeError, ValueError):
+            return max(
+                email.utils.parsedate_to_datetime(expires).timestamp() - time.time(),
+                0.0,
+            )
+
+    return 0.0
+
+
+@define
+class CachedResponse:
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    stored_at: float = field(factory=time.time)
+    max_age: float | None = None
+
+    @property
+    def cacheable(self) -> bool:
+        return self.status == 200 and self.max_age is not None
+
+    @property
+    def fresh(self) -> bool:
+        return self.max_age is not None and time.time() < self.stored_at + self.max_age
+
+    @property
+    def etag(self) -> str | None:
+        return CIMultiDict(self.headers).get('ETag')
+
+    @property
+    def last_modified(self) -> str | None:
+        return CIMultiDict(self.headers).get('Last-Modified')
+
+    def text(self, encoding: str = 'utf-8') -> str:
+        return self.body.decode(encoding)
+
+    def json(self) -> Any:  # noqa: ANN401
+        return json.loads(self.body)
+
+    def revalidated(self, headers: Mapping[str, str], /) -> CachedResponse:
+        merged = CIMultiDict(self.headers)
+        merged.update(headers)
+        return attrs.evolve(
+            self,
+            headers=dict(merged),
+            stored_at=time.time(),
+            max_age=_get_max_age(merged),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'url': self.url,
+            'status': self.status,
+            'headers': self.headers,
+            'body': base64.b64encode(self.body).decode(),
+            'stored_at': self.stored_at,
+            'max_age': self.max_age,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], /) -> CachedResponse:
+        return cls(
+            data['url'],
+            data['status'],
+            data['headers'],
+            base64.b64decode(data['body']),
+            data['stored_at'],
+            data['max_age'],
+        )
+
+
+@define
+class ResponseCache:
+    maxsize: int = 256
+    directory: Path | None = None
+    disk_maxsize: int = 1024
+    hits: int = field(init=False, default=0)
+    revalidations: int = field(init=False, default=0)
+    misses: int = field(init=False, default=0)
+    _entries: OrderedDict[str, CachedResponse] = field(init=False, factory=OrderedDict)
+    _inflight: dict[str, asyncio.Task[CachedResponse]] = field(init=False, factory=dict)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def register_metrics(self, registry: Registry, /) -> None:
+        registry.gauge(
+            'botus_http_cache_entries', 'Responses held in memory'
+        ).set_function(lambda: len(self))
+
+        lookups = registry.counter(
+            'botus_http_cache_lookups_total', 'Cached fetches by result', ('result',)
+        )
+        lookups.labels('hit').set_function(lambda: self.hits)
+        lookups.labels('revalidated').set_function(lambda: self.revalidations)
+        lookups.labels('miss').set_function(lambda: self.misses)
+
+    def __path(self, key: str, /) -> Path | None:
+        if self.directory is None:
+            return None
+
+        return self.directory / f'{hashlib.sha256(key.encode()).hexdigest()}.json'
+
+    def __read(self, key: str, /) -> CachedResponse | None:
+        if (path := self.__path(key)) is None:
+            return None
+
+        try:
+            response = CachedResponse.from_dict(json.loads(path.read_text()))
+            path.touch()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return response
+
+    def __write(self, key: str, response: CachedResponse, /) -> None:
+        if (path := self.__path(key)) is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(response.to_dict()))
+            self.__prune(path.parent)
+        except OSError:
+            _log.warning('Could not write cached response to %s', path)
+
+    def __prune(self, directory: Path, /) -> None:
+        paths = list(directory.glob('*.json'))
+
+        if len(paths) <= self.disk_maxsize:
+            return
+
+        paths.sort(key=lambda path: path.stat().st_mtime)
+
+        for path in paths[: len(paths) - self.disk_maxsize]:
+            path.unlink(missing_ok=True)
+
+    def __store(self, key: str, response: CachedResponse, /) -> None:
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self, url: str, /, *, headers: Mapping[str, str] | None = None
+    ) -> CachedResponse | None:
+        key = _get_key(url, headers)
+
+        if (response := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+            return response
+
+        if (response := await asyncio.to_thread(self.__read, key)) is not None:
+            self.__store(key, response)
+
+        return response
+
+    async def set(
+        self,
+        response: CachedResponse,
+        /,
+        *,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        key = _get_key(response.url, headers)
+        self.__store(key, response)
+        await asyncio.to_thread(self.__write, key, response)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        /,
+        *,
+        headers: Mapping[str, str] | None = None,
+    ) -> CachedResponse:
+        key = _get_key(url, headers)
+
+        if (task := self._inflight.get(key)) is None:
+            task = self._inflight[key] = asyncio.create_task(
+                self.__fetch(session, url, headers)
+            )
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def __fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Mapping[str, str] | None,
+        /,
+    ) -> CachedResponse:
+        cached = await self.get(url, headers=headers)
+
+        if cached is not None and cached.fresh:
+            self.hits += 1
+            return cached
+
+        request_headers = dict(headers or {})
+
+        if cached is not None:
+            if (etag := cached.etag) is not None:
+                request_headers['If-None-Match'] = etag
+
+            if (last_modified := cached.last_modified) is not None:
+                request_headers['If-Modified-Since'] = last_modified
+
+        async with session.get(url, headers=request_headers) as resp:
+            if cached is not None and resp.status == 304:
+                self.revalidations += 1
+                response = cached.revalidated(resp.headers)
+            else:
+                self.misses += 1
+                response_headers = dict(resp.headers)
+                response = CachedResponse(
+                    url,
+                    resp.status,
+                    response_headers,
+                    await resp.read(),
+                    max_age=_get_max_age(response_headers),
+                )
+
+        if response.cacheable:
+            await self.set(response, headers=headers)
+
+        return response
@@ -3,8 +3,9 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import enum
+import weakref
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Self, TypedDict, cast, override
+from typing import TYPE_CHECKING, Any, Final, Self, TypedDict, cast, override
 
 import discord
 import discord.abc
@@ -25,6 +26,10 @@ if TYPE_CHECKING:
 
 type _WaitResult = tuple[discord.Reaction, discord.User | discord.Member]
 
+_active: Final[weakref.WeakValueDictionary[int, InteractivePager[Any]]] = (
+    weakref.WeakValueDictionary()
+)
+
 # Inspired by paginator from https://github.com/Rapptz/RoboDanny
 
 
@@ -331,6 +336,10 @@ class InteractivePager[T]:
 
         self.help_task = self.bot.loop.create_task(go_back_to_current_page())
 
+    @staticmethod
+    def active_count() -> int:
+        return len(_active)
+
     async def paginate(self) -> None:
         first_page = self.__show_page(1, first=True)
         if not self.paginating:
@@ -338,7 +347,14 @@ class InteractivePager[T]:
             return
 
         self.bot.loop.create_task(first_page)
+        _active[id(self)] = self
+
+        try:
+            await self.__paginate()
+        finally:
+            _active.pop(id(self), None)
 
+    async def __paginate(self) -> None:
         if self.can_manage_messages:
 
             def wait_for_reaction() -> Awaitable[_WaitResult]:
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import struct
+from typing import TYPE_CHECKING, Any, Final, cast
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+    from pathlib import Path
+
+__all__ = ('IPCBus', 'IPCError', 'IPCRemoteError')
+
+_log: Final = logging.getLogger(__name__)
+
+_header: Final = struct.Struct('>I')
+
+type Handler = Callable[[Any], Awaitable[Any]]
+
+
+class IPCError(Exception): ...
+
+
+class IPCRemoteError(IPCError):
+    cluster_id: int
+    name: str
+
+    def __init__(self, cluster_id: int, name: str, message: str, /) -> None:
+        super().__init__(f'Cluster {cluster_id} failed to handle {name!r}: {message}')
+        self.cluster_id = cluster_id
+        self.name = name
+
+
+async def _read_frame(reader: asyncio.StreamReader, /) -> dict[str, Any]:
+    (length,) = _header.unpack(await reader.readexactly(_header.size))
+    return cast('dict[str, Any]', json.loads(await reader.readexactly(length)))
+
+
+def _write_frame(writer: asyncio.StreamWriter, frame: dict[str, Any], /) -> None:
+    data = json.dumps(frame, separators=(',', ':')).encode()
+    writer.write(_header.pack(len(data)) + data)
+
+
+@define
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    pending: dict[int, asyncio.Future[dict[str, Any]]] = field(factory=dict)
+    task: asyncio.Task[None] | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self.task is None or self.task.done()
+
+    async def read_responses(self) -> None:
+        try:
+            while True:
+                frame = await _read_frame(self.reader)
+
+                if (future := self.pending.pop(frame['id'], None)) is not None:
+                    future.set_result(frame)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for future in self.pending.values():
+                future.set_exception(IPCError('Connection closed'))
+
+            self.pending.clear()
+            self.writer.close()
+
+
+@define
+class IPCBus:
+    directory: Path
+    cluster_id: int
+    cluster_count: int
+    _handlers: dict[str, Handler] = field(init=False, factory=dict)
+    _server: asyncio.Server | None = field(init=False, default=None)
+    _connections: dict[int, _Connection] = field(init=False, factory=dict)
+    _connecting: dict[int, asyncio.Lock] = field(init=False, factory=dict)
+    _ids: itertools.count[int] = field(init=False, factory=itertools.count)
+
+    def path(self, cluster_id: int, /) -> Path:
+        return self.directory / f'{cluster_id}.sock'
+
+    def add_handler(self, name: str, func: Handler, /) -> None:
+        if name in self._handlers:
+            raise ValueError(f'IPC handler {name!r} is already registered')
+
+        self._handlers[name] = func
+
+    def remove_handler(self, name: str, /) -> None:
+        self._handlers.pop(name, None)
+
+    async def start(self) -> None:
+        self.path(self.cluster_id).unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(
+            self.__handle_connection, self.path(self.cluster_id)
+        )
+
+    async def close(self) -> None:
+        for connection in self._connections.values():
+            connection.writer.close()
+
+            if connection.task is not None:
+                await connection.task
+
+        self._connections.clear()
+
+        if self._server is not None:
+            # wait_closed() waits for every accepted connection, and peers that are
+            # shutting down at the same time would otherwise wait on each other
+            self._server.close()
+            self._server.close_clients()
+            await self._server.wait_closed()
+            self._server = None
+            self.path(self.cluster_id).unlink(missing_ok=True)
+
+    async def __handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        tasks: set[asyncio.Task[None]] = set()
+
+        try:
+            while True:
+                frame = await _read_frame(reader)
+                task = asyncio.create_task(self.__respond(writer, frame))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            writer.close()
+
+    async def __respond(
+        self, writer: asyncio.StreamWriter, frame: dict[str, Any], /
+    ) -> None:
+        response: dict[str, Any] = {'id': frame['id']}
+
+        (result,) = await asyncio.gather(
+            self.__call(frame['name'], frame.get('data')), return_exceptions=True
+        )
+
+        if isinstance(result, Exception):
+            _log.error('IPC handler %s failed', frame['name'], exc_info=result)
+            response['error'] = str(result) or type(result).__name__
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            response['result'] = result
+
+        if not writer.is_closing():
+            _write_frame(writer, response)
+            await writer.drain()
+
+    async def __call(self, name: str, data: Any, /) -> Any:  # noqa: ANN401
+        if (handler := self._handlers.get(name)) is None:
+            raise IPCError(f'No IPC handler named {name!r}')
+
+        return await handler(data)
+
+    async def __connect(self, cluster_id: int, /) -> _Connection:
+        lock = self._connecting.setdefault(cluster_id, asyncio.Lock())
+
+        async with lock:
+            connection = self._connections.get(cluster_id)
+
+            if connection is None or connection.closed:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(
+                        self.path(cluster_id)
+                    )
+                except OSError as e:
+                    raise IPCError(f'Cluster {cluster_id} is not reachable') from e
+
+                connection = self._connections[cluster_id] = _Connection(reader, writer)
+                connection.task = asyncio.create_task(connection.read_responses())
+
+            return connection
+
+    async def request(
+        self,
+        cluster_id: int,
+        name: str,
+        data: Any = None,  # noqa: ANN401
+        /,
+        *,
+        timeout: float = 5.0,
+    ) -> Any:  # noqa: ANN401
+        async with asyncio.timeout(timeout):
+            if cluster_id == self.cluster_id:
+                return await self.__call(name, data)
+
+            connection = await self.__connect(cluster_id)
+            request_id = next(self._ids)
+            future = connection.pending[request_id] = (
+                asyncio.get_running_loop().create_future()
+            )
+
+            try:
+                _write_frame(
+                    connection.writer, {'id': request_id, 'name': name, 'data': data}
+                )
+                await connection.writer.drain()
+                response = await future
+            finally:
+                connection.pending.pop(request_id, None)
+
+        if 'error' in response:
+            raise IPCRemoteError(cluster_id, name, response['error'])
+
+        return response.get('result')
+
+    async def broadcast(
+        self,
+        name: str,
+        data: Any = None,  # noqa: ANN401
+        /,
+        *,
+        timeout: float = 5.0,
+        include_self: bool = True,
+    ) -> dict[int, Any]:
+        cluster_ids = [
+            cluster_id
+            for cluster_id in range(self.cluster_count)
+            if include_self or cluster_id != self.cluster_id
+        ]
+        results = await asyncio.gather(
+            *(
+                self.request(cluster_id, name, data, timeout=timeout)
+                for cluster_id in cluster_ids
+            ),
+            return_exceptions=True,
+        )
+        responses: dict[int, Any] = {}
+
+        for cluster_id, result in zip(cluster_ids, results, strict=True):
+            if isinstance(result, BaseException):
+                if not isinstance(result, IPCError | TimeoutError):
+                    raise result
+
+                _log.warning(
+                    'Cluster %d did not answer %r: %r', cluster_id, name, result
+                )
+            else:
+                responses[cluster_id] = result
+
+        return responses
+
+    async def aggregate[T](
+        self,
+        name: str,
+        reducer: Callable[[Iterable[Any]], T],
+        data: Any = None,  # noqa: ANN401
+        /,
+        *,
+        timeout: float = 5.0,
+    ) -> T:
+        return reducer((await self.broadcast(name, data, timeout=timeout)).values())
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Final
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from pathlib import Path
+
+__all__ = ('MemoryReport', 'MemoryTracker')
+
+_FILTERS: Final = (
+    tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+    tracemalloc.Filter(inclusive=False, filename_pattern='<frozen importlib.*>'),
+    tracemalloc.Filter(inclusive=False, filename_pattern='<unknown>'),
+)
+
+
+def _format_size(size: float, /, *, sign: bool = False) -> str:
+    prefix = '+' if sign and size > 0 else ''
+
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{prefix}{size:.1f} {unit}'
+
+        size /= 1024
+
+    return f'{prefix}{size:.1f} GiB'
+
+
+def _location(traceback: tracemalloc.Traceback, /) -> str:
+    frame = traceback[0]
+    return f'{frame.filename}:{frame.lineno}'
+
+
+@define
+class MemoryReport:
+    taken_at: float
+    current: int
+    peak: int
+    sizes: dict[str, int]
+    top: list[tracemalloc.Statistic]
+    growth: list[tracemalloc.StatisticDiff] | None = None
+    interval: float | None = None
+
+    def format(self) -> str:
+        taken_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.taken_at))
+        lines = [
+            f'Memory report at {taken_at}',
+            f'Traced: {_format_size(self.current)} (peak {_format_size(self.peak)})',
+            '',
+            'Cache sizes:',
+        ]
+        lines.extend(f'  {name:<24} {size:>12}' for name, size in self.sizes.items())
+        lines.extend(('', 'Top allocations by line:'))
+        lines.extend(
+            f'  {_format_size(stat.size):>12} {stat.count:>9} blocks  '
+            f'{_location(stat.traceback)}'
+            for stat in self.top
+        )
+
+        if self.growth is not None:
+            lines.extend(('', f'Growth over the last {self.interval or 0:.0f}s:'))
+            lines.extend(
+                f'  {_format_size(stat.size_diff, sign=True):>12} '
+                f'{stat.count_diff:>+9} blocks  {_location(stat.traceback)}'
+                for stat in self.growth
+                if stat.size_diff or stat.count_diff
+            )
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path, /) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.format())
+
+
+@define
+class MemoryTracker:
+    frames: int = 1
+    limit: int = 25
+    _probes: dict[str, Callable[[], int]] = field(init=False, factory=dict)
+    _previous: tracemalloc.Snapshot | None = field(init=False, default=None)
+    _previous_at: float = field(init=False, default=0.0)
+    _started: bool = field(init=False, default=False)
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def add_probe(self, name: str, func: Callable[[], int], /) -> None:
+        self._probes[name] = func
+
+    def remove_probe(self, name: str, /) -> None:
+        self._probes.pop(name, None)
+
+    def sizes(self) -> dict[str, int]:
+        return {name: probe() for name, probe in self._probes.items()}
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+        self._previous = None
+
+    def snapshot(
+        self,
+        *,
+        sizes: Mapping[str, int] | None = None,
+        dump: Path | None = None,
+        stop_tracing: bool = False,
+    ) -> MemoryReport:
+        sizes = self.sizes() if sizes is None else sizes
+
+        with self._lock:
+            # Tracing started here only covers allocations made from now on, so
+            # a one-off snapshot mostly reports cache sizes
+            self.start()
+
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+            now = time.time()
+
+            report = MemoryReport(
+                now,
+                current,
+                peak,
+                dict(sizes),
+                snapshot.statistics('lineno')[: self.limit],
+            )
+
+            if self._previous is not None:
+                report.growth = snapshot.compare_to(self._previous, 'lineno')[
+                    : self.limit
+                ]
+                report.interval = now - self._previous_at
+
+            self._previous = snapshot
+            self._previous_at = now
+
+            if stop_tracing:
+                self.stop()
+
+        if dump is not None:
+            dump.parent.mkdir(parents=True, exist_ok=True)
+            snapshot.dump(str(dump))
+
+        return report
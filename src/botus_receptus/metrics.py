@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, ClassVar, Final, cast, override
+
+from aiohttp import web
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+__all__ = (
+    'DEFAULT_BUCKETS',
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsServer',
+    'Registry',
+)
+
+_log: Final = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS: Final = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+type _Sample = tuple[str, dict[str, str], float]
+
+
+def _format_value(value: float, /) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+
+    if value.is_integer():
+        return str(int(value))
+
+    return repr(value)
+
+
+def _escape(value: str, /) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_labels(labels: dict[str, str], /) -> str:
+    if not labels:
+        return ''
+
+    return (
+        '{'
+        + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+        + '}'
+    )
+
+
+@define
+class _CounterValue:
+    value: float = 0.0
+    function: Callable[[], float] | None = None
+
+    def get(self) -> float:
+        return self.value if self.function is None else float(self.function())
+
+    def set_function(self, function: Callable[[], float], /) -> None:
+        self.function = function
+
+    def inc(self, amount: float = 1.0, /) -> None:
+        if amount < 0:
+            raise ValueError('Counters can only be incremented by positive amounts')
+
+        self.value += amount
+
+
+@define
+class _GaugeValue:
+    value: float = 0.0
+    function: Callable[[], float] | None = None
+
+    def get(self) -> float:
+        return self.value if self.function is None else float(self.function())
+
+    def set_function(self, function: Callable[[], float], /) -> None:
+        self.function = function
+
+    def set(self, value: float, /) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0, /) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0, /) -> None:
+        self.value -= amount
+
+
+@define
+class _HistogramValue:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(init=False)
+    sum: float = field(init=False, default=0.0)
+    count: int = field(init=False, default=0)
+
+    def __attrs_post_init__(self) -> None:
+        # The last slot counts observations above the largest bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float, /) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@define
+class _Metric[V](ABC):
+    type: ClassVar[str]
+
+    name: str
+    documentation: str
+    labelnames: tuple[str, ...] = ()
+    _children: dict[tuple[str, ...], V] = field(init=False, factory=dict)
+
+    def labels(self, *values: object) -> V:
+        key = tuple(map(str, values))
+
+        if (child := self._children.get(key)) is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f'{self.name} expects labels {self.labelnames}, got {key}'
+                )
+
+            child = self._children[key] = self._new_child()
+
+        return child
+
+    def remove(self, *values: object) -> None:
+        self._children.pop(tuple(map(str, values)), None)
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    @abstractmethod
+    def _new_child(self) -> V: ...
+
+    @abstractmethod
+    def _child_samples(
+        self, child: V, /
+    ) -> Iterator[tuple[str, str | None, float]]: ...
+
+    def samples(self) -> Iterator[_Sample]:
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key, strict=True))
+
+            for suffix, le, value in self._child_samples(child):
+                yield (
+                    f'{self.name}{suffix}',
+                    labels if le is None else labels | {'le': le},
+                    value,
+                )
+
+
+@define
+class Counter(_Metric[_CounterValue]):
+    type: ClassVar[str] = 'counter'
+
+    def inc(self, amount: float = 1.0, /) -> None:
+        self.labels().inc(amount)
+
+    @override
+    def _new_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    @override
+    def _child_samples(
+        self, child: _CounterValue, /
+    ) -> Iterator[tuple[str, str | None, float]]:
+        yield '', None, child.get()
+
+
+@define
+class Gauge(_Metric[_GaugeValue]):
+    type: ClassVar[str] = 'gauge'
+
+    def set(self, value: float, /) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float], /) -> None:
+        self.labels().set_function(function)
+
+    @override
+    def _new_child(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    @override
+    def _child_samples(
+        self, child: _GaugeValue, /
+    ) -> Iterator[tuple[str, str | None, float]]:
+        yield '', None, child.get()
+
+
+@define
+class Histogram(_Metric[_HistogramValue]):
+    type: ClassVar[str] = 'histogram'
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+
+    def __attrs_post_init__(self) -> None:
+        self.buckets = tuple(sorted(self.buckets))
+
+    def observe(self, value: float, /) -> None:
+        self.labels().observe(value)
+
+    @override
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    @override
+    def _child_samples(
+        self, child: _HistogramValue, /
+    ) -> Iterator[tuple[str, str | None, float]]:
+        total = 0
+
+        for bound, count in zip((*self.buckets, math.inf), child.counts, strict=True):
+            total += count
+            yield '_bucket', _format_value(bound), total
+
+        yield '_sum', None, child.sum
+        yield '_count', None, child.count
+
+
+@define
+class Registry:
+    _metrics: dict[str, _Metric[Any]] = field(init=False, factory=dict)
+    _collectors: list[Callable[[], object]] = field(init=False, factory=list)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._metrics
+
+    def get(self, name: str, /) -> _Metric[Any] | None:
+        return self._metrics.get(name)
+
+    def __register[M: _Metric[Any]](
+        self, cls: type[M], name: str, /, *args: Any, **kwargs: Any
+    ) -> M:
+        if (metric := self._metrics.get(name)) is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        elif type(metric) is not cls:
+            raise ValueError(
+                f'Metric {name!r} is already registered as a {metric.type}'
+            )
+
+        return cast('M', metric)
+
+    def counter(
+        self, name: str, documentation: str, /, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self.__register(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, /, labelnames: tuple[str, ...] = ()
+    ) -> Gauge:
+        return self.__register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        /,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.__register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def add_collector(self, func: Callable[[], object], /) -> None:
+        self._collectors.append(func)
+
+    def remove_collector(self, func: Callable[[], object], /) -> None:
+        if func in self._collectors:
+            self._collectors.remove(func)
+
+    def collect(self) -> Iterator[_Metric[Any]]:
+        for collector in self._collectors:
+            collector()
+
+        yield from self._metrics.values()
+
+    def expose(self) -> str:
+        lines: list[str] = []
+
+        for metric in self.collect():
+            lines.append(f'# HELP {metric.name} {_escape(metric.documentation)}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(
+                f'{name}{_format_labels(labels)} {_format_value(value)}'
+                for name, labels, value in metric.samples()
+            )
+
+        return '\n'.join(lines) + '\n'
+
+
+@define
+class MetricsServer:
+    registry: Registry
+    host: str = '127.0.0.1'
+    port: int = 9090
+    path: str = '/metrics'
+    _runner: web.AppRunner | None = field(init=False, default=None)
+
+    @property
+    def addresses(self) -> list[Any]:
+        return [] if self._runner is None else self._runner.addresses
+
+    async def __handle(self, request: web.Request, /) -> web.Response:
+        return web.Response(
+            body=self.registry.expose().encode(),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'},
+        )
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get(self.path, self.__handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        _log.info('Serving metrics on %s', self._runner.addresses)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import FrameType
+
+__all__ = ('Profile', 'SamplingProfiler')
+
+
+def _label(frame: FrameType, /) -> str:
+    return f'{frame.f_globals.get("__name__", "?")}:{frame.f_code.co_qualname}'
+
+
+def _collapse(frame: FrameType | None, /) -> list[str]:
+    stack: list[str] = []
+
+    while frame is not None:
+        stack.append(_label(frame))
+        frame = frame.f_back
+
+    stack.reverse()
+    return stack
+
+
+@define
+class Profile:
+    samples: collections.Counter[str]
+    duration: float
+    interval: float
+
+    @property
+    def total(self) -> int:
+        return self.samples.total()
+
+    def top(self, n: int = 10, /) -> list[tuple[str, int]]:
+        leaves: collections.Counter[str] = collections.Counter()
+
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+
+        return leaves.most_common(n)
+
+    def collapsed(self) -> str:
+        return ''.join(
+            f'{stack} {count}\n' for stack, count in sorted(self.samples.items())
+        )
+
+    def write(self, path: Path, /) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed())
+
+
+@define
+class SamplingProfiler:
+    interval: float = 0.005
+    _samples: collections.Counter[str] = field(init=False, factory=collections.Counter)
+    _thread: threading.Thread | None = field(init=False, default=None)
+    _stopping: threading.Event = field(init=False, factory=threading.Event)
+    _loop: asyncio.AbstractEventLoop | None = field(init=False, default=None)
+    _started_at: float = field(init=False, default=0.0)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(
+        self,
+        *,
+        thread_id: int | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        if self._thread is not None:
+            raise RuntimeError('The profiler is already running')
+
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+        self._loop = loop
+        self._samples = collections.Counter()
+        self._stopping.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self.__run,
+            args=(threading.get_ident() if thread_id is None else thread_id,),
+            name='botus-profiler',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        if self._thread is None:
+            raise RuntimeError('The profiler is not running')
+
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+
+        return Profile(
+            self._samples, time.perf_counter() - self._started_at, self.interval
+        )
+
+    def __root(self) -> str:
+        if self._loop is None:
+            return 'thread'
+
+        # Group samples under the task that was running so flame graphs show
+        # which listener or command the time belongs to
+        task = asyncio.current_task(self._loop)
+
+        return 'event loop' if task is None else f'task {task.get_name()}'
+
+    def __run(self, thread_id: int, /) -> None:
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+
+            if frame is None:
+                continue
+
+            root = self.__root()
+            self._samples[';'.join([root, *_collapse(frame)])] += 1
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING, Any, Final
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Generator, Mapping
+
+__all__ = ('InvocationTracker', 'run_shutdown_tasks')
+
+_log: Final = logging.getLogger(__name__)
+
+
+@define
+class _Invocation:
+    name: str
+    task: asyncio.Task[object] | None
+    done: asyncio.Future[None]
+
+
+@define
+class InvocationTracker:
+    accepting: bool = True
+    _invocations: list[_Invocation] = field(init=False, factory=list)
+
+    def __len__(self) -> int:
+        return len(self._invocations)
+
+    @property
+    def running(self) -> list[str]:
+        return [invocation.name for invocation in self._invocations]
+
+    @contextlib.contextmanager
+    def track(self, name: str, /) -> Generator[None]:
+        invocation = _Invocation(
+            name, asyncio.current_task(), asyncio.get_running_loop().create_future()
+        )
+        self._invocations.append(invocation)
+
+        try:
+            yield
+        finally:
+            self._invocations.remove(invocation)
+            invocation.done.set_result(None)
+
+    async def drain(
+        self, timeout: float, /, *, caller: asyncio.Task[Any] | None = None
+    ) -> list[str]:
+        self.accepting = False
+
+        # An invocation that is itself shutting the bot down would otherwise wait
+        # on its own completion until the deadline
+        if caller is None:
+            caller = asyncio.current_task()
+
+        pending = [
+            invocation
+            for invocation in self._invocations
+            if invocation.task is not caller
+        ]
+
+        if pending:
+            _log.info('Waiting for %d running invocations', len(pending))
+            await asyncio.wait(
+                [invocation.done for invocation in pending], timeout=timeout
+            )
+
+        return [invocation.name for invocation in pending if not invocation.done.done()]
+
+
+async def run_shutdown_tasks(
+    tasks: Mapping[str, Callable[[], Awaitable[object]]], timeout: float, /
+) -> list[str]:
+    async def run(func: Callable[[], Awaitable[object]], /) -> None:
+        async with asyncio.timeout(timeout):
+            await func()
+
+    results = await asyncio.gather(
+        *(run(func) for func in tasks.values()), return_exceptions=True
+    )
+    unfinished: list[str] = []
+
+    for name, result in zip(tasks, results, strict=True):
+        if isinstance(result, TimeoutError):
+            unfinished.append(name)
+            _log.warning('Shutdown task %s did not finish in %.1fs', name, timeout)
+        elif isinstance(result, BaseException):
+            unfinished.append(name)
+            _log.error('Shutdown task %s failed', name, exc_info=result)
+
+    return unfinished
@@ -1,13 +1,36 @@
 from __future__ import annotations
 
-from .bot import AutoShardedBot, Bot, BotBase
-from .types import Flag, Snowflake, TSVector
+from .bot import AutoShardedBot, Bot, BotBase, PoolStatus
+from .cache import CacheRegion, FromCache, QueryCache
+from .context import Context, SessionStats
+from .types import (
+    Flag,
+    Snowflake,
+    TSVector,
+    flag_index,
+    snowflake_column_migration,
+    tsvector_column,
+    tsvector_index,
+)
+from .utils import insert_many, upsert_many
 
 __all__ = (
     'AutoShardedBot',
     'Bot',
     'BotBase',
+    'CacheRegion',
+    'Context',
     'Flag',
+    'FromCache',
+    'PoolStatus',
+    'QueryCache',
+    'SessionStats',
     'Snowflake',
     'TSVector',
+    'flag_index',
+    'insert_many',
+    'snowflake_column_migration',
+    'tsvector_column',
+    'tsvector_index',
+    'upsert_many',
 )
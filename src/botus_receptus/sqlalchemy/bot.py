@@ -1,21 +1,73 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, override
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING, Any, Final, TypedDict, override
 
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import close_all_sessions, create_async_engine
+from sqlalchemy.pool import QueuePool
 
 from .. import bot
+from .context import Context, SessionStats
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
-    from sqlalchemy.ext.asyncio import async_sessionmaker
+    import discord
+    from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 
     from ..config import Config
+    from ..metrics import Gauge
+    from .cache import QueryCache
+
+_log: Final = logging.getLogger(__name__)
+
+
+class PoolStatus(TypedDict):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+
+
+def _get_engine_kwargs(
+    config: Config, engine_kwargs: Mapping[str, object] | None, /
+) -> dict[str, object]:
+    kwargs: dict[str, object] = {}
+
+    if (pool_size := config.get('db_pool_size')) is not None:
+        kwargs['pool_size'] = pool_size
+
+    if (max_overflow := config.get('db_max_overflow')) is not None:
+        kwargs['max_overflow'] = max_overflow
+
+    if (pool_recycle := config.get('db_pool_recycle')) is not None:
+        kwargs['pool_recycle'] = pool_recycle
+
+    if (pool_pre_ping := config.get('db_pool_pre_ping')) is not None:
+        kwargs['pool_pre_ping'] = pool_pre_ping
+
+    if (query_cache_size := config.get('db_query_cache_size')) is not None:
+        kwargs['query_cache_size'] = query_cache_size
+
+    if engine_kwargs is not None:
+        kwargs.update(engine_kwargs)
+
+    return kwargs
 
 
 class BotBase(bot.BotBase):
     __sessionmaker: async_sessionmaker[Any]
+    __engine_kwargs: dict[str, object]
+    __engine: AsyncEngine | None = None
+    __engine_ready: asyncio.Task[None] | None = None
+    __pool_size: Gauge
+    __pool_idle: Gauge
+    __pool_overflow: Gauge
+    session_stats: SessionStats
+    query_cache: QueryCache | None
 
     def __init__(
         self,
@@ -24,23 +76,128 @@ class BotBase(bot.BotBase):
         sessionmaker: async_sessionmaker[Any],
         engine_kwargs: Mapping[str, object] | None = None,
         *args: object,
+        query_cache: QueryCache | None = None,
         **kwargs: object,
     ) -> None:
         self.__sessionmaker = sessionmaker
+        self.session_stats = SessionStats()
+        self.query_cache = query_cache
+
+        if query_cache is not None:
+            query_cache.install(sessionmaker)
 
         super().__init__(config, *args, **kwargs)
 
-        engine_kwargs = engine_kwargs if engine_kwargs is not None else {}
+        self.__engine_kwargs = _get_engine_kwargs(self.config, engine_kwargs)
+
+        self.add_startup_task('db_engine', self.__create_engine)
 
-        self.__sessionmaker.configure(
-            bind=create_async_engine(self.config.get('db_url', ''), **engine_kwargs),
+        self.__pool_size = self.metrics.gauge(
+            'botus_db_pool_size', 'Connections open in the database pool'
+        )
+        self.__pool_idle = self.metrics.gauge(
+            'botus_db_pool_idle', 'Idle connections in the database pool'
         )
+        self.__pool_overflow = self.metrics.gauge(
+            'botus_db_pool_overflow', 'Overflow connections in the database pool'
+        )
+        self.metrics.gauge(
+            'botus_db_sessions_active', 'Open database sessions'
+        ).set_function(lambda: self.session_stats.active)
+        self.metrics.counter(
+            'botus_db_sessions_total', 'Database sessions opened'
+        ).labels().set_function(lambda: self.session_stats.opened)
+        self.metrics.add_collector(self.__collect_pool_metrics)
+
+        if query_cache is not None:
+            self.memory.add_probe('query_cache', lambda: len(query_cache))
+
+    @property
+    def sessionmaker(self) -> async_sessionmaker[Any]:
+        return self.__sessionmaker
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self.__engine is None:
+            raise RuntimeError('The database engine has not been created yet')
+
+        return self.__engine
+
+    def pool_status(self) -> PoolStatus | None:
+        if self.__engine is None:
+            return None
+
+        pool = self.__engine.pool
+
+        if not isinstance(pool, QueuePool):
+            return None
+
+        return {
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+        }
+
+    def __collect_pool_metrics(self) -> None:
+        if (status := self.pool_status()) is not None:
+            self.__pool_size.set(status['size'])
+            self.__pool_idle.set(status['checked_in'])
+            self.__pool_overflow.set(status['overflow'])
+
+    async def warm_pool(self) -> None:
+        pool = self.engine.pool
+
+        if not isinstance(pool, QueuePool):
+            return
+
+        async with contextlib.AsyncExitStack() as stack, asyncio.TaskGroup() as tg:
+            for _ in range(pool.size()):
+                tg.create_task(stack.enter_async_context(self.engine.connect()))
+
+    async def __warm_engine(self) -> None:
+        try:
+            await self.warm_pool()
+        except (OSError, SQLAlchemyError):
+            _log.exception('Could not connect to the database')
+        else:
+            _log.debug('Database pool ready: %s', self.pool_status())
+
+    async def wait_until_engine_ready(self) -> None:
+        if self.__engine_ready is None:
+            raise RuntimeError('The database engine has not been created yet')
+
+        await asyncio.shield(self.__engine_ready)
+
+    async def __create_engine(self) -> None:
+        self.__engine = create_async_engine(
+            self.config.get('db_url', ''), **self.__engine_kwargs
+        )
+        self.__sessionmaker.configure(bind=self.__engine)
+
+        # The first connection initializes the dialect; let it run while the
+        # gateway connects instead of blocking login
+        self.__engine_ready = asyncio.create_task(self.__warm_engine())
+        self.add_shutdown_task('db_engine', self.__dispose_engine)
+
+    async def __dispose_engine(self) -> None:
+        if self.__engine_ready is not None:
+            self.__engine_ready.cancel()
+
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.__engine_ready
 
-    @override
-    async def close(self) -> None:
         await close_all_sessions()
+        await self.engine.dispose()
+
+    @override
+    async def process_commands(self, message: discord.Message, /) -> None:
+        await self.wait_until_engine_ready()
+
+        ctx = await self.get_context(message, cls=Context[Any])
 
-        await super().close()
+        async with ctx.session_scope():
+            await self.invoke(ctx)
 
 
 class Bot(BotBase, bot.Bot): ...
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import logging
+import pickle
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Final, override
+
+from attrs import define, field
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_mapper
+from sqlalchemy.orm.interfaces import UserDefinedOption
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Hashable, Iterable
+
+    from sqlalchemy import Result
+    from sqlalchemy.engine import FrozenResult
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from sqlalchemy.orm import ORMExecuteState, UOWTransaction, sessionmaker
+    from sqlalchemy.sql import Executable
+    from sqlalchemy.sql.cache_key import CacheKey
+
+    def merge_frozen_result(
+        session: Session,
+        statement: Executable,
+        frozen_result: FrozenResult[Any],
+        /,
+        load: bool = True,  # noqa: FBT001, FBT002
+    ) -> FrozenResult[Any]: ...
+
+else:
+    from sqlalchemy.orm import merge_frozen_result
+
+_log: Final = logging.getLogger(__name__)
+
+_pending_key: Final = 'botus_receptus.query_cache.pending_tables'
+
+
+class FromCache(UserDefinedOption):
+    region: str
+
+    def __init__(self, region: str = 'default', /) -> None:
+        super().__init__()
+
+        self.region = region
+
+    @override
+    def __repr__(self) -> str:
+        return f'FromCache({self.region!r})'
+
+
+def _get_cache_key(orm_context: ORMExecuteState, /) -> Hashable | None:
+    statement: Any = orm_context.statement
+    cache_key: CacheKey | None = statement._generate_cache_key()
+
+    if cache_key is None:
+        return None
+
+    parameters = orm_context.parameters or {}
+
+    if not isinstance(parameters, Mapping):
+        return None
+
+    values = tuple(
+        parameters.get(bindparam.key, bindparam.value)
+        for bindparam in cache_key.bindparams
+    )
+
+    return (cache_key.key, repr(values))
+
+
+def _detach(result: FrozenResult[Any], /) -> FrozenResult[Any]:
+    # The frozen rows hold the querying session's instances, which that session
+    # expires on commit, so the cache keeps a detached copy of them instead
+    return pickle.loads(pickle.dumps(result))  # noqa: S301
+
+
+@define
+class _Entry:
+    result: FrozenResult[Any]
+    tables: frozenset[str]
+    expires_at: float | None
+
+
+@define
+class CacheRegion:
+    maxsize: int = 1024
+    ttl: float | None = 300.0
+    hits: int = field(init=False, default=0)
+    misses: int = field(init=False, default=0)
+    _entries: OrderedDict[Hashable, _Entry] = field(init=False, factory=OrderedDict)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, /) -> FrozenResult[Any] | None:
+        entry = self._entries.get(key)
+
+        if entry is None or (
+            entry.expires_at is not None and entry.expires_at <= time.monotonic()
+        ):
+            if entry is not None:
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return entry.result
+
+    def set(
+        self, key: Hashable, result: FrozenResult[Any], tables: Iterable[str], /
+    ) -> None:
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+
+        self._entries[key] = _Entry(result, frozenset(tables), expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tables: Collection[str], /) -> int:
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if not entry.tables.isdisjoint(tables)
+        ]
+
+        for key in keys:
+            del self._entries[key]
+
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@define
+class QueryCache:
+    maxsize: int = 1024
+    ttl: float | None = 300.0
+    regions: dict[str, CacheRegion] = field(factory=dict)
+
+    def __len__(self) -> int:
+        return sum(len(region) for region in self.regions.values())
+
+    def region(self, name: str, /) -> CacheRegion:
+        region = self.regions.get(name)
+
+        if region is None:
+            region = self.regions[name] = CacheRegion(self.maxsize, self.ttl)
+
+        return region
+
+    def invalidate(self, tables: Collection[str], /) -> None:
+        count = sum(region.invalidate(tables) for region in self.regions.values())
+
+        if count:
+            _log.debug('Invalidated %d cached queries for %s', count, tables)
+
+    def clear(self) -> None:
+        for region in self.regions.values():
+            region.clear()
+
+    def install(
+        self, sessionmaker: async_sessionmaker[Any] | sessionmaker[Any]
+    ) -> None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: PLC0415
+
+        if isinstance(sessionmaker, async_sessionmaker):
+            base: type[Session] = sessionmaker.kw.get('sync_session_class', Session)
+            session_class = type(base.__name__, (base,), {})
+            sessionmaker.configure(sync_session_class=session_class)
+        else:
+            session_class = sessionmaker.class_
+
+        event.listen(session_class, 'do_orm_execute', self.__on_do_orm_execute)
+        event.listen(session_class, 'after_flush', self.__on_after_flush)
+        event.listen(session_class, 'after_commit', self.__on_after_commit)
+        event.listen(session_class, 'after_rollback', self.__on_after_rollback)
+
+    def __invalidate_session(self, session: Session, tables: set[str], /) -> None:
+        if not tables:
+            return
+
+        # Other sessions can re-cache rows between now and the commit, so the
+        # tables are invalidated again once the transaction commits
+        self.invalidate(tables)
+        session.info.setdefault(_pending_key, set()).update(tables)
+
+    def __on_do_orm_execute(
+        self, orm_context: ORMExecuteState, /
+    ) -> Result[Any] | None:
+        tables = {
+            table.fullname
+            for mapper in orm_context.all_mappers
+            for table in mapper.tables
+        }
+
+        if orm_context.is_insert or orm_context.is_update or orm_context.is_delete:
+            table = getattr(orm_context.statement, 'table', None)
+
+            if (fullname := getattr(table, 'fullname', None)) is not None:
+                tables.add(fullname)
+
+            self.__invalidate_session(orm_context.session, tables)
+            return None
+
+        if not orm_context.is_select:
+            return None
+
+        option = next(
+            (
+                option
+                for option in orm_context.user_defined_options
+                if isinstance(option, FromCache)
+            ),
+            None,
+        )
+
+        if option is None:
+            return None
+
+        key = _get_cache_key(orm_context)
+
+        if key is None:
+            return None
+
+        region = self.region(option.region)
+        frozen_result = region.get(key)
+
+        if frozen_result is None:
+            frozen_result = orm_context.invoke_statement().freeze()
+            region.set(key, _detach(frozen_result), tables)
+
+            return frozen_result()
+
+        return merge_frozen_result(
+            orm_context.session, orm_context.statement, frozen_result, load=False
+        )()
+
+    def __on_after_flush(self, session: Session, context: UOWTransaction, /) -> None:
+        tables = {
+            table.fullname
+            for instance in (*session.new, *session.dirty, *session.deleted)
+            for table in object_mapper(instance).tables
+        }
+
+        self.__invalidate_session(session, tables)
+
+    def __on_after_commit(self, session: Session, /) -> None:
+        if tables := session.info.pop(_pending_key, None):
+            self.invalidate(tables)
+
+    def __on_after_rollback(self, session: Session, /) -> None:
+        # Rows cached while the transaction was open may not exist any more
+        if tables := session.info.pop(_pending_key, None):
+            self.invalidate(tables)
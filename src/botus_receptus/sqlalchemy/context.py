@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import time
+from typing import TYPE_CHECKING, Final
+
+from attrs import define
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from .bot import AutoShardedBot, Bot
+
+_log: Final = logging.getLogger(__name__)
+
+
+@define
+class SessionStats:
+    opened: int = 0
+    closed: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+
+    @property
+    def active(self) -> int:
+        return self.opened - self.closed
+
+    def record_open(self) -> None:
+        self.opened += 1
+
+    def record_close(self, duration: float, /) -> None:
+        self.closed += 1
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+
+
+class Context[BotT: Bot | AutoShardedBot](commands.Context[BotT]):
+    __session: AsyncSession | None = None
+    __session_opened_at: float = 0.0
+
+    @property
+    def has_session(self) -> bool:
+        return self.__session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        session = self.__session
+
+        if session is None:
+            session = self.__session = self.bot.sessionmaker()
+            self.__session_opened_at = time.perf_counter()
+            self.bot.session_stats.record_open()
+
+        return session
+
+    async def close_session(self, *, rollback: bool = False) -> None:
+        session = self.__session
+
+        if session is None:
+            return
+
+        self.__session = None
+
+        try:
+            if rollback or self.command_failed:
+                await session.rollback()
+            else:
+                await session.commit()
+        finally:
+            await session.close()
+
+            duration = time.perf_counter() - self.__session_opened_at
+            self.bot.session_stats.record_close(duration)
+
+            _log.debug(
+                'Closed session for %s after %.3fs',
+                self.command.qualified_name if self.command is not None else None,
+                duration,
+            )
+
+    @contextlib.asynccontextmanager
+    async def session_scope(self) -> AsyncGenerator[None]:
+        try:
+            yield
+        except BaseException:
+            await self.close_session(rollback=True)
+            raise
+        else:
+            await self.close_session()
@@ -2,13 +2,31 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, override
 
-from sqlalchemy import BigInteger, String, TypeDecorator
-from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy import (
+    REAL,
+    BigInteger,
+    Column,
+    ColumnElement,
+    Computed,
+    Index,
+    String,
+    TypeDecorator,
+    cast,
+    column,
+    func,
+    literal,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, array
+from sqlalchemy.dialects.postgresql.ext import ts_headline, websearch_to_tsquery
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from enum import Flag as _EnumFlag
 
-    from sqlalchemy import ColumnOperators, Operators
+    from sqlalchemy import ColumnOperators, Dialect, Operators, TextClause
+    from sqlalchemy.orm import QueryableAttribute
     from sqlalchemy.types import TypeEngine
 
 
@@ -16,6 +34,45 @@ class Snowflake(TypeDecorator[int]):
     impl: TypeEngine[Any] | type[TypeEngine[Any]] = String
     cache_ok: bool | None = True
 
+    native: bool
+
+    # native is a positional-or-keyword argument so that SQLAlchemy includes it in
+    # the type's cache key
+    def __init__(
+        self,
+        length: int | None = None,
+        native: bool = False,  # noqa: FBT001, FBT002
+        **kwargs: object,
+    ) -> None:
+        self.native = native
+
+        if native:
+            super().__init__()
+            self.impl = BigInteger()
+        else:
+            super().__init__(length, **kwargs)
+
+    @override
+    def bind_processor(self, dialect: Dialect) -> Any:
+        if self.native:
+            return self.impl_instance.bind_processor(dialect)
+
+        return super().bind_processor(dialect)
+
+    @override
+    def literal_processor(self, dialect: Dialect) -> Any:
+        if self.native:
+            return self.impl_instance.literal_processor(dialect)
+
+        return super().literal_processor(dialect)
+
+    @override
+    def result_processor(self, dialect: Dialect, coltype: object) -> Any:
+        if self.native:
+            return self.impl_instance.result_processor(dialect, coltype)
+
+        return super().result_processor(dialect, coltype)
+
     @override
     def process_bind_param(self, value: int | None, dialect: object) -> str | None:
         if value is None:
@@ -32,12 +89,37 @@ class Snowflake(TypeDecorator[int]):
 
     @override
     def copy(self, /, **kwargs: object) -> Snowflake:
+        if self.native:
+            return Snowflake(native=True)
+
         if TYPE_CHECKING:
             assert isinstance(self.impl_instance, String)
 
         return Snowflake(self.impl_instance.length)
 
 
+def snowflake_column_migration(
+    table: str,
+    column: str,
+    /,
+    *,
+    native: bool = True,
+    schema: str | None = None,
+) -> TextClause:
+    preparer = postgresql.dialect().identifier_preparer
+    table_name = preparer.quote(table)
+    column_name = preparer.quote(column)
+    sql_type = 'BIGINT' if native else 'VARCHAR'
+
+    if schema is not None:
+        table_name = f'{preparer.quote_schema(schema)}.{table_name}'
+
+    return text(
+        f'ALTER TABLE {table_name} ALTER COLUMN {column_name} '
+        f'TYPE {sql_type} USING CAST({column_name} AS {sql_type})'
+    )
+
+
 class _TSVectorComparator(TSVECTOR.Comparator[str]):
     @override
     def match(self, other: object, **kwargs: object) -> ColumnOperators:
@@ -56,6 +138,84 @@ class _TSVectorComparator(TSVECTOR.Comparator[str]):
     def __or__(self, other: object) -> Operators:
         return self.op('||')(other)
 
+    def _regconfig(self) -> str | None:
+        if TYPE_CHECKING:
+            assert isinstance(self.expr.type, TypeDecorator)
+
+        regconfig: str | None = self.expr.type.options.get('regconfig')
+        return regconfig
+
+    def _tsquery(self, query: str | ColumnElement[Any], /) -> ColumnElement[Any]:
+        if not isinstance(query, str):
+            return query
+
+        if (regconfig := self._regconfig()) is None:
+            return websearch_to_tsquery(query)
+
+        return websearch_to_tsquery(regconfig, query)
+
+    def _rank_args(
+        self,
+        query: str | ColumnElement[Any],
+        weights: Sequence[float] | None,
+        normalization: int | None,
+        /,
+    ) -> list[object]:
+        args: list[object] = []
+
+        if weights is not None:
+            args.append(cast(array(weights, type_=REAL), ARRAY[float](REAL)))
+
+        args += [self.expr, self._tsquery(query)]
+
+        if normalization is not None:
+            args.append(normalization)
+
+        return args
+
+    def websearch_match(self, query: str, /) -> ColumnElement[bool]:
+        return self.expr.bool_op('@@')(self._tsquery(query))
+
+    def rank(
+        self,
+        query: str | ColumnElement[Any],
+        /,
+        *,
+        weights: Sequence[float] | None = None,
+        normalization: int | None = None,
+    ) -> ColumnElement[float]:
+        return func.ts_rank(*self._rank_args(query, weights, normalization), type_=REAL)
+
+    def rank_cd(
+        self,
+        query: str | ColumnElement[Any],
+        /,
+        *,
+        weights: Sequence[float] | None = None,
+        normalization: int | None = None,
+    ) -> ColumnElement[float]:
+        return func.ts_rank_cd(
+            *self._rank_args(query, weights, normalization), type_=REAL
+        )
+
+    def headline(
+        self,
+        document: ColumnElement[str],
+        query: str | ColumnElement[Any],
+        /,
+        *,
+        options: str | None = None,
+    ) -> ColumnElement[str]:
+        args: list[object] = [document, self._tsquery(query)]
+
+        if (regconfig := self._regconfig()) is not None:
+            args.insert(0, regconfig)
+
+        if options is not None:
+            args.append(options)
+
+        return ts_headline(*args)
+
 
 class TSVector(TypeDecorator[str]):
     impl: TypeEngine[Any] | type[TypeEngine[Any]] = TSVECTOR
@@ -82,12 +242,39 @@ class TSVector(TypeDecorator[str]):
         super().__init__()
 
 
+def _flag_value(flags: _EnumFlag | int, /) -> ColumnElement[int]:
+    value = flags if isinstance(flags, int) else int(flags.value)
+
+    # Rendering the mask inline lets the planner match partial and expression
+    # indexes created by flag_index() even for prepared statements
+    return literal(value, BigInteger, literal_execute=True)
+
+
+class _FlagComparator(TypeDecorator.Comparator[Any]):
+    def _masked(self, flags: _EnumFlag | int, /) -> ColumnElement[int]:
+        return self.expr.op('&', return_type=BigInteger)(_flag_value(flags))
+
+    def has_all(self, flags: _EnumFlag | int, /) -> ColumnElement[bool]:
+        return self._masked(flags) == _flag_value(flags)
+
+    def has_any(self, flags: _EnumFlag | int, /) -> ColumnElement[bool]:
+        return self._masked(flags) != _flag_value(0)
+
+    def has_none(self, flags: _EnumFlag | int, /) -> ColumnElement[bool]:
+        return self._masked(flags) == _flag_value(0)
+
+
 class Flag[FlagT: _EnumFlag](TypeDecorator[FlagT]):
     impl: TypeEngine[Any] | type[TypeEngine[Any]] = BigInteger
     cache_ok: bool | None = True
 
     _flag_cls: type[FlagT]
 
+    @property
+    @override
+    def comparator_factory(self) -> type[_FlagComparator]:
+        return _FlagComparator
+
     def __init__(
         self, flag_cls: type[FlagT], /, *args: object, **kwargs: object
     ) -> None:
@@ -107,3 +294,55 @@ class Flag[FlagT: _EnumFlag](TypeDecorator[FlagT]):
             return None
 
         return self._flag_cls(value)
+
+
+def flag_index(
+    name: str,
+    column: ColumnElement[Any] | QueryableAttribute[Any],
+    flags: _EnumFlag | int,
+    /,
+    *,
+    partial: bool = True,
+    **kwargs: Any,
+) -> Index:
+    comparator = _FlagComparator(
+        column if isinstance(column, ColumnElement) else column.__clause_element__()
+    )
+
+    if partial:
+        return Index(name, column, postgresql_where=comparator.has_all(flags), **kwargs)
+
+    return Index(name, comparator._masked(flags), **kwargs)
+
+
+def _tsvector_document(
+    columns: Sequence[str | ColumnElement[Any]], regconfig: str, /
+) -> Computed:
+    document: ColumnElement[Any] | None = None
+
+    for item in columns:
+        expr = func.coalesce(column(item) if isinstance(item, str) else item, '')
+        document = expr if document is None else document.concat(' ').concat(expr)
+
+    if document is None:
+        raise ValueError('At least one column is required')
+
+    return Computed(
+        func.to_tsvector(literal(regconfig), document, type_=TSVECTOR), persisted=True
+    )
+
+
+def tsvector_column(
+    *columns: str | ColumnElement[Any], regconfig: str, **kwargs: Any
+) -> Column[str]:
+    return Column(
+        TSVector(*columns, regconfig=regconfig),
+        _tsvector_document(columns, regconfig),
+        **kwargs,
+    )
+
+
+def tsvector_index(
+    name: str, column: ColumnElement[Any] | QueryableAttribute[Any], /, **kwargs: Any
+) -> Index:
+    return Index(name, column, postgresql_using='gin', **kwargs)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import itertools
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Table, inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import class_mapper
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from sqlalchemy import ColumnElement, Executable, Row
+    from sqlalchemy.dialects.postgresql import Insert
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstanceState, QueryableAttribute
+
+__all__ = ('insert_many', 'upsert_many')
+
+type _Executor = AsyncSession | AsyncConnection
+type _Entity = type[Any] | Table
+type _Returning = Sequence[ColumnElement[Any] | QueryableAttribute[Any]]
+
+
+def _get_table(entity: _Entity, /) -> Table:
+    if isinstance(entity, Table):
+        return entity
+
+    table = class_mapper(entity).local_table
+
+    if not isinstance(table, Table):
+        raise TypeError(f'{entity!r} is not mapped to a table')
+
+    return table
+
+
+def _to_mapping(
+    row: Mapping[str, Any] | object, /, *, column_keys: bool
+) -> Mapping[str, Any]:
+    if isinstance(row, Mapping):
+        return row  # pyright: ignore[reportUnknownVariableType]
+
+    state: InstanceState[Any] = inspect(row, raiseerr=True)
+    values = state.dict
+
+    # Sessions run ORM inserts, which bind by attribute, while connections run
+    # Core inserts, which bind by column
+    return {
+        attr.columns[0].key if column_keys else attr.key: values[attr.key]
+        for attr in state.mapper.column_attrs
+        if attr.key in values
+    }
+
+
+async def _execute_batches(
+    db: _Executor,
+    stmt: Insert,
+    rows: Iterable[Mapping[str, Any] | object],
+    /,
+    *,
+    batch_size: int,
+    returning: _Returning | None,
+) -> list[Row[Any]]:
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+
+    executable: Executable = stmt.returning(*returning) if returning else stmt
+    executable = executable.execution_options(insertmanyvalues_page_size=batch_size)
+    results: list[Row[Any]] = []
+    column_keys = isinstance(db, AsyncConnection)
+
+    for batch in itertools.batched(rows, batch_size, strict=False):
+        result = await db.execute(
+            executable,
+            [_to_mapping(row, column_keys=column_keys) for row in batch],
+        )
+
+        if returning:
+            results.extend(result.all())
+
+    return results
+
+
+async def insert_many(
+    db: _Executor,
+    entity: _Entity,
+    rows: Iterable[Mapping[str, Any] | object],
+    /,
+    *,
+    batch_size: int = 1000,
+    returning: _Returning | None = None,
+) -> list[Row[Any]]:
+    return await _execute_batches(
+        db, insert(entity), rows, batch_size=batch_size, returning=returning
+    )
+
+
+async def upsert_many(
+    db: _Executor,
+    entity: _Entity,
+    rows: Iterable[Mapping[str, Any] | object],
+    /,
+    *,
+    index_elements: Sequence[str],
+    update: Sequence[str] | None = None,
+    batch_size: int = 1000,
+    returning: _Returning | None = None,
+) -> list[Row[Any]]:
+    stmt = insert(entity)
+
+    if update is None:
+        update = [
+            column.name
+            for column in _get_table(entity).columns
+            if column.name not in index_elements and not column.primary_key
+        ]
+
+    if update:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={name: stmt.excluded[name] for name in update},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+    return await _execute_batches(
+        db, stmt, rows, batch_size=batch_size, returning=returning
+    )
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import graphlib
+import logging
+import time
+from typing import TYPE_CHECKING, Final
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Mapping
+
+__all__ = ('StartupPhase', 'run_phases', 'timeline')
+
+_log: Final = logging.getLogger(__name__)
+
+
+@define
+class StartupPhase:
+    name: str
+    func: Callable[[], Awaitable[object]] = field(repr=False)
+    after: frozenset[str] = field(factory=frozenset[str])
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: BaseException | None = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+
+        return self.finished_at - self.started_at
+
+
+def _check_phases(phases: Mapping[str, StartupPhase], /) -> None:
+    for phase in phases.values():
+        for dependency in phase.after:
+            if dependency not in phases:
+                raise ValueError(
+                    f'{phase.name!r} depends on unknown phase {dependency!r}'
+                )
+
+    graphlib.TopologicalSorter(
+        {name: phase.after for name, phase in phases.items()}
+    ).prepare()
+
+
+def timeline(phases: Iterable[StartupPhase], /) -> list[StartupPhase]:
+    return sorted(
+        phases,
+        key=lambda phase: (
+            float('inf') if phase.started_at is None else phase.started_at
+        ),
+    )
+
+
+async def run_phases(phases: Iterable[StartupPhase], /) -> None:
+    by_name = {phase.name: phase for phase in phases}
+
+    _check_phases(by_name)
+
+    start = time.perf_counter()
+    tasks: dict[str, asyncio.Task[None]] = {}
+
+    async def run(phase: StartupPhase, /) -> None:
+        dependencies = [tasks[name] for name in phase.after]
+
+        if dependencies:
+            await asyncio.wait(dependencies)
+
+        if not all(by_name[name].ok for name in phase.after):
+            phase.skipped = True
+            return
+
+        phase.started_at = time.perf_counter() - start
+
+        try:
+            await phase.func()
+        except BaseException as error:
+            phase.error = error
+            raise
+        finally:
+            phase.finished_at = time.perf_counter() - start
+
+    for phase in by_name.values():
+        tasks[phase.name] = asyncio.create_task(run(phase), name=phase.name)
+
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    for phase in timeline(by_name.values()):
+        if phase.skipped:
+            _log.warning('Startup phase %s skipped', phase.name)
+        elif phase.error is not None:
+            _log.error(
+                'Startup phase %s failed after %.3fs',
+                phase.name,
+                phase.duration,
+                exc_info=phase.error,
+            )
+        else:
+            _log.info(
+                'Startup phase %s: %.3fs-%.3fs (%.3fs)',
+                phase.name,
+                phase.started_at,
+                phase.finished_at,
+                phase.duration,
+            )
+
+    for phase in by_name.values():
+        if phase.error is not None:
+            raise phase.error
@@ -1,5 +1,15 @@
 from __future__ import annotations
 
 from .bot import AutoShardedBot, Bot, BotBase
+from .provider import TopggProvider
+from .votes import Vote, VoteStore, VoteWebhook
 
-__all__ = ('AutoShardedBot', 'Bot', 'BotBase')
+__all__ = (
+    'AutoShardedBot',
+    'Bot',
+    'BotBase',
+    'TopggProvider',
+    'Vote',
+    'VoteStore',
+    'VoteWebhook',
+)
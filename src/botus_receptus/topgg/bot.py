@@ -1,81 +1,143 @@
 from __future__ import annotations
 
-import asyncio
-import logging
-from datetime import time
-from typing import TYPE_CHECKING, Final, NotRequired, TypedDict, override
-
-import discord
-import pendulum
-from discord.ext import tasks
+from collections import Counter
+from typing import TYPE_CHECKING, cast, override
 
 from .. import bot
+from ..botlists import BotStats, StatsPoster
+from .provider import TopggProvider
+from .votes import Vote, VoteStore, VoteWebhook
 
-_log: Final = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
 
+    import discord
 
-class _BotStats(TypedDict):
-    server_count: int | list[int]
-    shards: NotRequired[list[int]]
-    shard_id: NotRequired[int]
-    shard_count: NotRequired[int]
+    from ..config import Config
 
 
 class BotBase(bot.BotBase):
+    stats_poster: StatsPoster
+    votes: VoteStore
+    vote_webhook: VoteWebhook | None
+
     if TYPE_CHECKING:
 
         @property
         def user(self) -> discord.ClientUser: ...
 
-    def _get_topgg_stats(self) -> _BotStats:
+    def __init__(self, config: Config, /, *args: object, **kwargs: object) -> None:
+        super().__init__(config, *args, **kwargs)
+
+        self.stats_poster = StatsPoster(
+            self._get_topgg_stats, config.get('stats_post_interval', 60.0 * 60.0)
+        )
+
+        if (token := config.get('dbl_token')) is not None:
+            self.stats_poster.add_provider(TopggProvider(token))
+
+        self.add_shutdown_task('stats_poster', self.stats_poster.stop)
+
+        self.votes = VoteStore(
+            persist=self._persist_votes,
+            flush_interval=config.get('topgg_vote_flush_interval', 60.0),
+        )
+        self.memory.add_probe('votes', lambda: len(self.votes))
+        self.memory.add_probe('votes_pending', lambda: self.votes.pending)
+        self.vote_webhook = None
+
+        if (auth := config.get('topgg_webhook_auth')) is not None:
+            self.vote_webhook = VoteWebhook(
+                auth,
+                self.__on_vote,
+                config.get('topgg_webhook_host', '0.0.0.0'),  # noqa: S104
+                config.get('topgg_webhook_port', 5000),
+                config.get('topgg_webhook_path', '/dblwebhook'),
+            )
+            self.add_startup_task('topgg_votes', self.__start_votes)
+
+    async def _get_topgg_stats(self) -> BotStats | None:
         raise NotImplementedError
 
-    @tasks.loop(time=list(map(time, range(24))))
-    async def __topgg_task(self, token: str, /) -> None:
-        stats = self._get_topgg_stats()
-        headers = {'Content-Type': 'application/json', 'Authorization': token}
+    async def _load_votes(self) -> Iterable[Vote]:
+        return ()
 
-        async with asyncio.timeout(10):
-            user_id = self.user.id
+    async def _persist_votes(self, votes: Sequence[Vote], /) -> None:
+        pass
 
-            _log.info('POSTing stats for bot %s: %s', user_id, stats)
+    def has_voted(self, user_id: int, /, *, within: float | None = None) -> bool:
+        return self.votes.has_voted(user_id, within=within)
 
-            await self.session.post(
-                f'https://top.gg/api/bots/{user_id}/stats',
-                data=discord.utils._to_json(stats),
-                headers=headers,
-            )
+    def __on_vote(self, vote: Vote, /) -> None:
+        self.votes.record(vote)
+        cast('discord.Client', self).dispatch('topgg_vote', vote)
 
-    async def on_ready(self) -> None:
-        token = self.config.get('dbl_token')
+    async def __start_votes(self) -> None:
+        if TYPE_CHECKING:
+            assert self.vote_webhook is not None
 
-        if token is None:
-            return
+        self.votes.load(await self._load_votes())
+        self.votes.start()
+        await self.vote_webhook.start()
+        self.add_shutdown_task('topgg_votes', self.__stop_votes)
 
-        self.__topgg_task.start(token)
+    async def __stop_votes(self) -> None:
+        if TYPE_CHECKING:
+            assert self.vote_webhook is not None
 
-        next_hour = pendulum.now('UTC').start_of('hour').add(hours=1)
+        await self.vote_webhook.close()
+        await self.votes.stop()
 
-        if next_hour.diff().in_minutes() > 15:
-            await self.__topgg_task(token)
-
-    @override
-    async def close(self) -> None:
-        self.__topgg_task.cancel()
-
-        await super().close()
+    async def on_ready(self) -> None:
+        if self.stats_poster.providers:
+            self.stats_poster.start(self.session, self.user.id)
 
 
 class Bot(BotBase, bot.Bot):
     @override
-    def _get_topgg_stats(self) -> _BotStats:
+    async def _get_topgg_stats(self) -> BotStats | None:
         return {'server_count': len(self.guilds)}
 
 
 class AutoShardedBot(BotBase, bot.AutoShardedBot):
+    def __init__(self, config: Config, /, *args: object, **kwargs: object) -> None:
+        super().__init__(config, *args, **kwargs)
+
+        if self.ipc is not None:
+            self.ipc.add_handler('shard_guild_counts', self.__ipc_shard_counts)
+
+    def _get_shard_guild_counts(self) -> dict[int, int]:
+        counts = Counter(guild.shard_id for guild in self.guilds)
+
+        return {shard_id: counts[shard_id] for shard_id in (*self.shards, *counts)}
+
+    async def __ipc_shard_counts(self, data: object, /) -> dict[str, int]:
+        return {
+            str(shard_id): count
+            for shard_id, count in self._get_shard_guild_counts().items()
+        }
+
     @override
-    def _get_topgg_stats(self) -> _BotStats:
+    async def _get_topgg_stats(self) -> BotStats | None:
+        counts = self._get_shard_guild_counts()
+
+        if self.ipc is not None and self.ipc.cluster_count > 1:
+            responses = await self.ipc.broadcast('shard_guild_counts')
+
+            # The lowest cluster that answered posts for everyone
+            if min(responses, default=self.ipc.cluster_id) != self.ipc.cluster_id:
+                return None
+
+            for response in responses.values():
+                counts.update(
+                    {int(shard_id): count for shard_id, count in response.items()}
+                )
+
+        shard_count = max(self.shard_count or 0, len(counts))
+        shards = [counts.get(shard_id, 0) for shard_id in range(shard_count)]
+
         return {
-            'server_count': len(self.guilds),
-            'shard_count': self.shard_count,
+            'server_count': sum(shards),
+            'shards': shards,
+            'shard_count': shard_count,
         }
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import ClassVar, override
+
+from attrs import define
+
+from ..botlists import StatsProvider
+
+__all__ = ('TopggProvider',)
+
+
+@define
+class TopggProvider(StatsProvider):
+    name: ClassVar[str] = 'top.gg'
+
+    @override
+    def get_url(self, bot_id: int, /) -> str:
+        return f'https://top.gg/api/bots/{bot_id}/stats'
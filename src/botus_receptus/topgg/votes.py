@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Final, Self, cast
+
+from aiohttp import web
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+
+__all__ = ('Vote', 'VoteStore', 'VoteWebhook')
+
+_log: Final = logging.getLogger(__name__)
+
+
+@define(frozen=True)
+class Vote:
+    user_id: int
+    bot_id: int
+    type: str = 'upvote'
+    is_weekend: bool = False
+    query: str = ''
+    voted_at: float = field(factory=time.time)
+
+    @property
+    def is_test(self) -> bool:
+        return self.type == 'test'
+
+    @classmethod
+    def from_payload(cls, data: Mapping[str, Any], /) -> Self:
+        return cls(
+            int(data['user']),
+            int(data['bot']),
+            str(data.get('type', 'upvote')),
+            bool(data.get('isWeekend', False)),
+            str(data.get('query') or ''),
+        )
+
+
+@define
+class VoteStore:
+    expiry: float = 12 * 60.0 * 60.0
+    persist: Callable[[Sequence[Vote]], Awaitable[object]] | None = None
+    flush_interval: float = 60.0
+    max_pending: int = 10_000
+    _latest: dict[int, float] = field(init=False, factory=dict)
+    _timeline: deque[tuple[float, int]] = field(init=False, factory=deque)
+    _pending: deque[Vote] = field(init=False)
+    _task: asyncio.Task[None] | None = field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        self._pending = deque(maxlen=self.max_pending)
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def load(self, votes: Iterable[Vote], /) -> None:
+        for vote in sorted(votes, key=lambda vote: vote.voted_at):
+            self.__index(vote)
+
+        self.prune()
+
+    def record(self, vote: Vote, /) -> None:
+        if not vote.is_test:
+            self.__index(vote)
+            self.prune()
+
+        if self.persist is not None:
+            self._pending.append(vote)
+
+    def __index(self, vote: Vote, /) -> None:
+        if vote.voted_at <= self._latest.get(vote.user_id, float('-inf')):
+            return
+
+        self._latest[vote.user_id] = vote.voted_at
+
+        # Votes nearly always arrive in order, so this is an append
+        if not self._timeline or self._timeline[-1][0] <= vote.voted_at:
+            self._timeline.append((vote.voted_at, vote.user_id))
+        else:
+            self._timeline = deque(
+                sorted((*self._timeline, (vote.voted_at, vote.user_id)))
+            )
+
+    def prune(self, *, now: float | None = None) -> None:
+        cutoff = (time.time() if now is None else now) - self.expiry
+
+        while self._timeline and self._timeline[0][0] < cutoff:
+            voted_at, user_id = self._timeline.popleft()
+
+            # A newer vote from the same user is further along the timeline
+            if self._latest.get(user_id) == voted_at:
+                del self._latest[user_id]
+
+    def has_voted(
+        self, user_id: int, /, *, within: float | None = None, now: float | None = None
+    ) -> bool:
+        voted_at = self._latest.get(user_id)
+
+        if voted_at is None:
+            return False
+
+        window = self.expiry if within is None else min(within, self.expiry)
+
+        return voted_at >= (time.time() if now is None else now) - window
+
+    async def flush(self) -> None:
+        if self.persist is None or not self._pending:
+            return
+
+        votes = list(self._pending)
+        self._pending.clear()
+
+        (result,) = await asyncio.gather(self.persist(votes), return_exceptions=True)
+
+        if isinstance(result, Exception):
+            _log.error('Could not persist %d votes', len(votes), exc_info=result)
+
+            # Keep the batch for the next flush, dropping the oldest on overflow
+            self._pending = deque([*votes, *self._pending], maxlen=self.max_pending)
+        elif isinstance(result, BaseException):
+            raise result
+
+    def start(self) -> None:
+        if self.persist is not None and self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
+
+    async def __run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.prune()
+            await self.flush()
+
+
+@define
+class VoteWebhook:
+    authorization: str
+    on_vote: Callable[[Vote], object]
+    host: str = '0.0.0.0'  # noqa: S104
+    port: int = 5000
+    path: str = '/dblwebhook'
+    _runner: web.AppRunner | None = field(init=False, default=None)
+
+    @property
+    def addresses(self) -> list[Any]:
+        return [] if self._runner is None else self._runner.addresses
+
+    async def __handle(self, request: web.Request, /) -> web.Response:
+        if not hmac.compare_digest(
+            request.headers.get('Authorization', '').encode(),
+            self.authorization.encode(),
+        ):
+            _log.warning('Rejected vote webhook from %s', request.remote)
+            return web.Response(status=401)
+
+        try:
+            vote = Vote.from_payload(cast('Mapping[str, Any]', await request.json()))
+        except (ValueError, KeyError, TypeError):
+            return web.Response(status=400)
+
+        self.on_vote(vote)
+
+        return web.Response(status=204)
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post(self.path, self.__handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        _log.info('Listening for votes on %s', self._runner.addresses)
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import TYPE_CHECKING, Final
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .metrics import Counter, Histogram, Registry
+
+__all__ = ('LoopMonitor', 'Stall')
+
+_log: Final = logging.getLogger(__name__)
+
+_LAG_BUCKETS: Final = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_QUANTILES: Final = (0.5, 0.9, 0.99)
+
+
+@define(frozen=True)
+class Stall:
+    lag: float
+    stack: str
+    running: list[str]
+
+
+@define
+class LoopMonitor:
+    interval: float = 0.25
+    threshold: float = 1.0
+    samples: int = 1024
+    context: Callable[[], list[str]] | None = None
+    last_stall: Stall | None = field(init=False, default=None)
+    _lags: deque[float] = field(init=False)
+    _last_beat: float = field(init=False, default=0.0)
+    _task: asyncio.Task[None] | None = field(init=False, default=None)
+    _loop: asyncio.AbstractEventLoop | None = field(init=False, default=None)
+    _thread: threading.Thread | None = field(init=False, default=None)
+    _stopping: threading.Event = field(init=False, factory=threading.Event)
+    _histogram: Histogram | None = field(init=False, default=None)
+    _stalls: Counter | None = field(init=False, default=None)
+
+    def __attrs_post_init__(self) -> None:
+        self._lags = deque(maxlen=self.samples)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def register_metrics(self, registry: Registry, /) -> None:
+        self._histogram = registry.histogram(
+            'botus_loop_lag_seconds',
+            'Event loop scheduling delay',
+            buckets=_LAG_BUCKETS,
+        )
+        self._stalls = registry.counter(
+            'botus_loop_stalls_total', 'Times the event loop was blocked'
+        )
+        quantiles = registry.gauge(
+            'botus_loop_lag_quantile_seconds',
+            'Recent event loop scheduling delay by quantile',
+            ('quantile',),
+        )
+
+        for quantile in _QUANTILES:
+            quantiles.labels(quantile).set_function(
+                functools.partial(self.__percentile, quantile)
+            )
+
+    def __percentile(self, quantile: float, /) -> float:
+        return self.percentiles().get(quantile, 0.0)
+
+    def percentiles(self) -> dict[float, float]:
+        lags = sorted(self._lags)
+
+        if len(lags) < 2:
+            return dict.fromkeys(_QUANTILES, lags[0]) if lags else {}
+
+        cuts = statistics.quantiles(lags, n=100, method='inclusive')
+
+        return {quantile: cuts[round(quantile * 100) - 1] for quantile in _QUANTILES}
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._stopping.clear()
+        self._loop = asyncio.get_running_loop()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.create_task(self.__probe())
+        self._thread = threading.Thread(
+            target=self.__watch,
+            args=(threading.get_ident(),),
+            name='botus-loop-watchdog',
+            daemon=True,
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    async def __probe(self) -> None:
+        while True:
+            self._last_beat = start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - start - self.interval, 0.0)
+            self._lags.append(lag)
+
+            if self._histogram is not None:
+                self._histogram.observe(lag)
+
+    def __watch(self, thread_id: int, /) -> None:
+        reported = False
+
+        while not self._stopping.wait(min(self.interval, self.threshold / 2)):
+            lag = time.monotonic() - self._last_beat - self.interval
+
+            if lag < self.threshold:
+                reported = False
+                continue
+
+            # Report each stall once, while the loop is still blocked in it
+            if reported:
+                continue
+
+            reported = True
+            self.__report(thread_id, lag)
+
+    def __report(self, thread_id: int, lag: float, /) -> None:
+        frame = sys._current_frames().get(thread_id)
+        stack = '' if frame is None else ''.join(traceback.format_stack(frame))
+        running = [] if self.context is None else self.context()
+
+        if (task := asyncio.current_task(self._loop)) is not None:
+            running.append(f'task {task.get_name()}')
+        self.last_stall = Stall(lag, stack, running)
+
+        if self._stalls is not None:
+            self._stalls.inc()
+
+        _log.warning(
+            'Event loop blocked for %.3fs while running %s\n%s',
+            lag,
+            ', '.join(running) or 'nothing known',
+            stack.rstrip(),
+        )
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import discord
+import pytest
+from discord.ext import commands
+from discord.ext.commands.view import (  # pyright: ignore[reportMissingTypeStubs]
+    StringView,
+)
+
+from botus_receptus import LazyExtension
+from botus_receptus.db import Context
+from botus_receptus.db.bot import Bot
+
+if TYPE_CHECKING:
+    from botus_receptus.config import Config
+
+    from ..types import MockerFixture
+
+
+@pytest.mark.usefixtures('mock_aiohttp')
+class TestBotBase:
+    @pytest.fixture
+    def config(self) -> Config:
+        return {
+            'bot_name': 'botty',
+            'discord_api_key': 'API_KEY',
+            'application_id': 1,
+            'intents': discord.Intents.all(),
+            'db_url': 'some://db/url',
+            'logging': {
+                'log_file': '',
+                'log_level': '',
+                'log_to_console': False,
+            },
+        }
+
+    async def test_pool_metrics(self, mocker: MockerFixture, config: Config) -> None:
+        pool = mocker.Mock()
+        pool.get_size.return_value = 4
+        pool.get_idle_size.return_value = 3
+        pool.get_max_size.return_value = 10
+        mocker.patch(
+            'botus_receptus.db.bot.create_pool', new=mocker.AsyncMock(return_value=pool)
+        )
+        bot = Bot(config)
+        await bot.setup_hook()
+
+        exposed = bot.metrics.expose()
+
+        assert 'botus_db_pool_size 4' in exposed
+        assert 'botus_db_pool_idle 3' in exposed
+        assert 'botus_db_pool_max_size 10' in exposed
+
+    async def test_lazy_command(self, mocker: MockerFixture, config: Config) -> None:
+        bot = Bot(config)
+        bot.pool = mocker.Mock()
+        bot.pool.acquire = mocker.AsyncMock(return_value=mocker.sentinel.connection)
+        bot.pool.release = mocker.AsyncMock()
+        connections: list[object] = []
+
+        async def load_extension(name: str, /) -> None:
+            @commands.command()
+            async def hello(ctx: Context[Any]) -> None:
+                connections.append(ctx.db)
+
+            bot.add_command(hello)
+
+        mocker.patch.object(bot, 'load_extension', side_effect=load_extension)
+        bot.add_lazy_extension(LazyExtension('lazy_ext', commands=['hello']))
+
+        view = StringView('$hello')
+        view.skip_string('$')
+        invoked_with = view.get_word()
+        ctx = Context[Any](
+            prefix='$',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=view,
+            invoked_with=invoked_with,
+            command=bot.get_command(invoked_with),
+        )
+        mocker.patch.object(bot, 'get_context', mocker.AsyncMock(return_value=ctx))
+
+        await bot.process_commands(mocker.sentinel.message)
+
+        assert connections == [mocker.sentinel.connection]
+        bot.pool.acquire.assert_awaited_once()
+        bot.pool.release.assert_awaited_once_with(mocker.sentinel.connection)
+
+    async def test_process_commands_no_command(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        bot = Bot(config)
+        bot.pool = mocker.Mock()
+        bot.pool.acquire = mocker.AsyncMock()
+        ctx = Context[Any](
+            prefix=None,
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=StringView('hello'),
+        )
+        mocker.patch.object(bot, 'get_context', mocker.AsyncMock(return_value=ctx))
+        invoke = mocker.patch.object(bot, 'invoke')
+
+        await bot.process_commands(mocker.sentinel.message)
+
+        invoke.assert_awaited_once_with(ctx)
+        bot.pool.acquire.assert_not_awaited()
+
+    async def test_process_commands_tracks_once(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        bot = Bot(config)
+        bot.pool = mocker.Mock()
+        bot.pool.acquire = mocker.AsyncMock(return_value=mocker.sentinel.connection)
+        bot.pool.release = mocker.AsyncMock()
+        running: list[list[str]] = []
+
+        @commands.command()
+        async def ping(ctx: Context[Any]) -> None:
+            running.append(bot.running_invocations)
+
+        bot.add_command(ping)
+
+        view = StringView('$ping')
+        view.skip_string('$')
+        invoked_with = view.get_word()
+        ctx = Context[Any](
+            prefix='$',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=view,
+            invoked_with=invoked_with,
+            command=bot.get_command(invoked_with),
+        )
+        mocker.patch.object(bot, 'get_context', mocker.AsyncMock(return_value=ctx))
+
+        await bot.process_commands(mocker.sentinel.message)
+
+        assert running == [['ping']]
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import discord
 import pytest
+from discord.ext import commands
+from discord.ext.commands.view import (  # pyright: ignore[reportMissingTypeStubs]
+    StringView,
+)
+from sqlalchemy.pool import QueuePool
 
+from botus_receptus import LazyExtension
+from botus_receptus.sqlalchemy import Context
 from botus_receptus.sqlalchemy.bot import Bot
 
 if TYPE_CHECKING:
@@ -15,6 +22,7 @@ if TYPE_CHECKING:
     from ..types import MockerFixture
 
 
+@pytest.mark.usefixtures('mock_aiohttp')
 class TestBotBase:
     @pytest.fixture
     def config(self) -> Config:
@@ -42,55 +50,333 @@ class TestBotBase:
         mock.close_all = mocker.Mock()
         return mock
 
+    @pytest.fixture
+    def mock_engine(self, mocker: MockerFixture) -> Mock:
+        engine = mocker.Mock()
+        engine.pool = QueuePool(mocker.Mock(), pool_size=3, max_overflow=2)
+        engine.dispose = mocker.AsyncMock()
+        return engine
+
     @pytest.fixture(autouse=True)
-    def mock_create_async_engine(self, mocker: MockerFixture) -> Mock:
+    def mock_create_async_engine(
+        self, mocker: MockerFixture, mock_engine: Mock
+    ) -> Mock:
         return mocker.patch(
             'botus_receptus.sqlalchemy.bot.create_async_engine',
-            return_value=mocker.sentinel.create_async_engine_result,
+            return_value=mock_engine,
         )
 
     @pytest.fixture
     def mock_bot_base_close(self, mocker: MockerFixture) -> AsyncMock:
-        return mocker.patch('botus_receptus.bot.BotBase.close')
+        return mocker.patch('discord.ext.commands.bot.BotBase.close')
+
+    @pytest.fixture
+    def mock_warm_pool(self, mocker: MockerFixture) -> AsyncMock:
+        return mocker.patch.object(Bot, 'warm_pool')
 
     def test_init(
         self,
-        mocker: MockerFixture,
         config: Config,
         mock_sessionmaker: Mock,
         mock_create_async_engine: Mock,
     ) -> None:
-        Bot(config, sessionmaker=mock_sessionmaker)
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
 
-        mock_sessionmaker.configure.assert_called_once_with(
-            bind=mocker.sentinel.create_async_engine_result
-        )
-        mock_create_async_engine.assert_called_once_with('some://db/url')
+        assert bot.sessionmaker is mock_sessionmaker
+        mock_sessionmaker.configure.assert_not_called()
+        mock_create_async_engine.assert_not_called()
 
-    def test_init_engine_kwargs(
+    async def test_setup_hook(
         self,
-        mocker: MockerFixture,
         config: Config,
         mock_sessionmaker: Mock,
         mock_create_async_engine: Mock,
+        mock_engine: Mock,
+        mock_warm_pool: AsyncMock,
+    ) -> None:
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.setup_hook()
+
+        assert bot.engine is mock_engine
+        mock_sessionmaker.configure.assert_called_once_with(bind=mock_engine)
+        mock_create_async_engine.assert_called_once_with('some://db/url')
+        assert {phase.name for phase in bot.startup_timeline} == {
+            'http_session',
+            'db_engine',
+        }
+        await bot.wait_until_engine_ready()
+
+        mock_warm_pool.assert_awaited_once_with()
+
+    async def test_setup_hook_warm_pool_error(
+        self,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_warm_pool: AsyncMock,
+    ) -> None:
+        mock_warm_pool.side_effect = OSError()
+
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.setup_hook()
+        await bot.wait_until_engine_ready()
+
+        mock_warm_pool.assert_awaited_once_with()
+
+    async def test_wait_until_engine_ready(
+        self, config: Config, mock_sessionmaker: Mock
     ) -> None:
-        Bot(config, sessionmaker=mock_sessionmaker, engine_kwargs={'one': 1, 'two': 2})
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+
+        with pytest.raises(RuntimeError, match='not been created'):
+            await bot.wait_until_engine_ready()
+
+    def test_engine_before_setup_hook(
+        self, config: Config, mock_sessionmaker: Mock
+    ) -> None:
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+
+        assert bot.pool_status() is None
 
-        mock_sessionmaker.configure.assert_called_once_with(
-            bind=mocker.sentinel.create_async_engine_result
+        with pytest.raises(RuntimeError, match='not been created'):
+            _ = bot.engine
+
+    async def test_init_engine_kwargs(
+        self,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_create_async_engine: Mock,
+        mock_warm_pool: AsyncMock,
+    ) -> None:
+        bot = Bot(
+            config, sessionmaker=mock_sessionmaker, engine_kwargs={'one': 1, 'two': 2}
         )
+        await bot.setup_hook()
+
         mock_create_async_engine.assert_called_once_with('some://db/url', one=1, two=2)
 
+    def test_init_query_cache(
+        self, mocker: MockerFixture, config: Config, mock_sessionmaker: Mock
+    ) -> None:
+        query_cache = mocker.MagicMock()
+        query_cache.__len__.return_value = 3
+
+        bot = Bot(config, sessionmaker=mock_sessionmaker, query_cache=query_cache)
+
+        assert bot.query_cache is query_cache
+        query_cache.install.assert_called_once_with(mock_sessionmaker)
+        assert bot.memory._probes['query_cache']() == 3
+
+    async def test_init_pool_config(
+        self,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_create_async_engine: Mock,
+        mock_warm_pool: AsyncMock,
+    ) -> None:
+        config['db_pool_size'] = 10
+        config['db_max_overflow'] = 5
+        config['db_pool_recycle'] = 3600
+        config['db_pool_pre_ping'] = True
+        config['db_query_cache_size'] = 1000
+
+        bot = Bot(
+            config, sessionmaker=mock_sessionmaker, engine_kwargs={'pool_size': 20}
+        )
+        await bot.setup_hook()
+
+        mock_create_async_engine.assert_called_once_with(
+            'some://db/url',
+            pool_size=20,
+            max_overflow=5,
+            pool_recycle=3600,
+            pool_pre_ping=True,
+            query_cache_size=1000,
+        )
+
+    async def test_pool_status(
+        self,
+        mocker: MockerFixture,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_warm_pool: AsyncMock,
+    ) -> None:
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.setup_hook()
+
+        assert bot.pool_status() == {
+            'size': 3,
+            'checked_in': 0,
+            'checked_out': 0,
+            'overflow': -3,
+        }
+
+        exposed = bot.metrics.expose()
+        assert 'botus_db_pool_size 3' in exposed
+        assert 'botus_db_pool_overflow -3' in exposed
+        assert 'botus_db_sessions_active 0' in exposed
+
+        bot.engine.pool = mocker.Mock()
+
+        assert bot.pool_status() is None
+
+    async def test_warm_pool(
+        self,
+        mocker: MockerFixture,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_engine: Mock,
+    ) -> None:
+        connections: list[Mock] = []
+
+        def connect() -> Mock:
+            connection = mocker.MagicMock()
+            connection.__aenter__ = mocker.AsyncMock(return_value=connection)
+            connection.__aexit__ = mocker.AsyncMock(return_value=None)
+            connections.append(connection)
+            return connection
+
+        mock_engine.connect = connect
+
+        mocker.patch.object(Bot, 'engine', new=mock_engine)
+
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.warm_pool()
+
+        assert len(connections) == 3
+
+        for connection in connections:
+            connection.__aenter__.assert_awaited_once()
+            connection.__aexit__.assert_awaited_once()
+
+    async def test_warm_pool_no_queue_pool(
+        self,
+        mocker: MockerFixture,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_engine: Mock,
+    ) -> None:
+        mock_engine.pool = mocker.Mock()
+        mock_engine.connect = mocker.Mock()
+
+        mocker.patch.object(Bot, 'engine', new=mock_engine)
+
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.warm_pool()
+
+        mock_engine.connect.assert_not_called()
+
     async def test_close(
         self,
         config: Config,
         mock_sessionmaker: Mock,
         mock_bot_base_close: AsyncMock,
         mock_close_all_sessions: AsyncMock,
+        mock_engine: Mock,
+        mock_warm_pool: AsyncMock,
     ) -> None:
         bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.setup_hook()
         await bot.close()
 
         mock_close_all_sessions.assert_awaited_once_with()
+        mock_engine.dispose.assert_awaited_once_with()
         mock_sessionmaker.close_all.assert_not_called()
         mock_bot_base_close.assert_awaited_once_with()
+
+    async def test_close_before_setup_hook(
+        self,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_bot_base_close: AsyncMock,
+        mock_close_all_sessions: AsyncMock,
+        mock_engine: Mock,
+    ) -> None:
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.close()
+
+        mock_close_all_sessions.assert_not_awaited()
+        mock_engine.dispose.assert_not_awaited()
+        mock_bot_base_close.assert_awaited_once_with()
+
+    async def test_process_commands(
+        self,
+        mocker: MockerFixture,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_warm_pool: AsyncMock,
+    ) -> None:
+        session = mocker.Mock()
+        session.commit = mocker.AsyncMock()
+        session.rollback = mocker.AsyncMock()
+        session.close = mocker.AsyncMock()
+        mock_sessionmaker.return_value = session
+
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.setup_hook()
+
+        async def invoke(ctx: Context[Any], /) -> None:
+            assert ctx.session is ctx.session
+
+        ctx = Context[Any](
+            prefix='~',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=StringView(''),
+        )
+        mocker.patch.object(bot, 'get_context', mocker.AsyncMock(return_value=ctx))
+        mocker.patch.object(bot, 'invoke', side_effect=invoke)
+
+        await bot.process_commands(mocker.sentinel.message)
+
+        mock_warm_pool.assert_awaited_once_with()
+        mock_sessionmaker.assert_called_once_with()
+        session.commit.assert_awaited_once_with()
+        session.close.assert_awaited_once_with()
+        assert bot.session_stats.opened == 1
+        assert bot.session_stats.closed == 1
+
+    async def test_lazy_command(
+        self,
+        mocker: MockerFixture,
+        config: Config,
+        mock_sessionmaker: Mock,
+        mock_warm_pool: AsyncMock,
+    ) -> None:
+        session = mocker.Mock()
+        session.commit = mocker.AsyncMock()
+        session.close = mocker.AsyncMock()
+        mock_sessionmaker.return_value = session
+
+        bot = Bot(config, sessionmaker=mock_sessionmaker)
+        await bot.setup_hook()
+        sessions: list[object] = []
+
+        async def load_extension(name: str, /) -> None:
+            @commands.command()
+            async def hello(ctx: Context[Any]) -> None:
+                sessions.append(ctx.session)
+
+            bot.add_command(hello)
+
+        mocker.patch.object(bot, 'load_extension', side_effect=load_extension)
+        bot.add_lazy_extension(LazyExtension('lazy_ext', commands=['hello']))
+
+        view = StringView('$hello')
+        view.skip_string('$')
+        invoked_with = view.get_word()
+        ctx = Context[Any](
+            prefix='$',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=view,
+            invoked_with=invoked_with,
+            command=bot.get_command(invoked_with),
+        )
+        mocker.patch.object(bot, 'get_context', mocker.AsyncMock(return_value=ctx))
+
+        await bot.process_commands(mocker.sentinel.message)
+
+        assert sessions == [session]
+        mock_sessionmaker.assert_called_once_with()
+        session.commit.assert_awaited_once_with()
+        session.close.assert_awaited_once_with()
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+from sqlalchemy import String, create_engine, event, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+
+from botus_receptus.sqlalchemy import CacheRegion, FromCache, QueryCache
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from sqlalchemy import Engine, Table
+
+    from ..types import MockerFixture
+
+
+class Base(DeclarativeBase): ...
+
+
+class GuildConfig(Base):
+    __tablename__: str = 'guild_configs'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    prefix: Mapped[str] = mapped_column(String)
+
+
+class Other(Base):
+    __tablename__: str = 'others'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+@pytest.fixture
+def engine() -> Generator[Engine]:
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add_all([GuildConfig(id=1, prefix='!'), GuildConfig(id=2, prefix='?')])
+        session.commit()
+
+    yield engine
+
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine: Engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(*args: Any) -> None:  # pyright: ignore[reportUnusedFunction]
+        statements.append(args[2])
+
+    return statements
+
+
+@pytest.fixture
+def query_cache() -> QueryCache:
+    return QueryCache()
+
+
+@pytest.fixture
+def session_factory(engine: Engine, query_cache: QueryCache) -> sessionmaker[Session]:
+    factory = sessionmaker(engine)
+    query_cache.install(factory)
+    return factory
+
+
+def _select_config(guild_id: int, /) -> Any:
+    return (
+        select(GuildConfig)
+        .where(GuildConfig.id == guild_id)
+        .options(FromCache('guild_config'))
+    )
+
+
+class TestCacheRegion:
+    def test_lru(self, mocker: MockerFixture) -> None:
+        region = CacheRegion(maxsize=2, ttl=None)
+
+        region.set('one', mocker.sentinel.one, ['a'])
+        region.set('two', mocker.sentinel.two, ['b'])
+        assert region.get('one') is mocker.sentinel.one
+
+        region.set('three', mocker.sentinel.three, ['c'])
+
+        assert len(region) == 2
+        assert region.get('two') is None
+        assert region.get('one') is mocker.sentinel.one
+        assert region.get('three') is mocker.sentinel.three
+        assert region.hits == 3
+        assert region.misses == 1
+
+    def test_ttl(self, mocker: MockerFixture) -> None:
+        monotonic = mocker.patch(
+            'botus_receptus.sqlalchemy.cache.time.monotonic', return_value=100.0
+        )
+        region = CacheRegion(ttl=10.0)
+
+        region.set('one', mocker.sentinel.one, ['a'])
+        monotonic.return_value = 109.0
+        assert region.get('one') is mocker.sentinel.one
+
+        monotonic.return_value = 110.0
+        assert region.get('one') is None
+        assert len(region) == 0
+
+    def test_invalidate(self, mocker: MockerFixture) -> None:
+        region = CacheRegion()
+
+        region.set('one', mocker.sentinel.one, ['a', 'b'])
+        region.set('two', mocker.sentinel.two, ['c'])
+
+        assert region.invalidate(['b']) == 1
+        assert region.get('one') is None
+        assert region.get('two') is mocker.sentinel.two
+
+        region.clear()
+        assert len(region) == 0
+
+
+class TestQueryCache:
+    def test_region(self) -> None:
+        query_cache = QueryCache(maxsize=10, ttl=None)
+        region = query_cache.region('one')
+
+        assert query_cache.region('one') is region
+        assert region.maxsize == 10
+        assert region.ttl is None
+
+    def test_cached_query(
+        self,
+        session_factory: sessionmaker[Session],
+        statements: list[str],
+        query_cache: QueryCache,
+    ) -> None:
+        with session_factory() as session:
+            config = session.scalars(_select_config(1)).one()
+            assert config.prefix == '!'
+
+        with session_factory() as session:
+            config = session.scalars(_select_config(1)).one()
+            assert config.prefix == '!'
+            assert config in session
+
+            config = session.scalars(_select_config(2)).one()
+            assert config.prefix == '?'
+
+        assert len(statements) == 2
+        assert query_cache.region('guild_config').hits == 1
+        assert query_cache.region('guild_config').misses == 2
+
+    def test_cached_query_after_commit(
+        self,
+        session_factory: sessionmaker[Session],
+        statements: list[str],
+        query_cache: QueryCache,
+    ) -> None:
+        with session_factory() as session:
+            assert session.scalars(_select_config(1)).one().prefix == '!'
+            session.commit()
+
+        with session_factory() as session:
+            config = session.scalars(_select_config(1)).one()
+            session.commit()
+
+        with session_factory() as session:
+            config = session.scalars(_select_config(1)).one()
+            assert config.prefix == '!'
+
+        assert len(statements) == 1
+        assert query_cache.region('guild_config').hits == 2
+
+    async def test_cached_query_async(self, query_cache: QueryCache) -> None:
+        pytest.importorskip('aiosqlite')
+
+        engine = create_async_engine('sqlite+aiosqlite://')
+
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        factory = async_sessionmaker(engine)
+        query_cache.install(factory)
+
+        async with factory() as session:
+            session.add(GuildConfig(id=1, prefix='!'))
+            await session.commit()
+
+        async with factory() as session:
+            await session.scalars(_select_config(1))
+            await session.commit()
+
+        async with factory() as session:
+            config = (await session.scalars(_select_config(1))).one()
+            assert config.prefix == '!'
+
+        await engine.dispose()
+
+    def test_uncached_query(
+        self, session_factory: sessionmaker[Session], statements: list[str]
+    ) -> None:
+        with session_factory() as session:
+            session.scalars(select(GuildConfig)).all()
+            session.scalars(select(GuildConfig)).all()
+
+        assert len(statements) == 2
+
+    def test_flush_invalidates(
+        self,
+        session_factory: sessionmaker[Session],
+        statements: list[str],
+        query_cache: QueryCache,
+    ) -> None:
+        with session_factory() as session:
+            session.scalars(_select_config(1)).one()
+
+        with session_factory() as session:
+            session.add(Other(id=1))
+            session.commit()
+
+        assert len(query_cache.region('guild_config')) == 1
+
+        with session_factory() as session:
+            config = session.scalars(_select_config(1)).one()
+            config.prefix = '$'
+            session.commit()
+
+        assert len(query_cache.region('guild_config')) == 0
+
+        with session_factory() as session:
+            assert session.scalars(_select_config(1)).one().prefix == '$'
+
+    def test_bulk_update_invalidates(
+        self, session_factory: sessionmaker[Session], query_cache: QueryCache
+    ) -> None:
+        with session_factory() as session:
+            session.scalars(_select_config(1)).one()
+            session.execute(update(GuildConfig).values(prefix='%'))
+
+            assert len(query_cache.region('guild_config')) == 0
+
+    @pytest.mark.parametrize(
+        'statement',
+        [
+            insert(GuildConfig).values(id=3, prefix='%'),
+            insert(cast('Table', GuildConfig.__table__)).values(id=3, prefix='%'),
+            sqlite_insert(GuildConfig)
+            .values(id=1, prefix='%')
+            .on_conflict_do_update(index_elements=['id'], set_={'prefix': '%'}),
+        ],
+    )
+    def test_insert_invalidates(
+        self,
+        session_factory: sessionmaker[Session],
+        query_cache: QueryCache,
+        statement: Any,
+    ) -> None:
+        with session_factory() as session:
+            session.scalars(_select_config(1)).one()
+            session.execute(statement)
+
+            assert len(query_cache.region('guild_config')) == 0
+
+    def test_commit_invalidates(
+        self,
+        mocker: MockerFixture,
+        session_factory: sessionmaker[Session],
+        query_cache: QueryCache,
+    ) -> None:
+        region = query_cache.region('guild_config')
+
+        with session_factory() as session:
+            config = session.scalars(_select_config(1)).one()
+            config.prefix = '$'
+            session.flush()
+
+            # another session caching the pre-commit row before the commit
+            region.set('stale', mocker.sentinel.stale, ['guild_configs'])
+            assert region.get('stale') is mocker.sentinel.stale
+
+            session.commit()
+
+        assert region.get('stale') is None
+
+    def test_rollback_invalidates(
+        self,
+        mocker: MockerFixture,
+        session_factory: sessionmaker[Session],
+        query_cache: QueryCache,
+    ) -> None:
+        region = query_cache.region('guild_config')
+
+        with session_factory() as session:
+            session.add(GuildConfig(id=3, prefix='%'))
+            session.flush()
+
+            # another session caching the uncommitted row before the rollback
+            region.set('stale', mocker.sentinel.stale, ['guild_configs'])
+            session.rollback()
+
+        assert region.get('stale') is None
+
+    def test_install_async_sessionmaker(self, query_cache: QueryCache) -> None:
+        factory = async_sessionmaker[Any]()
+        query_cache.install(factory)
+
+        session_class = factory.kw['sync_session_class']
+
+        assert session_class is not Session
+        assert issubclass(session_class, Session)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from attrs import define, field
+from discord.ext.commands.view import (  # pyright: ignore[reportMissingTypeStubs]
+    StringView,
+)
+
+from botus_receptus.sqlalchemy import Context, SessionStats
+
+if TYPE_CHECKING:
+    from unittest.mock import Mock
+
+    from ..types import MockerFixture
+
+
+@define
+class MockBot:
+    sessionmaker: Mock
+    session_stats: SessionStats = field(factory=SessionStats)
+
+
+@define
+class MockMessage:
+    author: Any = None
+    content: str | None = None
+    channel: Any = None
+    _state: Any = None
+
+
+class TestSessionStats:
+    def test_record(self) -> None:
+        stats = SessionStats()
+
+        stats.record_open()
+        stats.record_open()
+        assert stats.active == 2
+
+        stats.record_close(0.5)
+        stats.record_close(0.25)
+
+        assert stats.opened == 2
+        assert stats.closed == 2
+        assert stats.active == 0
+        assert stats.total_duration == 0.75
+        assert stats.max_duration == 0.5
+
+
+class TestContext:
+    @pytest.fixture
+    def mock_session(self, mocker: MockerFixture) -> Mock:
+        session = mocker.Mock()
+        session.commit = mocker.AsyncMock()
+        session.rollback = mocker.AsyncMock()
+        session.close = mocker.AsyncMock()
+        return session
+
+    @pytest.fixture
+    def mock_bot(self, mocker: MockerFixture, mock_session: Mock) -> MockBot:
+        return MockBot(sessionmaker=mocker.Mock(return_value=mock_session))
+
+    @pytest.fixture
+    def ctx(self, mock_bot: MockBot) -> Context[Any]:
+        return Context[Any](
+            prefix='~',
+            message=MockMessage(),  # pyright: ignore[reportArgumentType]
+            bot=mock_bot,
+            view=StringView(''),
+        )
+
+    def test_session_lazy(
+        self, ctx: Context[Any], mock_bot: MockBot, mock_session: Mock
+    ) -> None:
+        assert not ctx.has_session
+        mock_bot.sessionmaker.assert_not_called()
+
+        assert ctx.session is mock_session
+        assert ctx.session is mock_session
+        assert ctx.has_session
+
+        mock_bot.sessionmaker.assert_called_once_with()
+        assert mock_bot.session_stats.opened == 1
+
+    async def test_close_session_commit(
+        self, ctx: Context[Any], mock_bot: MockBot, mock_session: Mock
+    ) -> None:
+        _ = ctx.session
+        await ctx.close_session()
+
+        mock_session.commit.assert_awaited_once_with()
+        mock_session.rollback.assert_not_awaited()
+        mock_session.close.assert_awaited_once_with()
+        assert not ctx.has_session
+        assert mock_bot.session_stats.closed == 1
+
+    async def test_close_session_command_failed(
+        self, ctx: Context[Any], mock_session: Mock
+    ) -> None:
+        _ = ctx.session
+        ctx.command_failed = True
+        await ctx.close_session()
+
+        mock_session.commit.assert_not_awaited()
+        mock_session.rollback.assert_awaited_once_with()
+        mock_session.close.assert_awaited_once_with()
+
+    async def test_close_session_no_session(
+        self, ctx: Context[Any], mock_bot: MockBot
+    ) -> None:
+        await ctx.close_session()
+
+        mock_bot.sessionmaker.assert_not_called()
+        assert mock_bot.session_stats.closed == 0
+
+    async def test_session_scope(
+        self, ctx: Context[Any], mock_bot: MockBot, mock_session: Mock
+    ) -> None:
+        async with ctx.session_scope():
+            _ = ctx.session
+
+        mock_session.commit.assert_awaited_once_with()
+        mock_session.close.assert_awaited_once_with()
+        assert mock_bot.session_stats.active == 0
+
+    async def test_session_scope_error(
+        self, ctx: Context[Any], mock_session: Mock
+    ) -> None:
+        async def use_session() -> None:
+            async with ctx.session_scope():
+                _ = ctx.session
+                raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            await use_session()
+
+        mock_session.commit.assert_not_awaited()
+        mock_session.rollback.assert_awaited_once_with()
+        mock_session.close.assert_awaited_once_with()
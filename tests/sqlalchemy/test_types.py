@@ -4,11 +4,21 @@ from enum import Flag as _EnumFlag, auto
 from typing import TYPE_CHECKING, Protocol, final
 
 import pytest
-from sqlalchemy import BigInteger, Column, Integer, String
+from sqlalchemy import BigInteger, Column, Integer, MetaData, String, Table, select
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.ext import to_tsquery
 from sqlalchemy.orm import registry
-
-from botus_receptus.sqlalchemy.types import Flag, Snowflake, TSVector
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from botus_receptus.sqlalchemy.types import (
+    Flag,
+    Snowflake,
+    TSVector,
+    flag_index,
+    snowflake_column_migration,
+    tsvector_column,
+    tsvector_index,
+)
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Mapped
@@ -81,6 +91,68 @@ class TestSnowflake:
 
         assert snowflake.copy() is not snowflake
 
+    def test_native(self) -> None:
+        snowflake = Snowflake(native=True)
+        dialect = postgresql.dialect()
+
+        assert isinstance(snowflake.impl, BigInteger)
+        assert str(snowflake.compile(dialect=dialect)) == 'BIGINT'
+
+        impl = snowflake.dialect_impl(dialect)
+        assert impl.bind_processor(dialect) is None
+        assert impl.result_processor(dialect, None) is None
+
+        literal = impl.literal_processor(dialect)
+        assert literal is not None
+        assert literal(201293) == '201293'
+
+    def test_native_cache_key(self) -> None:
+        assert Snowflake(native=True)._static_cache_key != Snowflake()._static_cache_key
+
+    def test_native_copy(self) -> None:
+        snowflake = Snowflake(native=True)
+        copy = snowflake.copy()
+
+        assert copy is not snowflake
+        assert copy.native
+        assert isinstance(copy.impl, BigInteger)
+
+
+@pytest.mark.parametrize(
+    'native,schema,expected',
+    [
+        (
+            True,
+            None,
+            'ALTER TABLE guilds ALTER COLUMN guild_id TYPE BIGINT '
+            'USING CAST(guild_id AS BIGINT)',
+        ),
+        (
+            False,
+            None,
+            'ALTER TABLE guilds ALTER COLUMN guild_id TYPE VARCHAR '
+            'USING CAST(guild_id AS VARCHAR)',
+        ),
+        (
+            True,
+            'bot',
+            'ALTER TABLE bot.guilds ALTER COLUMN guild_id TYPE BIGINT '
+            'USING CAST(guild_id AS BIGINT)',
+        ),
+    ],
+)
+def test_snowflake_column_migration(
+    native: bool, schema: str | None, expected: str
+) -> None:
+    assert (
+        str(
+            snowflake_column_migration(
+                'guilds', 'guild_id', native=native, schema=schema
+            )
+        )
+        == expected
+    )
+
 
 class TestTSVector:
     def test_init(self) -> None:
@@ -118,6 +190,112 @@ class TestTSVector:
             '%(search_index_1)s)'
         )
 
+    def test_websearch_match(self, user_table: type[User]) -> None:
+        expr = user_table.search_index.websearch_match('cats -dogs')
+
+        assert str(expr.compile(dialect=postgresql.dialect())) == (
+            'users.search_index @@ websearch_to_tsquery(%(websearch_to_tsquery_1)s, '
+            '%(websearch_to_tsquery_2)s)'
+        )
+
+    def test_websearch_match_no_regconfig(self) -> None:
+        search = Column('search', TSVector())
+
+        assert str(search.websearch_match('cats').compile()) == (
+            'search @@ websearch_to_tsquery(:websearch_to_tsquery_1)'
+        )
+
+    def test_rank(self, user_table: type[User]) -> None:
+        expr = user_table.search_index.rank('cats')
+
+        assert str(expr.compile(dialect=postgresql.dialect())) == (
+            'ts_rank(users.search_index, websearch_to_tsquery('
+            '%(websearch_to_tsquery_1)s, %(websearch_to_tsquery_2)s))'
+        )
+
+    def test_rank_weights_normalization(self, user_table: type[User]) -> None:
+        expr = user_table.search_index.rank(
+            'cats', weights=[0.1, 0.2, 0.4, 1.0], normalization=32
+        )
+        compiled = expr.compile(dialect=postgresql.dialect())
+
+        assert str(compiled) == (
+            'ts_rank(CAST(ARRAY[%(param_1)s, %(param_2)s, %(param_3)s, %(param_4)s] '
+            'AS REAL[]), users.search_index, websearch_to_tsquery('
+            '%(websearch_to_tsquery_1)s, %(websearch_to_tsquery_2)s), %(ts_rank_1)s)'
+        )
+        assert compiled.params == {
+            'param_1': 0.1,
+            'param_2': 0.2,
+            'param_3': 0.4,
+            'param_4': 1.0,
+            'websearch_to_tsquery_1': 'pg_catalog.finnish',
+            'websearch_to_tsquery_2': 'cats',
+            'ts_rank_1': 32,
+        }
+
+    def test_rank_cd(self, user_table: type[User]) -> None:
+        query = to_tsquery('cats')
+        expr = user_table.search_index.rank_cd(query)
+
+        assert str(expr.compile(dialect=postgresql.dialect())) == (
+            'ts_rank_cd(users.search_index, to_tsquery(%(to_tsquery_1)s))'
+        )
+
+    def test_headline(self, user_table: type[User]) -> None:
+        expr = user_table.search_index.headline(
+            user_table.name, 'cats', options='MaxWords=10'
+        )
+        compiled = expr.compile(dialect=postgresql.dialect())
+
+        assert str(compiled) == (
+            'ts_headline(%(ts_headline_1)s, users.name, websearch_to_tsquery('
+            '%(websearch_to_tsquery_1)s, %(websearch_to_tsquery_2)s), '
+            '%(ts_headline_2)s)'
+        )
+        assert compiled.params == {
+            'ts_headline_1': 'pg_catalog.finnish',
+            'websearch_to_tsquery_1': 'pg_catalog.finnish',
+            'websearch_to_tsquery_2': 'cats',
+            'ts_headline_2': 'MaxWords=10',
+        }
+
+
+def test_tsvector_column() -> None:
+    title = Column('title', String)
+    table = Table(
+        'posts',
+        MetaData(),
+        Column('id', Integer, primary_key=True),
+        title,
+        Column('body', String),
+        tsvector_column(title, 'body', regconfig='pg_catalog.english', name='search'),
+    )
+
+    assert isinstance(table.c.search.type, TSVector)
+    assert table.c.search.type.columns == (title, 'body')
+    assert table.c.search.type.options == {'regconfig': 'pg_catalog.english'}
+    assert 'search TSVECTOR GENERATED ALWAYS AS (to_tsvector(' in str(
+        CreateTable(table).compile(dialect=postgresql.dialect())
+    )
+    assert (
+        "to_tsvector('pg_catalog.english', coalesce(title, '') || ' ' || "
+        "coalesce(body, ''))) STORED"
+    ) in str(CreateTable(table).compile(dialect=postgresql.dialect()))
+
+
+def test_tsvector_column_no_columns() -> None:
+    with pytest.raises(ValueError, match='At least one column'):
+        tsvector_column(regconfig='pg_catalog.english')
+
+
+def test_tsvector_index(user_table: type[User]) -> None:
+    index = tsvector_index('ix_users_search', user_table.search_index)
+
+    assert str(CreateIndex(index).compile(dialect=postgresql.dialect())) == (
+        'CREATE INDEX ix_users_search ON users USING gin (search_index)'
+    )
+
 
 class TestFlag:
     def test_init(self) -> None:
@@ -159,3 +337,57 @@ class TestFlag:
         flag = Flag(MyFlag)
 
         assert flag.process_result_value(result_value, object()) is expected
+
+    @pytest.mark.parametrize(
+        'method,flags,expected',
+        [
+            (
+                'has_all',
+                MyFlag.One | MyFlag.Four,
+                'WHERE (guilds.features & 5) = 5',
+            ),
+            ('has_any', MyFlag.Two, 'WHERE (guilds.features & 2) != 0'),
+            ('has_none', 3, 'WHERE (guilds.features & 3) = 0'),
+        ],
+    )
+    def test_comparator(
+        self, guild_table: Table, method: str, flags: MyFlag | int, expected: str
+    ) -> None:
+        condition = getattr(guild_table.c.features, method)(flags)
+        compiled = (
+            select(guild_table.c.id)
+            .where(condition)
+            .compile(
+                dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+            )
+        )
+
+        assert str(compiled).endswith(expected)
+
+
+@pytest.fixture
+def guild_table() -> Table:
+    return Table(
+        'guilds',
+        MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('features', Flag(MyFlag)),
+    )
+
+
+def test_flag_index_partial(guild_table: Table) -> None:
+    index = flag_index('ix_guilds_one', guild_table.c.features, MyFlag.One)
+
+    assert str(CreateIndex(index).compile(dialect=postgresql.dialect())) == (
+        'CREATE INDEX ix_guilds_one ON guilds (features) WHERE (features & 1) = 1'
+    )
+
+
+def test_flag_index_expression(guild_table: Table) -> None:
+    index = flag_index(
+        'ix_guilds_four', guild_table.c.features, MyFlag.Four, partial=False
+    )
+
+    assert str(CreateIndex(index).compile(dialect=postgresql.dialect())) == (
+        'CREATE INDEX ix_guilds_four ON guilds ((features & 4))'
+    )
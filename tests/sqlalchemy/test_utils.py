@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import pytest
+from sqlalchemy import String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from botus_receptus.sqlalchemy import Snowflake, insert_many, upsert_many
+
+if TYPE_CHECKING:
+    from unittest.mock import AsyncMock
+
+    from sqlalchemy import Table
+
+    from ..types import MockerFixture
+
+
+class Base(DeclarativeBase): ...
+
+
+class GuildEvent(Base):
+    __tablename__: str = 'guild_events'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    guild_id: Mapped[int] = mapped_column(Snowflake(native=True), unique=True)
+    name: Mapped[str] = mapped_column(String)
+
+
+class Guild(Base):
+    __tablename__: str = 'guilds'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    guild_name: Mapped[str] = mapped_column('name', String)
+
+
+@pytest.fixture
+def mock_db(mocker: MockerFixture) -> AsyncMock:
+    db = mocker.AsyncMock()
+    db.execute.return_value.all = mocker.Mock(return_value=[(1,)])
+    return db
+
+
+def _compile(stmt: Any) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+async def test_insert_many(mock_db: AsyncMock) -> None:
+    rows = [{'guild_id': index, 'name': f'event {index}'} for index in range(5)]
+
+    result = await insert_many(mock_db, GuildEvent, rows, batch_size=2)
+
+    assert result == []
+    assert mock_db.execute.await_count == 3
+
+    stmt, params = mock_db.execute.await_args_list[0].args
+    assert _compile(stmt).startswith('INSERT INTO guild_events ')
+    assert stmt.get_execution_options()['insertmanyvalues_page_size'] == 2
+    assert params == rows[:2]
+    assert mock_db.execute.await_args_list[1].args[1] == rows[2:4]
+    assert mock_db.execute.await_args_list[2].args[1] == rows[4:]
+
+
+async def test_insert_many_instances(mock_db: AsyncMock) -> None:
+    await insert_many(
+        mock_db,
+        GuildEvent,
+        [GuildEvent(guild_id=1, name='one'), GuildEvent(guild_id=2, name='two')],
+    )
+
+    mock_db.execute.assert_awaited_once()
+    assert mock_db.execute.await_args.args[1] == [
+        {'guild_id': 1, 'name': 'one'},
+        {'guild_id': 2, 'name': 'two'},
+    ]
+
+
+async def test_insert_many_renamed_column(mocker: MockerFixture) -> None:
+    session = mocker.AsyncMock()
+    connection = mocker.AsyncMock(spec=AsyncConnection)
+
+    await insert_many(session, Guild, [Guild(id=1, guild_name='one')])
+    await insert_many(connection, Guild, [Guild(id=1, guild_name='one')])
+
+    assert session.execute.await_args.args[1] == [{'id': 1, 'guild_name': 'one'}]
+    assert connection.execute.await_args.args[1] == [{'id': 1, 'name': 'one'}]
+
+
+async def test_insert_many_returning(mock_db: AsyncMock) -> None:
+    result = await insert_many(
+        mock_db,
+        cast('Table', GuildEvent.__table__),
+        [{'guild_id': 1, 'name': 'one'}],
+        returning=[GuildEvent.id],
+    )
+
+    assert result == [(1,)]
+    assert _compile(mock_db.execute.await_args.args[0]).endswith(
+        'RETURNING guild_events.id'
+    )
+
+
+async def test_insert_many_batch_size(mock_db: AsyncMock) -> None:
+    with pytest.raises(ValueError, match='batch_size'):
+        await insert_many(mock_db, GuildEvent, [], batch_size=0)
+
+
+async def test_upsert_many(mock_db: AsyncMock) -> None:
+    await upsert_many(
+        mock_db,
+        GuildEvent,
+        [{'guild_id': 1, 'name': 'one'}],
+        index_elements=['guild_id'],
+    )
+
+    assert _compile(mock_db.execute.await_args.args[0]).endswith(
+        'ON CONFLICT (guild_id) DO UPDATE SET name = excluded.name'
+    )
+
+
+async def test_upsert_many_update(mock_db: AsyncMock) -> None:
+    await upsert_many(
+        mock_db,
+        cast('Table', GuildEvent.__table__),
+        [{'id': 1, 'guild_id': 1, 'name': 'one'}],
+        index_elements=['id'],
+        update=['guild_id', 'name'],
+    )
+
+    assert _compile(mock_db.execute.await_args.args[0]).endswith(
+        'ON CONFLICT (id) DO UPDATE SET guild_id = excluded.guild_id, '
+        'name = excluded.name'
+    )
+
+
+async def test_upsert_many_nothing_to_update(mock_db: AsyncMock) -> None:
+    await upsert_many(
+        mock_db,
+        GuildEvent,
+        [{'guild_id': 1, 'name': 'one'}],
+        index_elements=['guild_id', 'name'],
+    )
+
+    assert _compile(mock_db.execute.await_args.args[0]).endswith(
+        'ON CONFLICT (guild_id, name) DO NOTHING'
+    )
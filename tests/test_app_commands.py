@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
 
 import discord
 import pytest
@@ -14,12 +14,17 @@ from botus_receptus.app_commands import (
 )
 
 if TYPE_CHECKING:
+    from unittest.mock import AsyncMock
+
     from botus_receptus.bot import Bot
 
+    from .types import MockerFixture
+
 
 @define
 class MockConnection:
     _command_tree: app_commands.CommandTree[Any] | None = field(default=None)
+    _translator: app_commands.Translator | None = field(default=None)
 
 
 @define
@@ -27,6 +32,8 @@ class MockClient:
     http: object = field(factory=object)
     _connection: MockConnection = field(factory=MockConnection)
     config: dict[str, Any] = field(factory=dict[str, Any])
+    application_id: int | None = None
+    accepting_invocations: bool = True
 
 
 def test_admin_guild_only() -> None:
@@ -101,3 +108,90 @@ class TestCommandTree:
 
         with pytest.raises(TypeError):
             tree.add_command(my_command)  # pyright: ignore[reportUnknownArgumentType]
+
+    async def test_fingerprint(self, mock_client: Bot) -> None:
+        @app_commands.command()
+        async def my_command(interaction: discord.Interaction) -> None: ...
+
+        @app_commands.command()
+        async def my_other_command(interaction: discord.Interaction) -> None: ...
+
+        tree = CommandTree(mock_client)
+        empty = await tree.fingerprint()
+
+        tree.add_command(my_command)  # pyright: ignore[reportUnknownArgumentType]
+        fingerprint = await tree.fingerprint()
+
+        assert fingerprint != empty
+        assert await tree.fingerprint() == fingerprint
+        assert await tree.fingerprint(guild=discord.Object(id=12345)) == empty
+
+        tree.add_command(my_other_command)  # pyright: ignore[reportUnknownArgumentType]
+
+        assert await tree.fingerprint() != fingerprint
+
+    async def test_lazy_commands(self, mock_client: Bot) -> None:
+        tree = CommandTree(mock_client)
+        empty = await tree.fingerprint()
+
+        tree.add_lazy_command('ext', {'name': 'lazy', 'description': 'Lazy'})
+        tree.add_lazy_command(
+            'ext', {'name': 'lazy', 'type': 3}, guild=discord.Object(id=12345)
+        )
+
+        assert await tree.fingerprint() != empty
+        assert tree.get_lazy_extension('lazy') == 'ext'
+        assert tree.get_lazy_extension('lazy', guild_id=12345) == 'ext'
+        assert tree.get_lazy_extension('lazy', 3, guild_id=12345) == 'ext'
+        assert tree.get_lazy_extension('lazy', 3) is None
+
+        tree.remove_lazy_commands('ext')
+
+        assert await tree.fingerprint() == empty
+        assert tree.get_lazy_extension('lazy') is None
+
+    async def test_copy_global_to_lazy_commands(self, mock_client: Bot) -> None:
+        tree = CommandTree(mock_client, fallback_to_global=False)
+        guild = discord.Object(id=12345)
+        empty = await tree.fingerprint(guild=guild)
+
+        tree.add_lazy_command('ext', {'name': 'lazy', 'description': 'Lazy'})
+        tree.copy_global_to(guild=guild)
+
+        assert await tree.fingerprint(guild=guild) == await tree.fingerprint()
+        assert await tree.fingerprint(guild=guild) != empty
+        assert tree.get_lazy_extension('lazy', guild_id=12345) == 'ext'
+
+    @pytest.mark.parametrize(
+        'interaction_type,replied',
+        [
+            (discord.InteractionType.application_command, True),
+            (discord.InteractionType.autocomplete, False),
+        ],
+    )
+    async def test_call_shutting_down(
+        self,
+        mocker: MockerFixture,
+        mock_client: MockClient,
+        interaction_type: discord.InteractionType,
+        replied: bool,
+    ) -> None:
+        mock_client.accepting_invocations = False
+        tree = CommandTree(cast('Bot', mock_client))
+        interaction = mocker.Mock(type=interaction_type)
+        interaction.response.send_message = mocker.AsyncMock()
+
+        await tree._call(interaction)
+
+        send_message: AsyncMock = interaction.response.send_message
+
+        if replied:
+            send_message.assert_awaited_once_with(mocker.ANY, ephemeral=True)
+        else:
+            send_message.assert_not_awaited()
+
+    async def test_sync_missing_application_id(self, mock_client: Bot) -> None:
+        tree = CommandTree(mock_client)
+
+        with pytest.raises(app_commands.MissingApplicationID):
+            await tree.sync()
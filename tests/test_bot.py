@@ -1,16 +1,29 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+import asyncio
+import graphlib
+import json
+import signal
+import sys
+import textwrap
+from typing import TYPE_CHECKING, Any, cast
 
 import discord
 import pytest
+from discord import app_commands
 from discord.ext import commands
+from discord.ext.commands.view import (  # pyright: ignore[reportMissingTypeStubs]
+    StringView,
+)
 
-from botus_receptus.bot import Bot
+from botus_receptus.bot import Bot, LazyExtension
 
 if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
     from unittest.mock import AsyncMock, MagicMock
 
+    from botus_receptus.app_commands import CommandTree
     from botus_receptus.config import Config
 
     from .types import MockerFixture
@@ -124,3 +137,659 @@ class TestBot:
 
         close.assert_awaited()
         cast('AsyncMock', bot.session.close).assert_awaited()
+
+    @pytest.fixture
+    def sync_bot(self, config: Config, tmp_path: Path) -> Bot:
+        config['admin_guild'] = 1
+        config['test_guilds'] = [2, 3]
+        config['app_command_cache'] = str(tmp_path / 'commands.json')
+
+        @app_commands.command()
+        async def my_command(interaction: discord.Interaction) -> None: ...
+
+        bot = Bot(config)
+        bot.tree.add_command(my_command)  # pyright: ignore[reportUnknownArgumentType]
+
+        return bot
+
+    async def test_sync_app_commands(
+        self, sync_bot: Bot, http: MagicMock, tmp_path: Path
+    ) -> None:
+        await sync_bot.sync_app_commands()
+
+        http.return_value.bulk_upsert_global_commands.assert_awaited_once()
+        assert http.return_value.bulk_upsert_guild_commands.await_count == 3
+        assert {
+            call.args[1]
+            for call in http.return_value.bulk_upsert_guild_commands.await_args_list
+        } == {1, 2, 3}
+        assert set(json.loads((tmp_path / 'commands.json').read_text())) == {
+            '1:global',
+            '1:1',
+            '1:2',
+            '1:3',
+        }
+
+    async def test_sync_app_commands_unchanged(
+        self, sync_bot: Bot, http: MagicMock
+    ) -> None:
+        await sync_bot.sync_app_commands()
+        http.return_value.bulk_upsert_global_commands.reset_mock()
+        http.return_value.bulk_upsert_guild_commands.reset_mock()
+
+        await sync_bot.sync_app_commands()
+
+        http.return_value.bulk_upsert_global_commands.assert_not_awaited()
+        http.return_value.bulk_upsert_guild_commands.assert_not_awaited()
+
+        @app_commands.command()
+        async def my_other_command(interaction: discord.Interaction) -> None: ...
+
+        sync_bot.tree.add_command(my_other_command)  # pyright: ignore[reportUnknownArgumentType]
+        await sync_bot.sync_app_commands()
+
+        http.return_value.bulk_upsert_global_commands.assert_awaited_once()
+        assert http.return_value.bulk_upsert_guild_commands.await_count == 3
+
+    async def test_sync_app_commands_force(
+        self, sync_bot: Bot, http: MagicMock
+    ) -> None:
+        await sync_bot.sync_app_commands()
+        await sync_bot.sync_app_commands(force=True)
+
+        assert http.return_value.bulk_upsert_global_commands.await_count == 2
+        assert http.return_value.bulk_upsert_guild_commands.await_count == 6
+
+    async def test_sync_app_commands_error(
+        self, sync_bot: Bot, http: MagicMock, tmp_path: Path
+    ) -> None:
+        http.return_value.bulk_upsert_global_commands.side_effect = RuntimeError()
+
+        with pytest.raises(RuntimeError):
+            await sync_bot.sync_app_commands()
+
+        assert http.return_value.bulk_upsert_guild_commands.await_count == 3
+        assert '1:global' not in json.loads((tmp_path / 'commands.json').read_text())
+
+    async def test_load_extensions(self, mocker: MockerFixture, config: Config) -> None:
+        events: list[str] = []
+
+        async def load_extension(name: str, *, package: str | None = None) -> None:
+            events.append(f'start {name}')
+            await asyncio.sleep(0)
+            events.append(f'end {name}')
+
+        bot = Bot(config)
+        mocker.patch.object(bot, 'load_extension', side_effect=load_extension)
+
+        results = await bot.load_extensions(
+            {'ext.a': [], 'ext.b': [], 'ext.c': ['ext.a', 'ext.b']}
+        )
+
+        assert [result.name for result in results] == ['ext.a', 'ext.b', 'ext.c']
+        assert all(result.ok for result in results)
+        assert events == [
+            'start ext.a',
+            'start ext.b',
+            'end ext.a',
+            'end ext.b',
+            'start ext.c',
+            'end ext.c',
+        ]
+
+    async def test_load_extensions_failure(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        error = commands.ExtensionFailed('ext.a', RuntimeError())
+
+        async def load_extension(name: str, *, package: str | None = None) -> None:
+            if name == 'ext.a':
+                raise error
+
+        bot = Bot(config)
+        load = mocker.patch.object(bot, 'load_extension', side_effect=load_extension)
+
+        results = await bot.load_extensions(
+            {'ext.a': [], 'ext.b': [], 'ext.c': ['ext.a'], 'ext.d': ['ext.missing']},
+            package='my_bot',
+        )
+
+        assert [result.ok for result in results] == [False, True, False, False]
+        assert results[0].error is error
+        assert isinstance(results[2].error, commands.ExtensionNotLoaded)
+        assert results[2].error.name == 'ext.a'
+        assert isinstance(results[3].error, commands.ExtensionNotLoaded)
+        assert results[3].error.name == 'ext.missing'
+        assert load.call_args_list == [
+            mocker.call('ext.a', package='my_bot'),
+            mocker.call('ext.b', package='my_bot'),
+        ]
+
+    async def test_load_extensions_cycle(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        bot = Bot(config)
+        load = mocker.patch.object(bot, 'load_extension')
+
+        with pytest.raises(graphlib.CycleError):
+            await bot.load_extensions({'ext.a': ['ext.b'], 'ext.b': ['ext.a']})
+
+        load.assert_not_called()
+
+    @pytest.fixture
+    def lazy_extension(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> Generator[LazyExtension]:
+        (tmp_path / 'lazy_ext.py').write_text(
+            textwrap.dedent(
+                """
+                from discord.ext import commands
+
+                calls = []
+
+
+                class LazyCog(commands.Cog):
+                    @commands.command()
+                    async def hello(self, ctx):
+                        calls.append(('hello', ctx))
+
+                    @commands.Cog.listener()
+                    async def on_member_join(self, member):
+                        calls.append(('on_member_join', member))
+
+
+                async def setup(bot):
+                    await bot.add_cog(LazyCog())
+                """
+            )
+        )
+        monkeypatch.setattr(sys, 'path', [str(tmp_path), *sys.path])
+
+        yield LazyExtension(
+            'lazy_ext',
+            commands=['hello'],
+            app_commands=[{'name': 'hello', 'description': 'Say hello', 'type': 1}],
+            listeners=['on_member_join'],
+            admin_guild_only=True,
+        )
+
+        sys.modules.pop('lazy_ext', None)
+
+    async def test_add_lazy_extension(
+        self, config: Config, lazy_extension: LazyExtension
+    ) -> None:
+        config['admin_guild'] = 1
+        bot = Bot(config)
+        tree = cast('CommandTree[Any]', bot.tree)
+
+        bot.add_lazy_extension(lazy_extension)
+
+        assert 'lazy_ext' not in sys.modules
+        assert bot.get_command('hello') is not None
+        assert len(bot.extra_events['on_member_join']) == 1
+        assert tree.get_lazy_extension('hello', guild_id=1) == 'lazy_ext'
+        assert tree.get_lazy_extension('hello') is None
+
+        with pytest.raises(commands.ExtensionAlreadyLoaded):
+            bot.add_lazy_extension(lazy_extension)
+
+    async def test_lazy_command(
+        self, mocker: MockerFixture, config: Config, lazy_extension: LazyExtension
+    ) -> None:
+        bot = Bot(config)
+        bot.add_lazy_extension(lazy_extension)
+        stub = bot.get_command('hello')
+        assert stub is not None
+
+        view = StringView('$hello')
+        view.skip_string('$')
+        ctx = commands.Context[Any](
+            prefix='$',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=view,
+            invoked_with=view.get_word(),
+            command=stub,
+        )
+
+        await bot.invoke(ctx)
+
+        assert 'lazy_ext' in bot.extensions
+        assert bot.get_command('hello') is not stub
+        assert ctx.command is bot.get_command('hello')
+        assert cast('CommandTree[Any]', bot.tree).get_lazy_extension('hello') is None
+        assert sys.modules['lazy_ext'].calls == [('hello', ctx)]
+
+    async def test_lazy_command_hooks(
+        self, mocker: MockerFixture, config: Config, lazy_extension: LazyExtension
+    ) -> None:
+        bot = Bot(config)
+        bot.add_lazy_extension(lazy_extension)
+        calls: list[str] = []
+
+        @bot.before_invoke
+        async def before(ctx: commands.Context[Any]) -> None:  # pyright: ignore[reportUnusedFunction]
+            calls.append(f'before {ctx.command}')
+
+        @bot.after_invoke
+        async def after(ctx: commands.Context[Any]) -> None:  # pyright: ignore[reportUnusedFunction]
+            calls.append(f'after {ctx.command}')
+
+        view = StringView('$hello')
+        view.skip_string('$')
+        ctx = commands.Context[Any](
+            prefix='$',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=view,
+            invoked_with=view.get_word(),
+            command=bot.get_command('hello'),
+        )
+
+        await bot.invoke(ctx)
+
+        assert calls == ['before hello', 'after hello']
+
+    async def test_lazy_command_error(
+        self, mocker: MockerFixture, config: Config, lazy_extension: LazyExtension
+    ) -> None:
+        bot = Bot(config)
+        bot.add_lazy_extension(lazy_extension)
+        error = commands.ExtensionFailed('lazy_ext', RuntimeError())
+        mocker.patch.object(bot, 'load_extension', side_effect=error)
+        dispatch = mocker.patch.object(bot, 'dispatch')
+        ctx = commands.Context[Any](
+            prefix='$',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=StringView('hello'),
+            invoked_with='hello',
+            command=bot.get_command('hello'),
+        )
+
+        await bot.invoke(ctx)
+
+        dispatch.assert_called_once_with('command_error', ctx, mocker.ANY)
+        assert dispatch.call_args.args[2].original is error
+
+    async def test_lazy_listener(
+        self, mocker: MockerFixture, config: Config, lazy_extension: LazyExtension
+    ) -> None:
+        bot = Bot(config)
+        bot.add_lazy_extension(lazy_extension)
+        (stub,) = bot.extra_events['on_member_join']
+
+        await stub(mocker.sentinel.member)
+
+        assert sys.modules['lazy_ext'].calls == [
+            ('on_member_join', mocker.sentinel.member)
+        ]
+        assert stub not in bot.extra_events['on_member_join']
+
+    async def test_load_lazy_extension_once(
+        self, mocker: MockerFixture, config: Config, lazy_extension: LazyExtension
+    ) -> None:
+        bot = Bot(config)
+        bot.add_lazy_extension(lazy_extension)
+        load = mocker.spy(bot, 'load_extension')
+
+        await asyncio.gather(
+            bot.load_lazy_extension('lazy_ext'), bot.load_lazy_extension('lazy_ext')
+        )
+        await bot.load_lazy_extension('lazy_ext')
+
+        load.assert_called_once_with('lazy_ext')
+
+    async def test_load_lazy_extension_error(
+        self, mocker: MockerFixture, config: Config, lazy_extension: LazyExtension
+    ) -> None:
+        bot = Bot(config)
+        bot.add_lazy_extension(lazy_extension)
+        mocker.patch.object(
+            bot,
+            'load_extension',
+            side_effect=commands.ExtensionFailed('lazy_ext', RuntimeError()),
+        )
+
+        with pytest.raises(commands.ExtensionFailed):
+            await bot.load_lazy_extension('lazy_ext')
+
+        assert bot.get_command('hello') is not None
+        assert len(bot.extra_events['on_member_join']) == 1
+
+    async def test_add_startup_task(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        bot = Bot(config)
+        sync = mocker.patch.object(bot, 'sync_app_commands')
+
+        bot.add_startup_task('sync', bot.sync_app_commands, after=['http_session'])
+
+        with pytest.raises(ValueError, match='already registered'):
+            bot.add_startup_task('sync', bot.sync_app_commands)
+
+        await bot.setup_hook()
+
+        sync.assert_awaited_once_with()
+        assert [phase.name for phase in bot.startup_timeline] == [
+            'http_session',
+            'sync',
+        ]
+
+    async def test_close_drains_invocations(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        close = mocker.patch(
+            'discord.ext.commands.bot.BotBase.close', new_callable=mocker.AsyncMock
+        )
+        parent_invoke = mocker.patch('discord.ext.commands.bot.BotBase.invoke')
+        config['shutdown_timeout'] = 1
+        bot = Bot(config)
+        await bot.setup_hook()
+
+        events: list[str] = []
+        release = asyncio.Event()
+
+        async def shutdown_task() -> None:
+            events.append('shutdown task')
+
+        async def invoke(ctx: commands.Context[Bot]) -> None:
+            await release.wait()
+            events.append('invoked')
+
+        parent_invoke.side_effect = invoke
+        bot.add_shutdown_task('custom', shutdown_task)
+
+        ctx = mocker.Mock(
+            command=mocker.Mock(qualified_name='ping', extras={}), invoked_with='ping'
+        )
+        invocation = asyncio.create_task(bot.invoke(ctx))
+        await asyncio.sleep(0)
+
+        assert bot.running_invocations == ['ping']
+
+        closing = asyncio.create_task(bot.close())
+        await asyncio.sleep(0.01)
+
+        assert not bot.accepting_invocations
+
+        await bot.invoke(ctx)
+        assert parent_invoke.await_count == 1
+
+        release.set()
+        await asyncio.gather(invocation, closing, bot.close())
+
+        assert events == ['invoked', 'shutdown task']
+        close.assert_awaited_once_with()
+        cast('AsyncMock', bot.session.close).assert_awaited_once_with()
+
+    async def test_invoke_not_a_command(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        bot = Bot(config)
+        track = mocker.spy(bot, 'track_invocation')
+        parent_invoke = mocker.patch('discord.ext.commands.bot.BotBase.invoke')
+        ctx = mocker.Mock(command=None, invoked_with='nope')
+
+        await bot.invoke(ctx)
+
+        parent_invoke.assert_awaited_once_with(ctx)
+        track.assert_not_called()
+
+    async def test_close_from_invocation(
+        self, mocker: MockerFixture, config: Config
+    ) -> None:
+        close = mocker.patch(
+            'discord.ext.commands.bot.BotBase.close', new_callable=mocker.AsyncMock
+        )
+        config['shutdown_timeout'] = 2
+        bot = Bot(config)
+
+        @bot.command()
+        async def shutdown(ctx: commands.Context[Bot]) -> None:  # pyright: ignore[reportUnusedFunction]
+            await bot.close()
+
+        view = StringView('$shutdown')
+        view.skip_string('$')
+        ctx = commands.Context[Any](
+            prefix='$',
+            message=mocker.Mock(_state=None),
+            bot=bot,
+            view=view,
+            invoked_with=view.get_word(),
+            command=bot.get_command('shutdown'),
+        )
+
+        async with asyncio.timeout(1):
+            await bot.invoke(ctx)
+
+        close.assert_awaited_once_with()
+        assert not ctx.command_failed
+
+    async def test_metrics(self, mocker: MockerFixture, config: Config) -> None:
+        parent_invoke = mocker.patch('discord.ext.commands.bot.BotBase.invoke')
+        bot = Bot(config)
+
+        @bot.command()
+        async def ping(ctx: commands.Context[Bot]) -> None: ...
+
+        async def invoke(ctx: commands.Context[Bot]) -> None:
+            ctx.command_failed = ctx.invoked_with == 'fail'
+
+        parent_invoke.side_effect = invoke
+
+        for invoked_with in ('ping', 'ping', 'fail'):
+            await bot.invoke(
+                mocker.Mock(
+                    command=ping, invoked_with=invoked_with, command_failed=False
+                )
+            )
+
+        await bot.invoke(mocker.Mock(command=None, invoked_with='missing'))
+
+        exposed = bot.metrics.expose()
+
+        assert 'botus_command_invocations_total{command="ping"} 3' in exposed
+        assert 'botus_command_errors_total{command="ping"} 1' in exposed
+        assert 'botus_command_duration_seconds_count{command="ping"} 3' in exposed
+        assert 'missing' not in exposed
+        assert 'botus_guilds 0' in exposed
+        assert 'botus_shard_up{shard="0"} 0' in exposed
+        assert 'botus_http_cache_entries 0' in exposed
+
+    async def test_metrics_server(self, mocker: MockerFixture, config: Config) -> None:
+        start = mocker.patch('botus_receptus.metrics.MetricsServer.start')
+        close = mocker.patch('botus_receptus.metrics.MetricsServer.close')
+        mocker.patch(
+            'discord.ext.commands.bot.BotBase.close', new_callable=mocker.AsyncMock
+        )
+        config['metrics_port'] = 9100
+        bot = Bot(config)
+
+        assert bot.metrics_server is not None
+        assert bot.metrics_server.port == 9100
+        assert bot.metrics_server.registry is bot.metrics
+
+        await bot.setup_hook()
+        start.assert_awaited_once_with()
+
+        await bot.close()
+        close.assert_awaited_once_with()
+
+    def test_no_metrics_server(self, config: Config) -> None:
+        assert Bot(config).metrics_server is None
+
+    async def test_event_stats(self, mocker: MockerFixture, config: Config) -> None:
+        bot = Bot(config)
+        parsers = cast('Any', bot)._connection.parsers
+        parse = parsers['TYPING_START'] = mocker.Mock()
+
+        assert bot.event_stats is None
+
+        stats = bot.enable_event_stats()
+
+        assert bot.enable_event_stats() is stats
+        assert parsers['TYPING_START'] is not parse
+
+        parsers['TYPING_START']({'guild_id': '1'})
+        parse.assert_called_once_with({'guild_id': '1'})
+
+        listener = mocker.AsyncMock()
+        await bot._run_event(listener, 'on_typing', 1, key=2)
+        listener.assert_awaited_once_with(1, key=2)
+
+        assert [(entry.name, entry.count) for entry in stats.gateway.top()] == [
+            ('TYPING_START', 1)
+        ]
+        assert [(entry.name, entry.count) for entry in stats.listeners.top()] == [
+            ('on_typing', 1)
+        ]
+        assert (
+            'botus_gateway_events_total{event="TYPING_START",shard="0"} 1'
+            in bot.metrics.expose()
+        )
+
+        bot.disable_event_stats()
+
+        assert bot.event_stats is None
+        assert parsers['TYPING_START'] is parse
+
+        await bot._run_event(listener, 'on_typing')
+        assert stats.listeners.top()[0].count == 1
+
+    def test_event_stats_config(self, config: Config) -> None:
+        config['event_stats'] = True
+
+        assert Bot(config).event_stats is not None
+
+    async def test_loop_monitor(self, mocker: MockerFixture, config: Config) -> None:
+        mocker.patch(
+            'discord.ext.commands.bot.BotBase.close', new_callable=mocker.AsyncMock
+        )
+        config['loop_lag_threshold'] = 2.0
+        bot = Bot(config)
+
+        assert bot.loop_monitor is not None
+        assert bot.loop_monitor.threshold == 2.0
+        assert 'botus_loop_lag_seconds' in bot.metrics
+
+        await bot.setup_hook()
+
+        assert bot.loop_monitor.running
+        assert bot.loop_monitor.context is not None
+        assert bot.loop_monitor.context() == []
+
+        await bot.close()
+
+        assert not bot.loop_monitor.running
+
+    async def test_profile(self, config: Config, tmp_path: Path) -> None:
+        config['profile_interval'] = 0.001
+        bot = Bot(config)
+        task = asyncio.create_task(bot.profile(0.05, path=tmp_path / 'bot.collapsed'))
+        await asyncio.sleep(0)
+
+        assert bot.profiling
+
+        with pytest.raises(RuntimeError, match='already running'):
+            await bot.profile(0.01)
+
+        path = await task
+
+        assert path == tmp_path / 'bot.collapsed'
+        assert path.read_text()
+        assert not bot.profiling
+
+    async def test_profile_signal(
+        self, mocker: MockerFixture, config: Config, tmp_path: Path
+    ) -> None:
+        mocker.patch(
+            'discord.ext.commands.bot.BotBase.close', new_callable=mocker.AsyncMock
+        )
+        config['profile_signal'] = True
+        config['profile_seconds'] = 0.01
+        config['diagnostics_dir'] = str(tmp_path)
+        bot = Bot(config)
+
+        await bot.setup_hook()
+
+        signal.raise_signal(signal.SIGUSR1)
+
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+
+            if any(tmp_path.glob('botty-*.collapsed')):
+                break
+
+        assert [path.suffix for path in tmp_path.iterdir()] == ['.collapsed']
+
+        await bot.close()
+
+        assert not asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+
+    async def test_memory_snapshot(
+        self, mocker: MockerFixture, config: Config, tmp_path: Path
+    ) -> None:
+        mocker.patch(
+            'discord.ext.commands.bot.BotBase.close', new_callable=mocker.AsyncMock
+        )
+        config['memory_tracing'] = True
+        config['memory_signal'] = True
+        config['diagnostics_dir'] = str(tmp_path)
+        bot = Bot(config)
+
+        await bot.setup_hook()
+
+        assert bot.memory.tracing
+
+        path = await bot.memory_snapshot(path=tmp_path / 'first.memory.txt')
+        text = path.read_text()
+
+        assert (tmp_path / 'first.memory.tracemalloc').exists()
+
+        for probe in ('guilds', 'members', 'messages', 'views', 'pagers'):
+            assert probe in text
+
+        signal.raise_signal(signal.SIGUSR2)
+
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+
+            if any(tmp_path.glob('botty-*.memory.txt')):
+                break
+
+        (second,) = tmp_path.glob('botty-*.memory.txt')
+
+        assert 'Growth over the last' in second.read_text()
+
+        await bot.close()
+
+        assert not bot.memory.tracing
+        assert not asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR2)
+
+    async def test_memory_snapshot_untraced(
+        self, config: Config, tmp_path: Path
+    ) -> None:
+        bot = Bot(config)
+
+        path = await bot.memory_snapshot(path=tmp_path / 'memory.txt')
+
+        assert 'guilds' in path.read_text()
+        assert not bot.memory.tracing
+
+    async def test_diagnostics(self, config: Config) -> None:
+        config['admin_guild'] = 1
+        config['diagnostics_commands'] = True
+        bot = Bot(config)
+
+        await bot.setup_hook()
+
+        cog = bot.get_cog('Diagnostics')
+
+        assert cog is not None
+        assert {command.name for command in cog.walk_app_commands()} == {
+            'memory',
+            'profile',
+        }
+        assert bot.tree.get_command('debug') is None
+        assert bot.tree.get_command('debug', guild=discord.Object(id=1)) is not None
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, ClassVar, Self, cast, override
+
+import aiohttp
+import pytest
+from attrs import define, field
+
+from botus_receptus.botlists import BotStats, StatsPoster, StatsProvider
+
+if TYPE_CHECKING:
+    from unittest.mock import AsyncMock
+
+    from .types import MockerFixture
+
+
+@define
+class MockResponse:
+    status: int = 200
+    reason: str = 'OK'
+    headers: dict[str, str] = field(factory=dict)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+
+@define
+class ListProvider(StatsProvider):
+    name: ClassVar[str] = 'list'
+
+    @override
+    def get_url(self, bot_id: int, /) -> str:
+        return f'https://list.example/bots/{bot_id}'
+
+
+@define
+class OtherProvider(StatsProvider):
+    name: ClassVar[str] = 'other'
+
+    @override
+    def get_url(self, bot_id: int, /) -> str:
+        return f'https://other.example/{bot_id}/stats'
+
+    @override
+    def get_payload(self, stats: BotStats, /) -> dict[str, Any]:
+        return {'guilds': stats['server_count']}
+
+
+@pytest.fixture
+def mock_sleep(mocker: MockerFixture) -> AsyncMock:
+    return mocker.patch('asyncio.sleep')
+
+
+@pytest.fixture
+def session(mocker: MockerFixture) -> AsyncMock:
+    session = mocker.AsyncMock()
+    session.post.return_value = MockResponse()
+    return session
+
+
+@pytest.fixture
+def stats() -> BotStats:
+    return {'server_count': 5}
+
+
+@pytest.fixture
+def poster(stats: BotStats) -> StatsPoster:
+    async def get_stats() -> BotStats | None:
+        return stats
+
+    poster = StatsPoster(get_stats)
+    poster.add_provider(ListProvider('LIST_TOKEN', min_interval=0.0))
+    return poster
+
+
+async def test_providers(poster: StatsPoster) -> None:
+    with pytest.raises(ValueError, match='already registered'):
+        poster.add_provider(ListProvider('OTHER'))
+
+    poster.remove_provider('list')
+    poster.remove_provider('list')
+
+    assert poster.providers == {}
+
+
+async def test_tick(
+    poster: StatsPoster, session: AsyncMock, stats: BotStats, mocker: MockerFixture
+) -> None:
+    get_stats = mocker.AsyncMock(return_value=stats)
+    poster.get_stats = get_stats
+    poster.add_provider(OtherProvider('OTHER_TOKEN', min_interval=0.0))
+
+    assert await poster.tick(session, 12) == {'list': True, 'other': True}
+
+    get_stats.assert_awaited_once_with()
+    assert session.post.await_args_list == [
+        mocker.call(
+            'https://list.example/bots/12',
+            data='{"server_count":5}',
+            headers={'Content-Type': 'application/json', 'Authorization': 'LIST_TOKEN'},
+        ),
+        mocker.call(
+            'https://other.example/12/stats',
+            data='{"guilds":5}',
+            headers={
+                'Content-Type': 'application/json',
+                'Authorization': 'OTHER_TOKEN',
+            },
+        ),
+    ]
+
+    for provider in poster.providers.values():
+        assert provider.stats.posts == 1
+        assert provider.stats.attempts == 1
+        assert provider.stats.last_posted_at is not None
+        assert provider.stats.average_latency == provider.stats.total_latency
+
+
+async def test_tick_no_stats(poster: StatsPoster, session: AsyncMock) -> None:
+    async def get_stats() -> BotStats | None:
+        return None
+
+    poster.get_stats = get_stats
+
+    assert await poster.tick(session, 12) == {}
+    session.post.assert_not_awaited()
+
+
+async def test_skip_unchanged(
+    poster: StatsPoster, session: AsyncMock, stats: BotStats
+) -> None:
+    provider = poster.providers['list']
+
+    assert await poster.tick(session, 12) == {'list': True}
+    assert await poster.tick(session, 12) == {'list': False}
+    assert provider.stats.skipped == 1
+
+    stats['server_count'] = 6
+
+    assert await poster.tick(session, 12) == {'list': True}
+    assert session.post.await_count == 2
+
+
+async def test_rate_limit(
+    poster: StatsPoster, session: AsyncMock, stats: BotStats
+) -> None:
+    provider = poster.providers['list']
+    provider.min_interval = 60.0
+
+    assert await poster.tick(session, 12) == {'list': True}
+
+    stats['server_count'] = 6
+
+    assert await poster.tick(session, 12) == {'list': False}
+    assert provider.stats.skipped == 1
+
+    provider.retry_at = 0.0
+
+    assert await poster.tick(session, 12) == {'list': True}
+    assert session.post.await_count == 2
+
+
+async def test_retry(
+    poster: StatsPoster, session: AsyncMock, mock_sleep: AsyncMock
+) -> None:
+    provider = poster.providers['list']
+    session.post.side_effect = [
+        MockResponse(503, 'Service Unavailable'),
+        MockResponse(429, 'Too Many Requests', {'Retry-After': '5'}),
+        aiohttp.ClientConnectionError('reset'),
+        MockResponse(),
+    ]
+
+    assert await poster.tick(session, 12) == {'list': True}
+    assert session.post.await_count == 4
+    assert [call.args for call in mock_sleep.await_args_list] == [
+        (2.0,),
+        (5.0,),
+        (10.0,),
+    ]
+    assert provider.stats.attempts == 4
+    assert provider.stats.posts == 1
+    assert provider.stats.failures == 0
+    assert provider.stats.last_error is None
+
+
+async def test_retry_exhausted(
+    poster: StatsPoster, session: AsyncMock, mock_sleep: AsyncMock
+) -> None:
+    provider = poster.providers['list']
+    session.post.return_value = MockResponse(502, 'Bad Gateway')
+
+    assert await poster.tick(session, 12) == {'list': False}
+    assert session.post.await_count == poster.attempts
+    assert mock_sleep.await_count == poster.attempts - 1
+    assert provider.stats.failures == 1
+    assert provider.stats.last_error == '502 Bad Gateway'
+
+
+async def test_retry_after_too_long(
+    poster: StatsPoster, session: AsyncMock, mock_sleep: AsyncMock
+) -> None:
+    provider = poster.providers['list']
+    session.post.return_value = MockResponse(
+        429, 'Too Many Requests', {'Retry-After': '3600'}
+    )
+
+    assert await poster.tick(session, 12) == {'list': False}
+    assert await poster.tick(session, 12) == {'list': False}
+    session.post.assert_awaited_once()
+    mock_sleep.assert_not_awaited()
+    assert provider.stats.skipped == 1
+
+
+async def test_no_retry_client_error(
+    poster: StatsPoster, session: AsyncMock, mock_sleep: AsyncMock
+) -> None:
+    session.post.return_value = MockResponse(401, 'Unauthorized')
+
+    assert await poster.tick(session, 12) == {'list': False}
+    assert await poster.tick(session, 12) == {'list': False}
+    assert session.post.await_count == 2
+    mock_sleep.assert_not_awaited()
+
+
+async def test_timeout(poster: StatsPoster, session: AsyncMock) -> None:
+    provider = poster.providers['list']
+    provider.timeout = 0.01
+    poster.attempts = 1
+
+    async def post(*args: object, **kwargs: object) -> MockResponse:
+        await asyncio.sleep(1)
+        return MockResponse()
+
+    session.post.side_effect = post
+
+    assert await poster.tick(session, 12) == {'list': False}
+    assert provider.stats.last_error == 'TimeoutError()'
+
+
+async def test_start_stop(
+    poster: StatsPoster, session: AsyncMock, mocker: MockerFixture
+) -> None:
+    poster.interval = 0.01
+    tick = mocker.patch(
+        'botus_receptus.botlists.StatsPoster.tick', side_effect=[ValueError('bad'), {}]
+    )
+
+    poster.start(session, 12)
+    poster.start(session, 12)
+
+    assert poster.running
+
+    while tick.await_count < 2:
+        await asyncio.sleep(0.01)
+
+    await poster.stop()
+
+    assert not poster.running
+    tick.assert_awaited_with(session, 12)
+    cast('Any', poster)._task = None
+    await poster.stop()
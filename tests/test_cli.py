@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
 
@@ -8,7 +10,7 @@ import pytest
 from attrs import define
 from click.testing import CliRunner
 
-from botus_receptus import ConfigException, cli
+from botus_receptus import Bot, ConfigException, cli
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -307,3 +309,117 @@ def test_run_config_exception(
     assert result.exit_code == 2
     assert 'No section and stuff' in result.output
     mock_setup_logging.assert_not_called()
+
+
+def test_run_clusters(
+    mocker: MockerFixture,
+    cli_runner: CliRunner,
+    mock_bot_class: Mock,
+    mock_config: Config,
+    mock_run: Mock,
+) -> None:
+    fetch_shard_count = mocker.patch(
+        'botus_receptus.cluster.fetch_shard_count', new=mocker.Mock()
+    )
+    supervisor_class = mocker.patch('botus_receptus.cluster.ClusterSupervisor')
+    worker_target = mocker.patch('botus_receptus.cluster.worker_target')
+    mock_run.return_value = 4
+
+    with Path('config.toml').open('w') as f:
+        f.write('')
+
+    command = cli(cast('type[BotBase]', mock_bot_class), './config.toml')
+    result = cli_runner.invoke(command, ['--clusters=2'])
+
+    assert result.exit_code == 0
+    fetch_shard_count.assert_called_once_with('API_KEY')
+    mock_run.assert_called_once_with(fetch_shard_count.return_value)
+    worker_target.assert_called_once_with(mock_bot_class, discord.utils.MISSING)
+    supervisor_class.assert_called_once_with(
+        worker_target.return_value, mocker.ANY, 4, 2, stop_timeout=70.0
+    )
+    assert supervisor_class.call_args[0][1] == mock_config | {'ipc_dir': mocker.ANY}
+    supervisor_class.return_value.run.assert_called_once_with()
+    mock_bot_class.assert_not_called()
+
+
+def test_run_clusters_shutdown_timeout(
+    mocker: MockerFixture,
+    cli_runner: CliRunner,
+    mock_bot_class: Mock,
+    mock_config: Config,
+    mock_run: Mock,
+) -> None:
+    mocker.patch('botus_receptus.cluster.fetch_shard_count', new=mocker.Mock())
+    mocker.patch('botus_receptus.cluster.worker_target')
+    supervisor_class = mocker.patch('botus_receptus.cluster.ClusterSupervisor')
+    mock_config['shutdown_timeout'] = 5
+    mock_run.return_value = 4
+
+    with Path('config.toml').open('w') as f:
+        f.write('')
+
+    command = cli(cast('type[BotBase]', mock_bot_class), './config.toml')
+    result = cli_runner.invoke(command, ['--clusters=2'])
+
+    assert result.exit_code == 0
+    assert supervisor_class.call_args.kwargs['stop_timeout'] == 20
+
+
+def test_run_clusters_unsharded(
+    mocker: MockerFixture, cli_runner: CliRunner, mock_run: Mock
+) -> None:
+    supervisor_class = mocker.patch('botus_receptus.cluster.ClusterSupervisor')
+
+    with Path('config.toml').open('w') as f:
+        f.write('')
+
+    command = cli(Bot, './config.toml')
+    result = cli_runner.invoke(command, ['--clusters=2'])
+
+    assert result.exit_code == 2
+    assert 'must be an AutoShardedBot' in result.output
+    mock_run.assert_not_called()
+    supervisor_class.assert_not_called()
+
+
+def test_run_profile(
+    cli_runner: CliRunner,
+    mock_bot_class: Mock,
+    mock_bot_class_instance: MockBot,
+    mock_run: Mock,
+) -> None:
+    with Path('config.toml').open('w') as f:
+        f.write('')
+
+    async def start_with_config() -> None:
+        total = 0
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            total += 1
+
+    mock_bot_class_instance.start_with_config.side_effect = start_with_config
+    mock_run.side_effect = asyncio.run
+
+    command = cli(cast('type[BotBase]', mock_bot_class), './config.toml')
+    result = cli_runner.invoke(command, ['--profile=out/bot.collapsed'])
+
+    assert result.exit_code == 0
+    lines = Path('out/bot.collapsed').read_text().splitlines()
+    assert any(
+        line.startswith('task ') and '.start_with_config ' in line for line in lines
+    )
+
+
+def test_run_profile_clusters(
+    cli_runner: CliRunner, mock_bot_class: Mock, mock_run: Mock
+) -> None:
+    with Path('config.toml').open('w') as f:
+        f.write('')
+
+    command = cli(cast('type[BotBase]', mock_bot_class), './config.toml')
+    result = cli_runner.invoke(command, ['--clusters=2', '--profile=bot.collapsed'])
+
+    assert result.exit_code == 2
+    assert '--profile cannot be used with --clusters' in result.output
+    mock_run.assert_not_called()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+import discord
+import pytest
+
+from botus_receptus.cluster import ClusterSupervisor, split_shards, worker_target
+
+if TYPE_CHECKING:
+    from botus_receptus.bot import BotBase
+    from botus_receptus.config import Config
+
+
+class ShardedBot(discord.AutoShardedClient):
+    config: Config
+    kwargs: dict[str, Any]
+
+    def __init__(self, config: Config, /, **kwargs: Any) -> None:
+        self.config = config
+        self.kwargs = kwargs
+
+    async def start_with_config(self) -> None:
+        Path(self.config['logging']['log_file']).with_suffix('.started').write_text(
+            json.dumps(self.kwargs)
+        )
+
+
+def _crash_once(config: Config, shard_ids: list[int], shard_count: int) -> None:
+    marker = Path(config['logging']['log_file'])
+
+    if not marker.exists():
+        marker.write_text(f'{config.get("cluster_id")} {shard_ids} {shard_count}')
+        sys.exit(1)
+
+
+def _sleep(config: Config, shard_ids: list[int], shard_count: int) -> None:
+    time.sleep(60)
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Config:
+    return {
+        'bot_name': 'botty',
+        'discord_api_key': 'API_KEY',
+        'application_id': 1,
+        'intents': discord.Intents.none(),
+        'logging': {
+            'log_file': str(tmp_path / 'botty.log'),
+            'log_level': 'info',
+            'log_to_console': False,
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    'shard_count,clusters,expected',
+    [
+        (1, 1, [[0]]),
+        (4, 2, [[0, 1], [2, 3]]),
+        (5, 2, [[0, 1, 2], [3, 4]]),
+        (2, 4, [[0], [1]]),
+    ],
+)
+def test_split_shards(
+    shard_count: int, clusters: int, expected: list[list[int]]
+) -> None:
+    assert split_shards(shard_count, clusters) == expected
+
+
+def test_supervisor_restarts(config: Config, tmp_path: Path) -> None:
+    supervisor = ClusterSupervisor(
+        _crash_once,
+        config,
+        3,
+        2,
+        context=multiprocessing.get_context('spawn'),
+        backoff_base=0.01,
+    )
+
+    supervisor.run()
+
+    assert [worker.restarts for worker in supervisor.workers] == [1, 1]
+    assert (tmp_path / 'botty.0.log').read_text() == '0 [0, 1] 3'
+    assert (tmp_path / 'botty.1.log').read_text() == '1 [2] 3'
+
+
+def test_worker_target(config: Config, tmp_path: Path) -> None:
+    supervisor = ClusterSupervisor(
+        worker_target(cast('type[BotBase]', ShardedBot), discord.utils.MISSING),
+        config,
+        2,
+        2,
+        context=multiprocessing.get_context('spawn'),
+    )
+
+    supervisor.run()
+
+    assert [worker.restarts for worker in supervisor.workers] == [0, 0]
+    assert (tmp_path / 'botty.0.log').exists()
+    assert json.loads((tmp_path / 'botty.1.started').read_text()) == {
+        'shard_ids': [1],
+        'shard_count': 2,
+    }
+
+
+def test_worker_target_unsharded() -> None:
+    with pytest.raises(TypeError, match='must be an AutoShardedBot'):
+        worker_target(cast('type[BotBase]', discord.Client))
+
+
+def test_supervisor_sigterm(config: Config) -> None:
+    supervisor = ClusterSupervisor(
+        _sleep, config, 1, 1, context=multiprocessing.get_context('spawn')
+    )
+    timer = threading.Timer(1, os.kill, (os.getpid(), signal.SIGTERM))
+    timer.start()
+
+    try:
+        supervisor.run()
+    finally:
+        timer.cancel()
+
+    assert not supervisor.workers[0].alive
+    assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from botus_receptus.events import EventStats, RollingTotals, get_shard_id
+from botus_receptus.metrics import Registry
+
+if TYPE_CHECKING:
+    from unittest.mock import Mock
+
+    from .types import MockerFixture
+
+
+@pytest.fixture
+def monotonic(mocker: MockerFixture) -> Mock:
+    return mocker.patch('time.monotonic', return_value=0.0)
+
+
+@pytest.mark.parametrize(
+    'event,data,shard_count,expected',
+    [
+        ('MESSAGE_CREATE', {'guild_id': str(5 << 22)}, 4, 1),
+        ('MESSAGE_CREATE', {'guild_id': str(5 << 22)}, 1, 0),
+        ('MESSAGE_CREATE', {'channel_id': '1'}, 4, 0),
+        ('GUILD_CREATE', {'id': str(7 << 22)}, 4, 3),
+        ('CHANNEL_CREATE', {'id': str(7 << 22)}, 4, 0),
+        ('RESUMED', None, 4, 0),
+    ],
+)
+def test_get_shard_id(
+    event: str, data: object, shard_count: int, expected: int
+) -> None:
+    assert get_shard_id(event, data, shard_count) == expected
+
+
+def test_rolling_totals(monotonic: Mock) -> None:
+    totals = RollingTotals(window=10.0, windows=3)
+    totals.record('MESSAGE_CREATE', 0.5)
+    totals.record('MESSAGE_CREATE', 0.25)
+    totals.record('PRESENCE_UPDATE', 0.1)
+
+    monotonic.return_value = 15.0
+    totals.record('PRESENCE_UPDATE', 0.1)
+    totals.record('PRESENCE_UPDATE', 0.1)
+    totals.record('PRESENCE_UPDATE', 0.1)
+
+    assert [(entry.name, entry.count) for entry in totals.top()] == [
+        ('MESSAGE_CREATE', 2),
+        ('PRESENCE_UPDATE', 4),
+    ]
+    assert [entry.name for entry in totals.top(1, by='count')] == ['PRESENCE_UPDATE']
+    assert totals.top()[0].average_time == pytest.approx(0.375)
+
+    monotonic.return_value = 35.0
+
+    assert [(entry.name, entry.count) for entry in totals.top()] == [
+        ('PRESENCE_UPDATE', 3)
+    ]
+
+    totals.clear()
+
+    assert totals.top() == []
+
+
+def test_event_stats(monotonic: Mock) -> None:
+    registry = Registry()
+    stats = EventStats()
+    stats.record_gateway('MESSAGE_CREATE', 0, 0.5)
+    stats.register_metrics(registry)
+    stats.record_gateway('MESSAGE_CREATE', 1, 0.25)
+    stats.record_listener('on_message', 0.75)
+
+    exposed = registry.expose()
+
+    assert 'botus_gateway_events_total{event="MESSAGE_CREATE",shard="1"} 1' in exposed
+    assert 'botus_gateway_event_seconds_total{event="MESSAGE_CREATE"} 0.25' in exposed
+    assert 'botus_event_listener_calls_total{event="on_message"} 1' in exposed
+    assert 'botus_event_listener_seconds_total{event="on_message"} 0.75' in exposed
+
+    report = stats.report().splitlines()
+
+    assert report[0] == 'Gateway events (last 600s):'
+    assert report[1].split() == ['MESSAGE_CREATE', '2', '750.0ms', '375.000ms/event']
+    assert report[2] == 'Listeners (last 600s):'
+    assert report[3].split()[:2] == ['on_message', '1']
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import aiohttp
+import discord
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from botus_receptus.http import HTTPStats, ResponseCache, _get_max_age, create_session
+from botus_receptus.metrics import Registry
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+    from botus_receptus.config import Config
+
+    from .types import MockerFixture
+
+
+@pytest.fixture
+def config() -> Config:
+    return {
+        'bot_name': 'botty',
+        'discord_api_key': 'API_KEY',
+        'application_id': 1,
+        'intents': discord.Intents.none(),
+        'logging': {'log_file': '', 'log_level': '', 'log_to_console': False},
+    }
+
+
+@pytest.fixture
+async def server() -> AsyncGenerator[TestServer]:
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+
+    server = TestServer(app)
+    await server.start_server()
+
+    yield server
+
+    await server.close()
+
+
+async def test_create_session_defaults(config: Config) -> None:
+    async with create_session(config) as session:
+        assert isinstance(session.connector, aiohttp.TCPConnector)
+        assert session.connector.limit == 100
+        assert session.connector.limit_per_host == 0
+        assert session.timeout == aiohttp.ClientTimeout(total=5 * 60, sock_connect=30)
+
+
+async def test_create_session_config(mocker: MockerFixture, config: Config) -> None:
+    connector = mocker.patch('aiohttp.TCPConnector', wraps=aiohttp.TCPConnector)
+    config['http_limit'] = 50
+    config['http_limit_per_host'] = 20
+    config['http_dns_cache_ttl'] = 600
+    config['http_keepalive_timeout'] = 30
+    config['http_read_timeout'] = 10
+
+    async with create_session(config) as session:
+        assert session.connector is not None
+        assert session.connector.limit == 50
+        assert session.connector.limit_per_host == 20
+        connector.assert_called_once_with(
+            limit=50, limit_per_host=20, ttl_dns_cache=600, keepalive_timeout=30
+        )
+        assert session.timeout == aiohttp.ClientTimeout(
+            total=5 * 60, sock_connect=30, sock_read=10
+        )
+
+
+async def test_http_stats(config: Config, server: TestServer) -> None:
+    stats = HTTPStats()
+
+    async with create_session(config, trace_configs=[stats.trace_config()]) as session:
+        for _ in range(3):
+            async with session.get(server.make_url('/')) as response:
+                await response.json()
+
+    assert stats.connections_created == 1
+    assert stats.connections_reused == 2
+    assert stats.reuse_ratio == pytest.approx(2 / 3)
+
+    host = stats.snapshot()['hosts'][server.host]
+    assert host.requests == 3
+    assert host.errors == 0
+    assert 0 < host.average_time <= host.max_time
+
+
+async def test_http_stats_metrics(config: Config, server: TestServer) -> None:
+    stats = HTTPStats()
+    cache = ResponseCache()
+    registry = Registry()
+    stats.register_metrics(registry)
+    cache.register_metrics(registry)
+
+    async with create_session(config, trace_configs=[stats.trace_config()]) as session:
+        for _ in range(2):
+            async with session.get(server.make_url('/')) as response:
+                await response.json()
+
+        await cache.fetch(session, str(server.make_url('/cached')))
+
+    exposed = registry.expose()
+
+    assert 'botus_http_connections_total{state="created"} 1' in exposed
+    assert 'botus_http_connections_total{state="reused"} 2' in exposed
+    assert f'botus_http_requests_total{{host="{server.host}"}} 3' in exposed
+    assert f'botus_http_request_errors_total{{host="{server.host}"}} 0' in exposed
+    assert (
+        f'botus_http_request_duration_seconds_count{{host="{server.host}"}} 3'
+        in exposed
+    )
+    assert 'botus_http_cache_entries 1' in exposed
+    assert 'botus_http_cache_lookups_total{result="miss"} 1' in exposed
+
+
+async def test_http_stats_error(config: Config) -> None:
+    stats = HTTPStats()
+
+    async with create_session(config, trace_configs=[stats.trace_config()]) as session:
+        with pytest.raises(aiohttp.ClientError):
+            await session.get('http://127.0.0.1:1/')
+
+    assert stats.hosts['127.0.0.1'].errors == 1
+
+
+@pytest.fixture
+async def cache_server() -> AsyncGenerator[tuple[TestServer, list[web.Request]]]:
+    requests: list[web.Request] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304, headers={'Cache-Control': 'max-age=60'})
+
+        return web.json_response(
+            {'path': request.path},
+            headers={
+                'ETag': '"v1"',
+                'Cache-Control': request.query.get('cache', 'max-age=60'),
+            },
+        )
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+
+    server = TestServer(app)
+    await server.start_server()
+
+    yield server, requests
+
+    await server.close()
+
+
+async def test_response_cache(
+    config: Config, cache_server: tuple[TestServer, list[web.Request]]
+) -> None:
+    server, requests = cache_server
+    cache = ResponseCache()
+    url = str(server.make_url('/fresh'))
+
+    async with create_session(config) as session:
+        responses = await asyncio.gather(*(cache.fetch(session, url) for _ in range(3)))
+        assert len(requests) == 1
+        assert all(response.json() == {'path': '/fresh'} for response in responses)
+
+        await cache.fetch(session, url)
+        assert len(requests) == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+
+async def test_response_cache_revalidate(
+    config: Config, cache_server: tuple[TestServer, list[web.Request]]
+) -> None:
+    server, requests = cache_server
+    cache = ResponseCache()
+    url = str(server.make_url('/revalidate').with_query(cache='no-cache'))
+
+    async with create_session(config) as session:
+        first = await cache.fetch(session, url)
+        assert not first.fresh
+
+        second = await cache.fetch(session, url)
+        assert requests[1].headers['If-None-Match'] == '"v1"'
+        assert second.status == 200
+        assert second.body == first.body
+        assert second.fresh
+        assert cache.revalidations == 1
+
+        await cache.fetch(session, url)
+        assert len(requests) == 2
+
+
+async def test_response_cache_no_store(
+    config: Config, cache_server: tuple[TestServer, list[web.Request]]
+) -> None:
+    server, requests = cache_server
+    cache = ResponseCache()
+    url = str(server.make_url('/').with_query(cache='no-store'))
+
+    async with create_session(config) as session:
+        await cache.fetch(session, url)
+        await cache.fetch(session, url)
+
+    assert len(requests) == 2
+    assert len(cache) == 0
+
+
+async def test_response_cache_lru(
+    config: Config, cache_server: tuple[TestServer, list[web.Request]]
+) -> None:
+    server, requests = cache_server
+    cache = ResponseCache(2)
+
+    async with create_session(config) as session:
+        for path in ('/a', '/b', '/a', '/c', '/a', '/b'):
+            await cache.fetch(session, str(server.make_url(path)))
+
+    assert [request.path for request in requests] == ['/a', '/b', '/c', '/b']
+    assert len(cache) == 2
+
+
+async def test_response_cache_disk(
+    config: Config,
+    cache_server: tuple[TestServer, list[web.Request]],
+    tmp_path: Path,
+) -> None:
+    server, requests = cache_server
+    url = str(server.make_url('/disk'))
+
+    async with create_session(config) as session:
+        await ResponseCache(directory=tmp_path).fetch(session, url)
+
+        cache = ResponseCache(directory=tmp_path)
+        response = await cache.fetch(session, url)
+
+    assert len(requests) == 1
+    assert response.json() == {'path': '/disk'}
+    assert cache.hits == 1
+
+
+async def test_response_cache_headers(
+    config: Config, cache_server: tuple[TestServer, list[web.Request]]
+) -> None:
+    server, requests = cache_server
+    cache = ResponseCache()
+    url = str(server.make_url('/private'))
+
+    async with create_session(config) as session:
+        await asyncio.gather(
+            cache.fetch(session, url, headers={'Authorization': 'one'}),
+            cache.fetch(session, url, headers={'Authorization': 'two'}),
+        )
+        await cache.fetch(session, url, headers={'authorization': 'one'})
+
+    assert sorted(request.headers['Authorization'] for request in requests) == [
+        'one',
+        'two',
+    ]
+    assert len(cache) == 2
+    assert cache.hits == 1
+
+
+async def test_response_cache_disk_size(
+    config: Config,
+    cache_server: tuple[TestServer, list[web.Request]],
+    tmp_path: Path,
+) -> None:
+    server, _ = cache_server
+    cache = ResponseCache(directory=tmp_path, disk_maxsize=2)
+
+    async with create_session(config) as session:
+        for path in ('/a', '/b', '/c'):
+            await cache.fetch(session, str(server.make_url(path)))
+
+    assert len(list(tmp_path.glob('*.json'))) == 2
+
+
+@pytest.mark.parametrize(
+    'headers,expected',
+    [
+        ({'Cache-Control': 'max-age=60', 'Age': 'bogus'}, 60.0),
+        ({'Cache-Control': 'max-age=60', 'Age': '10'}, 50.0),
+        ({'Cache-Control': 'max-age=60', 'Vary': '*'}, None),
+        ({'Cache-Control': 'no-store'}, None),
+        ({'Cache-Control': 'no-cache'}, 0.0),
+    ],
+)
+def test_get_max_age(headers: dict[str, str], expected: float | None) -> None:
+    assert _get_max_age(headers) == expected
@@ -265,12 +265,16 @@ class TestInteractivePager:
         event_loop = asyncio.get_running_loop()
         p = InteractivePager[int].create(cast('Any', context), fetcher)
 
+        active = InteractivePager.active_count()
+
         assert p.paginating
         event_loop.create_task(p.paginate())  # noqa: RUF006
         await advance_time(70)
         assert p.paginating
+        assert InteractivePager.active_count() == active + 1
         await advance_time(125)
         assert not p.paginating
+        assert InteractivePager.active_count() == active
         page = await fetcher.get_page(1)
         assert p.embed.description == '\n'.join(
             [
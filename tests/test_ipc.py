@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from botus_receptus.ipc import IPCBus, IPCError, IPCRemoteError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+
+@pytest.fixture
+async def buses(tmp_path: Path) -> AsyncGenerator[list[IPCBus]]:
+    buses = [IPCBus(tmp_path, cluster_id, 3) for cluster_id in range(2)]
+
+    for bus in buses:
+
+        async def guild_count(data: Any, /, *, bus: IPCBus = bus) -> int:
+            return (bus.cluster_id + 1) * 10
+
+        async def slow(data: Any, /) -> None:
+            await asyncio.sleep(1)
+
+        async def fail(data: Any, /) -> None:
+            raise ValueError('broken')
+
+        bus.add_handler('guild_count', guild_count)
+        bus.add_handler('slow', slow)
+        bus.add_handler('fail', fail)
+        await bus.start()
+
+    yield buses
+
+    for bus in buses:
+        await bus.close()
+
+
+async def test_request(buses: list[IPCBus]) -> None:
+    assert await buses[0].request(1, 'guild_count') == 20
+    assert await buses[0].request(0, 'guild_count') == 10
+    assert (
+        await asyncio.gather(*(buses[1].request(0, 'guild_count') for _ in range(5)))
+        == [10] * 5
+    )
+
+
+async def test_request_errors(buses: list[IPCBus]) -> None:
+    with pytest.raises(IPCRemoteError, match='broken'):
+        await buses[0].request(1, 'fail')
+
+    with pytest.raises(IPCRemoteError, match='No IPC handler'):
+        await buses[0].request(1, 'missing')
+
+    with pytest.raises(IPCError, match='not reachable'):
+        await buses[0].request(2, 'guild_count')
+
+    with pytest.raises(TimeoutError):
+        await buses[0].request(1, 'slow', timeout=0.01)
+
+    assert await buses[0].request(1, 'guild_count') == 20
+
+
+async def test_broadcast(buses: list[IPCBus]) -> None:
+    assert await buses[1].broadcast('guild_count') == {0: 10, 1: 20}
+    assert await buses[1].broadcast('guild_count', include_self=False) == {0: 10}
+    assert await buses[0].aggregate('guild_count', sum) == 30
+
+
+def test_add_handler_twice(tmp_path: Path) -> None:
+    async def handler(data: Any, /) -> None: ...
+
+    bus = IPCBus(tmp_path, 0, 1)
+    bus.add_handler('handler', handler)
+
+    with pytest.raises(ValueError, match='already registered'):
+        bus.add_handler('handler', handler)
+
+
+async def test_close_concurrently(buses: list[IPCBus]) -> None:
+    assert await buses[0].request(1, 'guild_count') == 20
+    assert await buses[1].request(0, 'guild_count') == 10
+
+    async with asyncio.timeout(1):
+        await asyncio.gather(*(bus.close() for bus in buses))
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import pytest
+
+from botus_receptus.memory import MemoryTracker
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def tracker() -> Iterator[MemoryTracker]:
+    tracker = MemoryTracker(limit=10)
+    yield tracker
+    tracker.stop()
+
+
+def _allocate(count: int, /) -> list[bytes]:
+    return [bytes(1024) for _ in range(count)]
+
+
+def test_snapshot(tracker: MemoryTracker, tmp_path: Path) -> None:
+    sizes = {'widgets': 3}
+    tracker.add_probe('widgets', lambda: sizes['widgets'])
+    tracker.add_probe('removed', lambda: 0)
+    tracker.remove_probe('removed')
+
+    first = tracker.snapshot(dump=tmp_path / 'first.tracemalloc')
+
+    assert tracker.tracing
+    assert first.sizes == {'widgets': 3}
+    assert first.growth is None
+    assert tracemalloc.Snapshot.load(str(tmp_path / 'first.tracemalloc'))
+
+    retained = _allocate(200)
+    sizes['widgets'] = 5
+    second = tracker.snapshot()
+
+    assert second.sizes == {'widgets': 5}
+    assert second.growth is not None
+    assert second.interval is not None
+    assert second.current >= len(retained) * 1024
+    assert any(
+        stat.traceback[0].filename == __file__ and stat.size_diff >= 200 * 1024
+        for stat in second.growth
+    )
+
+    path = tmp_path / 'reports' / 'memory.txt'
+    second.write(path)
+    text = path.read_text()
+
+    assert 'widgets' in text
+    assert 'Growth over the last' in text
+    assert f'{__file__}:' in text
+
+    tracker.stop()
+
+    assert not tracker.tracing
+
+
+def test_stop_tracing(tracker: MemoryTracker) -> None:
+    report = tracker.snapshot(stop_tracing=True)
+
+    assert report.growth is None
+    assert not tracker.tracing
+    assert tracker.snapshot(stop_tracing=True).growth is None
+
+
+def test_already_tracing(tracker: MemoryTracker) -> None:
+    tracemalloc.start()
+
+    try:
+        tracker.snapshot(stop_tracing=True)
+
+        assert tracemalloc.is_tracing()
+
+        tracker.stop()
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import textwrap
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+
+from botus_receptus.metrics import MetricsServer, Registry
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+
+def test_counter() -> None:
+    registry = Registry()
+    counter = registry.counter('requests_total', 'Requests', ('route',))
+    counter.labels('/').inc()
+    counter.labels('/').inc(2)
+    counter.labels('/a"b').inc()
+
+    assert registry.counter('requests_total', 'Requests', ('route',)) is counter
+    assert 'requests_total' in registry
+    assert registry.get('requests_total') is counter
+    assert registry.expose() == textwrap.dedent(
+        """\
+        # HELP requests_total Requests
+        # TYPE requests_total counter
+        requests_total{route="/"} 3
+        requests_total{route="/a\\"b"} 1
+        """
+    )
+
+    with pytest.raises(ValueError, match='positive'):
+        counter.labels('/').inc(-1)
+
+    with pytest.raises(ValueError, match='expects labels'):
+        counter.labels('/', 'extra')
+
+    with pytest.raises(ValueError, match='already registered as a counter'):
+        registry.gauge('requests_total', 'Requests')
+
+    counter.remove('/a"b')
+
+    assert 'a\\"b' not in registry.expose()
+
+
+def test_gauge() -> None:
+    registry = Registry()
+    gauge = registry.gauge('temperature', 'Temperature')
+    gauge.set(1.5)
+    gauge.labels().inc(2)
+    gauge.labels().dec()
+
+    assert registry.expose().endswith('temperature 2.5\n')
+
+    values = [3, 4]
+    gauge.set_function(values.pop)
+
+    assert registry.expose().endswith('temperature 4\n')
+    assert registry.expose().endswith('temperature 3\n')
+
+    gauge.clear()
+
+    assert registry.expose() == (
+        '# HELP temperature Temperature\n# TYPE temperature gauge\n'
+    )
+
+
+def test_histogram() -> None:
+    registry = Registry()
+    histogram = registry.histogram('latency', 'Latency', buckets=(1.0, 0.1))
+
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.buckets == (0.1, 1.0)
+    assert registry.expose() == textwrap.dedent(
+        """\
+        # HELP latency Latency
+        # TYPE latency histogram
+        latency_bucket{le="0.1"} 2
+        latency_bucket{le="1"} 3
+        latency_bucket{le="+Inf"} 4
+        latency_sum 5.65
+        latency_count 4
+        """
+    )
+
+
+def test_collectors() -> None:
+    registry = Registry()
+    gauge = registry.gauge('items', 'Items', ('kind',))
+    items = {'a': 1, 'b': 2}
+
+    def collect() -> None:
+        for kind, count in items.items():
+            gauge.labels(kind).set(count)
+
+    registry.add_collector(collect)
+
+    assert 'items{kind="b"} 2' in registry.expose()
+
+    items['b'] = 5
+    registry.remove_collector(collect)
+    registry.remove_collector(collect)
+
+    assert 'items{kind="b"} 2' in registry.expose()
+
+
+@pytest.fixture
+async def server() -> AsyncGenerator[MetricsServer]:
+    registry = Registry()
+    registry.counter('hits_total', 'Hits').inc()
+    server = MetricsServer(registry, '127.0.0.1', 0)
+    await server.start()
+
+    yield server
+
+    await server.close()
+    await server.close()
+
+
+async def test_server(server: MetricsServer) -> None:
+    host, port = server.addresses[0]
+
+    async with (
+        aiohttp.ClientSession() as session,
+        session.get(f'http://{host}:{port}/metrics') as resp,
+    ):
+        assert resp.status == 200
+        assert resp.headers['Content-Type'] == (
+            'text/plain; version=0.0.4; charset=utf-8'
+        )
+        assert await resp.text() == server.registry.expose()
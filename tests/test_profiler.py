@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from botus_receptus.profiler import SamplingProfiler
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _spin(seconds: float, /) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def test_profile(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(0.001)
+    profiler.start()
+
+    assert profiler.running
+
+    with pytest.raises(RuntimeError, match='already running'):
+        profiler.start()
+
+    await asyncio.sleep(0.01)
+    _spin(0.1)
+    profile = profiler.stop()
+
+    assert not profiler.running
+    assert profile.total > 0
+    assert profile.duration >= 0.1
+    assert any(
+        stack.startswith('task ') and stack.endswith(':_spin')
+        for stack in profile.samples
+    )
+    assert profile.top(1)[0][0] == 'tests.test_profiler:_spin'
+
+    path = tmp_path / 'profiles' / 'bot.collapsed'
+    profile.write(path)
+    lines = path.read_text().splitlines()
+
+    assert len(lines) == len(profile.samples)
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == profile.total
+
+    with pytest.raises(RuntimeError, match='not running'):
+        profiler.stop()
+
+
+def test_profile_thread() -> None:
+    profiler = SamplingProfiler(0.001)
+    profiler.start()
+    _spin(0.05)
+    profile = profiler.stop()
+
+    assert profile.total > 0
+    assert all(stack.startswith('thread;') for stack in profile.samples)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+
+from botus_receptus.shutdown import InvocationTracker, run_shutdown_tasks
+
+
+async def test_track() -> None:
+    tracker = InvocationTracker()
+
+    with tracker.track('one'), tracker.track('two'):
+        assert len(tracker) == 2
+        assert tracker.running == ['one', 'two']
+
+    assert len(tracker) == 0
+
+
+async def test_drain() -> None:
+    tracker = InvocationTracker()
+    release = asyncio.Event()
+
+    async def invoke(name: str, /) -> None:
+        with tracker.track(name):
+            await release.wait()
+
+    task = asyncio.create_task(invoke('one'))
+    await asyncio.sleep(0)
+
+    drain = asyncio.create_task(tracker.drain(1))
+    await asyncio.sleep(0)
+
+    assert not tracker.accepting
+    assert not drain.done()
+
+    release.set()
+
+    assert await drain == []
+    await task
+
+
+async def test_drain_deadline() -> None:
+    tracker = InvocationTracker()
+
+    async def invoke(name: str, /) -> None:
+        with tracker.track(name):
+            await asyncio.sleep(1)
+
+    task = asyncio.create_task(invoke('slow'))
+    await asyncio.sleep(0)
+
+    assert await tracker.drain(0.01) == ['slow']
+
+    task.cancel()
+
+
+async def test_drain_current_task() -> None:
+    tracker = InvocationTracker()
+
+    with tracker.track('shutdown'):
+        assert await tracker.drain(1) == []
+
+
+async def test_run_shutdown_tasks() -> None:
+    events: list[str] = []
+
+    async def close(name: str, /) -> None:
+        events.append(f'start {name}')
+        await asyncio.sleep(0)
+        events.append(f'end {name}')
+
+    async def slow() -> None:
+        await asyncio.sleep(1)
+
+    async def fail() -> None:
+        raise RuntimeError
+
+    unfinished = await run_shutdown_tasks(
+        {
+            'pool': lambda: close('pool'),
+            'session': lambda: close('session'),
+            'slow': slow,
+            'fail': fail,
+        },
+        0.01,
+    )
+
+    assert unfinished == ['slow', 'fail']
+    assert events == ['start pool', 'start session', 'end pool', 'end session']
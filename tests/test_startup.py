@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import graphlib
+
+import pytest
+
+from botus_receptus.startup import StartupPhase, run_phases, timeline
+
+
+def _phase(
+    name: str, events: list[str], /, *, after: tuple[str, ...] = ()
+) -> StartupPhase:
+    async def func() -> None:
+        events.append(f'start {name}')
+        await asyncio.sleep(0)
+        events.append(f'end {name}')
+
+    return StartupPhase(name, func, frozenset(after))
+
+
+async def test_run_phases() -> None:
+    events: list[str] = []
+    phases = [
+        _phase('sync', events, after=('extensions',)),
+        _phase('pool', events),
+        _phase('extensions', events, after=('pool', 'session')),
+        _phase('session', events),
+    ]
+
+    await run_phases(phases)
+
+    assert events == [
+        'start pool',
+        'start session',
+        'end pool',
+        'end session',
+        'start extensions',
+        'end extensions',
+        'start sync',
+        'end sync',
+    ]
+    assert all(phase.ok for phase in phases)
+    assert [phase.name for phase in timeline(phases)] == [
+        'pool',
+        'session',
+        'extensions',
+        'sync',
+    ]
+
+    for phase in phases:
+        assert phase.duration is not None
+        assert phase.duration >= 0
+
+
+async def test_run_phases_error() -> None:
+    events: list[str] = []
+    error = RuntimeError()
+
+    async def fail() -> None:
+        raise error
+
+    phases = [
+        StartupPhase('pool', fail),
+        _phase('session', events),
+        _phase('extensions', events, after=('pool',)),
+    ]
+
+    with pytest.raises(RuntimeError) as excinfo:
+        await run_phases(phases)
+
+    assert excinfo.value is error
+    assert events == ['start session', 'end session']
+    assert phases[0].error is error
+    assert phases[1].ok
+    assert phases[2].skipped
+    assert phases[2].duration is None
+    assert timeline(phases)[-1] is phases[2]
+
+
+async def test_run_phases_unknown_dependency() -> None:
+    with pytest.raises(ValueError, match="unknown phase 'pool'"):
+        await run_phases([_phase('sync', [], after=('pool',))])
+
+
+async def test_run_phases_cycle() -> None:
+    events: list[str] = []
+
+    with pytest.raises(graphlib.CycleError):
+        await run_phases(
+            [_phase('a', events, after=('b',)), _phase('b', events, after=('a',))]
+        )
+
+    assert events == []
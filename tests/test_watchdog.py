@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from botus_receptus.metrics import Registry
+from botus_receptus.watchdog import LoopMonitor
+
+
+def _block(seconds: float, /) -> None:
+    time.sleep(seconds)
+
+
+async def test_stall() -> None:
+    registry = Registry()
+    monitor = LoopMonitor(0.01, 0.1, context=lambda: ['ping'])
+    monitor.register_metrics(registry)
+    monitor.start()
+    monitor.start()
+
+    assert monitor.running
+
+    await asyncio.sleep(0.05)
+    _block(0.3)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert not monitor.running
+    assert monitor.last_stall is not None
+    assert monitor.last_stall.lag >= 0.1
+    assert monitor.last_stall.running[0] == 'ping'
+    assert monitor.last_stall.running[1].startswith('task ')
+    assert '_block' in monitor.last_stall.stack
+
+    percentiles = monitor.percentiles()
+
+    assert percentiles[0.99] >= percentiles[0.5] >= 0
+    assert percentiles[0.99] >= 0.1
+
+    exposed = registry.expose()
+
+    assert 'botus_loop_stalls_total 1' in exposed
+    assert 'botus_loop_lag_seconds_count' in exposed
+    assert 'botus_loop_lag_quantile_seconds{quantile="0.99"}' in exposed
+
+
+async def test_no_stall() -> None:
+    monitor = LoopMonitor(0.01, 0.5)
+
+    assert monitor.percentiles() == {}
+
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    await monitor.stop()
+
+    assert monitor.last_stall is None
+    assert 0.5 in monitor.percentiles()
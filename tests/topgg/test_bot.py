@@ -1,19 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Self, cast, override
 
 import discord
-import pendulum
 import pytest
 from attrs import define, field
 
-from botus_receptus.topgg.bot import AutoShardedBot, Bot
+from botus_receptus.topgg import AutoShardedBot, Bot, TopggProvider, Vote
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
     from unittest.mock import AsyncMock, Mock
 
     from botus_receptus import Config
+    from botus_receptus.botlists import BotStats
 
     from ..types import MockerFixture
 
@@ -45,32 +47,41 @@ class MockConnection:
         self.application_id = 1
 
 
-class MockSession:
-    async def post(self, url: str, *, data: Any = None, **kwargs: Any) -> None:
+@define
+class MockResponse:
+    status: int = 200
+    reason: str = 'OK'
+    headers: dict[str, str] = field(factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
         pass
 
+
+class MockSession:
+    async def post(self, url: str, *, data: Any = None, **kwargs: Any) -> MockResponse:
+        return MockResponse()
+
     async def close(self) -> None:
         pass
 
 
 @pytest.fixture(autouse=True)
 def mock_aiohttp(mocker: MockerFixture) -> None:
-    mocker.patch('aiohttp.ClientSession', new=mocker.create_autospec(MockSession))
+    session_class = mocker.create_autospec(MockSession)
+    session_class.return_value.post.return_value = MockResponse()
+    mocker.patch('aiohttp.ClientSession', new=session_class)
 
 
 @pytest.fixture
-def mock_task_start(mocker: MockerFixture) -> Mock:
-    return mocker.patch('discord.ext.tasks.Loop.start')
-
-
-@pytest.fixture
-def mock_task_cancel(mocker: MockerFixture) -> Mock:
-    return mocker.patch('discord.ext.tasks.Loop.cancel')
-
-
-@pytest.fixture
-def mock_in_minutes(mocker: MockerFixture) -> Mock:
-    return mocker.patch.object(pendulum.Duration, 'in_minutes')
+def mock_poster_start(mocker: MockerFixture) -> Mock:
+    return mocker.patch('botus_receptus.botlists.StatsPoster.start')
 
 
 class TestTopggBot:
@@ -89,27 +100,35 @@ class TestTopggBot:
             },
         }
 
-    async def test_no_token(self, config: Config, mock_task_start: Mock) -> None:
+    async def test_no_token(self, config: Config, mock_poster_start: Mock) -> None:
         del config['dbl_token']
         bot = Bot(config)
         cast('Any', bot)._connection = MockConnection()
         await bot.setup_hook()
         await bot.on_ready()
 
-        mock_task_start.assert_not_called()
-        cast('AsyncMock', bot.session.post).assert_not_awaited()
+        assert bot.stats_poster.providers == {}
+        mock_poster_start.assert_not_called()
 
-    async def test_report_guilds_before_15_minutes(
-        self, config: Config, mock_in_minutes: Mock, mock_task_start: Mock
-    ) -> None:
-        mock_in_minutes.return_value = 15.1
+    async def test_on_ready(self, config: Config, mock_poster_start: Mock) -> None:
         bot = Bot(config)
         cast('Any', bot)._connection = MockConnection()
         await bot.setup_hook()
         await bot.on_ready()
 
-        mock_task_start.assert_called_once_with(config.get('dbl_token'))
-        cast('AsyncMock', bot.session.post).assert_awaited_with(
+        assert isinstance(bot.stats_poster.providers['top.gg'], TopggProvider)
+        assert bot.stats_poster.interval == 3600.0
+        mock_poster_start.assert_called_once_with(bot.session, 12)
+
+    async def test_report_guilds(self, config: Config) -> None:
+        config['stats_post_interval'] = 900.0
+        bot = Bot(config)
+        cast('Any', bot)._connection = MockConnection()
+        await bot.setup_hook()
+
+        assert bot.stats_poster.interval == 900.0
+        assert await bot.stats_poster.tick(bot.session, bot.user.id) == {'top.gg': True}
+        cast('AsyncMock', bot.session.post).assert_awaited_once_with(
             'https://top.gg/api/bots/12/stats',
             data='{"server_count":5}',
             headers={
@@ -118,31 +137,83 @@ class TestTopggBot:
             },
         )
 
-    async def test_report_guilds_within_15_minutes(
-        self, config: Config, mock_in_minutes: Mock, mock_task_start: Mock
-    ) -> None:
-        mock_in_minutes.return_value = 14.9
+    async def test_custom_stats(self, config: Config) -> None:
+        class StatsBot(Bot):
+            @override
+            async def _get_topgg_stats(self) -> BotStats | None:
+                return {'server_count': 42}
+
+        bot = StatsBot(config)
+
+        assert await bot.stats_poster.get_stats() == {'server_count': 42}
+
+    async def test_close(self, config: Config, mocker: MockerFixture) -> None:
+        stop = mocker.patch('botus_receptus.botlists.StatsPoster.stop')
         bot = Bot(config)
         cast('Any', bot)._connection = MockConnection()
         await bot.setup_hook()
-        await bot.on_ready()
 
-        mock_task_start.assert_called_once_with(config.get('dbl_token'))
-        cast('AsyncMock', bot.session.post).assert_not_awaited()
+        async def _close() -> None:
+            return None
 
-    async def test_close(self, config: Config, mock_task_cancel: Mock) -> None:
-        bot = Bot(config)
+        bot._closing_task = asyncio.create_task(_close())
+
+        await bot.close()
+
+        stop.assert_awaited_once_with()
+
+    async def test_votes(self, config: Config, mocker: MockerFixture) -> None:
+        start = mocker.patch('botus_receptus.topgg.votes.VoteWebhook.start')
+        close = mocker.patch('botus_receptus.topgg.votes.VoteWebhook.close')
+        config['topgg_webhook_auth'] = 'SECRET'
+        config['topgg_webhook_port'] = 8080
+        persisted: list[Vote] = []
+        voted = Vote(56, 12)
+
+        class VoteBot(Bot):
+            @override
+            async def _load_votes(self) -> Iterable[Vote]:
+                return [voted]
+
+            @override
+            async def _persist_votes(self, votes: Sequence[Vote], /) -> None:
+                persisted.extend(votes)
+
+        bot = VoteBot(config)
         cast('Any', bot)._connection = MockConnection()
+        dispatch = mocker.patch.object(bot, 'dispatch')
         await bot.setup_hook()
 
+        assert bot.vote_webhook is not None
+        assert bot.vote_webhook.port == 8080
+        start.assert_awaited_once_with()
+        assert bot.has_voted(56)
+
+        vote = Vote(34, 12)
+        bot.vote_webhook.on_vote(vote)
+
+        assert bot.has_voted(34)
+        assert not bot.has_voted(78)
+        assert bot.memory._probes['votes']() == 2
+        assert bot.memory._probes['votes_pending']() == 1
+        dispatch.assert_called_once_with('topgg_vote', vote)
+
         async def _close() -> None:
             return None
 
         bot._closing_task = asyncio.create_task(_close())
-
         await bot.close()
 
-        mock_task_cancel.assert_called_once_with()
+        close.assert_awaited_once_with()
+        assert persisted == [vote]
+
+    async def test_no_webhook(self, config: Config) -> None:
+        bot = Bot(config)
+        cast('Any', bot)._connection = MockConnection()
+        await bot.setup_hook()
+
+        assert bot.vote_webhook is None
+        assert not bot.has_voted(34)
 
 
 class TestTopggAutoShardedBot:
@@ -161,58 +232,50 @@ class TestTopggAutoShardedBot:
             },
         }
 
-    async def test_no_token(self, config: Config, mock_task_start: Mock) -> None:
-        del config['dbl_token']
-        bot = AutoShardedBot(config)
-        cast('Any', bot)._connection = MockConnection()
-        await bot.setup_hook()
-        await bot.on_ready()
-
-        mock_task_start.assert_not_called()
-        cast('AsyncMock', bot.session.post).assert_not_awaited()
-
-    async def test_report_guilds_before_15_minutes(
-        self, config: Config, mock_in_minutes: Mock, mock_task_start: Mock
-    ) -> None:
-        mock_in_minutes.return_value = 15.1
+    async def test_report_guilds(self, config: Config) -> None:
         bot = AutoShardedBot(config)
         cast('Any', bot)._connection = MockConnection()
         bot.shard_count = 2
         await bot.setup_hook()
-        await bot.on_ready()
 
-        mock_task_start.assert_called_once_with(config.get('dbl_token'))
+        assert await bot.stats_poster.tick(bot.session, bot.user.id) == {'top.gg': True}
         cast('AsyncMock', bot.session.post).assert_awaited_once_with(
             'https://top.gg/api/bots/12/stats',
-            data='{"server_count":5,"shard_count":2}',
+            data='{"server_count":5,"shards":[2,3],"shard_count":2}',
             headers={
                 'Content-Type': 'application/json',
                 'Authorization': 'DBL_TOKEN',
             },
         )
 
-    async def test_report_guilds_within_15_minutes(
-        self, config: Config, mock_in_minutes: Mock, mock_task_start: Mock
+    async def test_cluster_stats(
+        self, mocker: MockerFixture, config: Config, tmp_path: Path
     ) -> None:
-        mock_in_minutes.return_value = 14.9
+        config['ipc_dir'] = str(tmp_path)
+        config['cluster_id'] = 0
+        config['cluster_count'] = 2
         bot = AutoShardedBot(config)
         cast('Any', bot)._connection = MockConnection()
-        await bot.setup_hook()
-        await bot.on_ready()
-
-        mock_task_start.assert_called_once_with(config.get('dbl_token'))
-        cast('AsyncMock', bot.session.post).assert_not_awaited()
+        bot.shard_count = 4
 
-    async def test_close(self, config: Config, mock_task_cancel: Mock) -> None:
-        bot = AutoShardedBot(config)
-        cast('Any', bot)._connection = MockConnection()
-        await bot.setup_hook()
-
-        async def _close() -> None:
-            return None
+        assert bot.ipc is not None
+        broadcast = mocker.patch(
+            'botus_receptus.ipc.IPCBus.broadcast',
+            return_value={0: {'0': 2, '1': 3}, 1: {'2': 4, '3': 0}},
+        )
 
-        bot._closing_task = asyncio.create_task(_close())
+        assert await bot._get_topgg_stats() == {
+            'server_count': 9,
+            'shards': [2, 3, 4, 0],
+            'shard_count': 4,
+        }
+        broadcast.assert_awaited_once_with('shard_guild_counts')
 
-        await bot.close()
+        broadcast.return_value = {1: {'2': 4, '3': 0}}
+        bot.ipc.cluster_id = 1
+        stats = await bot._get_topgg_stats()
+        assert stats is not None
+        assert stats.get('shards') == [2, 3, 4, 0]
 
-        mock_task_cancel.assert_called_once_with()
+        bot.ipc.cluster_id = 2
+        assert await bot._get_topgg_stats() is None
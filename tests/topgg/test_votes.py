@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+
+from botus_receptus.topgg.votes import Vote, VoteStore, VoteWebhook
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Sequence
+
+    from ..types import MockerFixture
+
+
+class TestVoteStore:
+    @pytest.fixture
+    def now(self) -> float:
+        return time.time()
+
+    def test_has_voted(self, now: float) -> None:
+        store = VoteStore(expiry=100.0)
+        store.record(Vote(1, 12, voted_at=now))
+        store.record(Vote(2, 12, voted_at=now + 50))
+
+        assert store.has_voted(1, now=now + 99)
+        assert not store.has_voted(1, now=now + 101)
+        assert not store.has_voted(1, within=10.0, now=now + 50)
+        assert store.has_voted(2, within=10.0, now=now + 50)
+        assert not store.has_voted(3, now=now)
+
+    def test_prune(self, now: float) -> None:
+        store = VoteStore(expiry=100.0)
+        store.record(Vote(1, 12, voted_at=now))
+        store.record(Vote(2, 12, voted_at=now + 10))
+        store.record(Vote(1, 12, voted_at=now + 50))
+        store.record(Vote(3, 12, voted_at=now + 5))
+
+        store.prune(now=now + 111)
+
+        assert len(store) == 1
+        assert store.has_voted(1, now=now + 111)
+
+        store.prune(now=now + 151)
+
+        assert len(store) == 0
+
+    def test_ignores_older_and_test_votes(self, now: float) -> None:
+        store = VoteStore(expiry=100.0)
+        store.record(Vote(1, 12, voted_at=now + 50))
+        store.record(Vote(1, 12, voted_at=now))
+        store.record(Vote(2, 12, 'test', voted_at=now + 50))
+
+        store.prune(now=now + 120)
+
+        assert store.has_voted(1, now=now + 120)
+        assert not store.has_voted(2, now=now + 50)
+
+    def test_load(self) -> None:
+        store = VoteStore()
+        store.load([Vote(1, 12), Vote(2, 12, voted_at=0.0)])
+
+        assert len(store) == 1
+        assert store.has_voted(1)
+        assert store.pending == 0
+
+    async def test_flush(self, mocker: MockerFixture) -> None:
+        persist = mocker.AsyncMock()
+        store = VoteStore(persist=persist)
+        votes = [Vote(1, 12), Vote(2, 12, 'test')]
+
+        for vote in votes:
+            store.record(vote)
+
+        assert store.pending == 2
+
+        await store.flush()
+        await store.flush()
+
+        persist.assert_awaited_once_with(votes)
+        assert store.pending == 0
+
+    async def test_flush_failure(self, mocker: MockerFixture) -> None:
+        persist = mocker.AsyncMock(side_effect=[OSError('down'), None])
+        store = VoteStore(persist=persist, max_pending=2)
+        votes = [Vote(1, 12), Vote(2, 12)]
+
+        for vote in votes:
+            store.record(vote)
+
+        await store.flush()
+
+        assert store.pending == 2
+
+        store.record(vote := Vote(3, 12))
+        await store.flush()
+
+        persist.assert_awaited_with([*votes[1:], vote])
+        assert store.pending == 0
+
+    async def test_start_stop(self) -> None:
+        persisted: list[Vote] = []
+
+        async def persist(votes: Sequence[Vote], /) -> None:
+            persisted.extend(votes)
+
+        store = VoteStore(persist=persist, flush_interval=0.01)
+        store.start()
+        store.record(first := Vote(1, 12))
+
+        while not persisted:
+            await asyncio.sleep(0.01)
+
+        store.record(second := Vote(2, 12))
+        await store.stop()
+
+        assert persisted == [first, second]
+
+    async def test_no_persist(self) -> None:
+        store = VoteStore()
+        store.start()
+        store.record(Vote(1, 12))
+
+        assert store.pending == 0
+
+        await store.stop()
+
+
+class TestVoteWebhook:
+    @pytest.fixture
+    async def webhook(self) -> AsyncGenerator[tuple[VoteWebhook, list[Vote]]]:
+        votes: list[Vote] = []
+        webhook = VoteWebhook('SECRET', votes.append, '127.0.0.1', 0)
+        await webhook.start()
+
+        yield webhook, votes
+
+        await webhook.close()
+        await webhook.close()
+
+    @pytest.fixture
+    def url(self, webhook: tuple[VoteWebhook, list[Vote]]) -> str:
+        host, port = webhook[0].addresses[0]
+        return f'http://{host}:{port}/dblwebhook'
+
+    async def test_vote(
+        self, webhook: tuple[VoteWebhook, list[Vote]], url: str
+    ) -> None:
+        async with (
+            aiohttp.ClientSession() as session,
+            session.post(
+                url,
+                json={
+                    'bot': '12',
+                    'user': '34',
+                    'type': 'upvote',
+                    'isWeekend': True,
+                    'query': '?ref=home',
+                },
+                headers={'Authorization': 'SECRET'},
+            ) as resp,
+        ):
+            assert resp.status == 204
+
+        (vote,) = webhook[1]
+        assert vote.user_id == 34
+        assert vote.bot_id == 12
+        assert vote.is_weekend
+        assert vote.query == '?ref=home'
+        assert not vote.is_test
+
+    @pytest.mark.parametrize(
+        'headers,data,status',
+        [
+            ({}, '{"bot":"12","user":"34"}', 401),
+            ({'Authorization': 'WRONG'}, '{"bot":"12","user":"34"}', 401),
+            ({'Authorization': 'SECRET'}, 'not json', 400),
+            ({'Authorization': 'SECRET'}, '{"bot":"12"}', 400),
+            ({'Authorization': 'SECRET'}, '[]', 400),
+        ],
+    )
+    async def test_rejected(
+        self,
+        webhook: tuple[VoteWebhook, list[Vote]],
+        url: str,
+        headers: dict[str, str],
+        data: str,
+        status: int,
+    ) -> None:
+        async with (
+            aiohttp.ClientSession() as session,
+            session.post(url, data=data, headers=headers) as resp,
+        ):
+            assert resp.status == status
+
+        assert webhook[1] == []